@@ -0,0 +1,48 @@
+# benchmarks/bench_academic_records.py
+"""
+Benchmark: per-student get_student_academic_record loop vs get_academic_records
+
+Usage: python benchmarks/bench_academic_records.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, print_table, MAJORS
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+
+
+def run(student_count=20000, grades_per_student=8):
+    rows = []
+    
+    with temp_database() as db_config:
+        seed_students(db_config, student_count, grades_per_student=grades_per_student)
+        grade_service = GradeService(DatabaseService(db_config))
+        
+        start = time.perf_counter()
+        for student_id in range(1, student_count + 1):
+            grade_service.get_student_academic_record(student_id)
+        elapsed = time.perf_counter() - start
+        rows.append(('per-student loop', student_count, elapsed, student_count / elapsed))
+        
+        start = time.perf_counter()
+        count = sum(1 for _ in grade_service.get_academic_records())
+        elapsed = time.perf_counter() - start
+        rows.append(('get_academic_records', count, elapsed, count / elapsed))
+        
+        start = time.perf_counter()
+        count = sum(1 for _ in grade_service.get_academic_records(filters={'major': MAJORS[0]}))
+        elapsed = time.perf_counter() - start
+        rows.append(('  one major', count, elapsed, count / elapsed))
+    
+    print_table(
+        f"Academic records for {student_count} students ({grades_per_student} grades each)",
+        ['method', 'records', 'seconds', 'records/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,58 @@
+# benchmarks/bench_academic_summary.py
+"""
+Benchmark: academic summary from a full student scan vs the major summary table
+
+Usage: python benchmarks/bench_academic_summary.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, time_calls, print_table
+
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+
+
+def scanned_summary(db_service):
+    """What get_academic_summary used to do: stream every student"""
+    total_students = 0
+    students_with_grades = 0
+    grade_total = 0
+    for student in db_service.iter_students():
+        total_students += 1
+        if student['avg_grade'] > 0:
+            students_with_grades += 1
+            grade_total += student['avg_grade']
+    return total_students, students_with_grades, grade_total
+
+
+def run(student_count=1000000, grades_per_student=2):
+    rows = []
+    
+    with temp_database() as db_config:
+        start = time.perf_counter()
+        seed_students(db_config, student_count, grades_per_student=grades_per_student)
+        seed_seconds = time.perf_counter() - start
+        
+        db_service = DatabaseService(db_config)
+        student_service = StudentService(db_service)
+        
+        start = time.perf_counter()
+        scanned_summary(db_service)
+        rows.append(('student scan', (time.perf_counter() - start) * 1000))
+        
+        stats = time_calls(lambda _: student_service.get_academic_summary(), 200)
+        rows.append(('summary table, mean', stats['mean'] / 1000))
+        rows.append(('summary table, p95', stats['p95'] / 1000))
+    
+    print_table(
+        f"Academic summary at {student_count} students "
+        f"(seeded with triggers in {seed_seconds:.1f}s)",
+        ['method', 'milliseconds'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
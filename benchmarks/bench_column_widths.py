@@ -0,0 +1,65 @@
+# benchmarks/bench_column_widths.py
+"""
+Benchmark: per-cell worksheet walk vs column widths measured on the DataFrame
+
+Usage: python benchmarks/bench_column_widths.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+from bench_utils import print_table
+from bench_excel_export import student_stream
+
+from reports.excel_generator import ExcelReportGenerator
+
+
+def walk_cells(worksheet):
+    """What _auto_adjust_columns used to do for every sheet"""
+    for column in worksheet.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+        
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except:
+                pass
+        
+        worksheet.column_dimensions[column_letter].width = min(max_length + 2, 50)
+
+
+def run(row_count=100000):
+    df = pd.DataFrame(student_stream(row_count)).drop(columns=['id'])
+    rows = []
+    
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            pd.ExcelWriter(BytesIO(), engine='openpyxl') as writer:
+        generator = ExcelReportGenerator(reports_dir=tmp_dir)
+        start = time.perf_counter()
+        df.to_excel(writer, sheet_name='Data', index=False)
+        rows.append(('to_excel (reference)', (time.perf_counter() - start) * 1000))
+        worksheet = writer.sheets['Data']
+        
+        start = time.perf_counter()
+        walk_cells(worksheet)
+        rows.append(('per-cell walk', (time.perf_counter() - start) * 1000))
+        
+        for label, sample_size in (('vectorized, all rows', None), ('vectorized, 1000 rows', 1000)):
+            start = time.perf_counter()
+            generator._apply_column_widths(worksheet, generator._column_widths(df, sample_size=sample_size))
+            rows.append((label, (time.perf_counter() - start) * 1000))
+    
+    print_table(
+        f"Column auto-sizing for {row_count} rows x {len(df.columns)} columns",
+        ['method', 'milliseconds'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,54 @@
+# benchmarks/bench_connection_pool.py
+"""
+Benchmark: per-call latency of DatabaseService with and without connection pooling
+
+Usage: python benchmarks/bench_connection_pool.py [iterations]
+"""
+
+import sys
+from contextlib import contextmanager
+
+from bench_utils import temp_database, seed_students, time_calls, print_table
+
+from config.database_config import DatabaseConfig
+from services.database_service import DatabaseService
+
+
+class UnpooledDatabaseConfig(DatabaseConfig):
+    """Reproduces the old connect-per-call behaviour"""
+    
+    @contextmanager
+    def connection(self):
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def run(iterations=5000, student_count=2000):
+    rows = []
+    
+    for label, config_class in (('connect-per-call', UnpooledDatabaseConfig),
+                                ('pooled', DatabaseConfig)):
+        with temp_database(config_class) as db_config:
+            seed_students(db_config, student_count, grades_per_student=3)
+            db_service = DatabaseService(db_config)
+            
+            lookups = time_calls(
+                lambda i: db_service.get_student_by_id(1 + i % student_count), iterations
+            )
+            courses = time_calls(lambda i: db_service.get_course_by_code('TI101'), iterations)
+            
+            rows.append((label, 'get_student_by_id', lookups['mean'], lookups['p50'], lookups['p95']))
+            rows.append((label, 'get_course_by_code', courses['mean'], courses['p50'], courses['p95']))
+    
+    print_table(
+        f"Per-call latency in microseconds ({iterations} calls)",
+        ['mode', 'operation', 'mean', 'p50', 'p95'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,68 @@
+# benchmarks/bench_course_statistics.py
+"""
+Benchmark: course statistics computed in Python per course vs aggregated in SQL
+
+Usage: python benchmarks/bench_course_statistics.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, print_table
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+
+
+def python_course_statistics(db_config, course_id):
+    """The fetch-everything approach get_course_statistics used to take"""
+    with db_config.connection() as conn:
+        grades = [dict(row) for row in conn.execute('''
+        SELECT g.*, s.name as student_name, s.nim
+        FROM grades g
+        JOIN students s ON g.student_id = s.id
+        WHERE g.course_id = ?
+        ''', (course_id,))]
+    
+    distribution = {}
+    for grade in grades:
+        distribution[grade['grade_letter']] = distribution.get(grade['grade_letter'], 0) + 1
+    return sum(g['grade_value'] for g in grades) / max(len(grades), 1), distribution
+
+
+def run(student_count=100000, grades_per_student=8):
+    rows = []
+    
+    with temp_database() as db_config:
+        seed_students(db_config, student_count, grades_per_student=grades_per_student)
+        grade_service = GradeService(DatabaseService(db_config))
+        course_ids = [course['id'] for course in grade_service.db_service.get_courses()]
+        
+        start = time.perf_counter()
+        for course_id in course_ids:
+            python_course_statistics(db_config, course_id)
+        rows.append(('Python, per course', len(course_ids), time.perf_counter() - start))
+        
+        start = time.perf_counter()
+        for course_id in course_ids:
+            grade_service.get_course_statistics(course_id)
+        rows.append(('SQL, per course', len(course_ids), time.perf_counter() - start))
+        
+        start = time.perf_counter()
+        result = grade_service.get_all_course_statistics()
+        rows.append(('SQL, all courses', len(result['courses']), time.perf_counter() - start))
+        
+        start = time.perf_counter()
+        result = grade_service.get_all_course_statistics(semester=1, academic_year='2023/2024')
+        rows.append(('SQL, one term', len(result['courses']), time.perf_counter() - start))
+    
+    print_table(
+        f"Course statistics over {student_count * grades_per_student} grades "
+        "(SQL adds stddev, median and percentiles)",
+        ['method', 'courses', 'seconds'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,63 @@
+# benchmarks/bench_excel_export.py
+"""
+Benchmark: students report through a DataFrame vs the write-only streaming mode
+
+Time is measured on a plain run, peak memory on a second run under tracemalloc.
+
+Usage: python benchmarks/bench_excel_export.py [rows ...]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_utils import MAJORS, print_table
+
+from reports.excel_generator import ExcelReportGenerator
+
+
+def student_stream(count):
+    """Student dicts shaped like DatabaseService.iter_students() rows"""
+    for i in range(count):
+        yield {
+            'id': i + 1,
+            'nim': f'NIM{i:08d}',
+            'name': f'Student Number {i}',
+            'major': MAJORS[i % len(MAJORS)],
+            'email': f'student{i}@example.com',
+            'phone': None,
+            'admission_year': 2015 + i % 10,
+            'course_count': i % 12,
+            'avg_grade': (i * 37 % 401) / 100 if i % 12 else 0
+        }
+
+
+def run(sizes=(10000, 50000, 100000)):
+    rows = []
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator = ExcelReportGenerator(reports_dir=tmp_dir)
+        
+        for count in sizes:
+            for label, streaming in (('DataFrame', False), ('write-only', True)):
+                start = time.perf_counter()
+                generator.generate_students_report(student_stream(count), streaming=streaming)
+                elapsed = time.perf_counter() - start
+                
+                tracemalloc.start()
+                generator.generate_students_report(student_stream(count), streaming=streaming)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                
+                rows.append((label, count, round(elapsed, 2), round(peak / 1024 / 1024, 1)))
+    
+    print_table(
+        "Students report export",
+        ['mode', 'rows', 'seconds', 'peak MiB'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (10000, 50000, 100000))
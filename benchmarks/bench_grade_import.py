@@ -0,0 +1,68 @@
+# benchmarks/bench_grade_import.py
+"""
+Benchmark: GradeService.add_student_grade loop vs GradeService.import_grades
+
+Usage: python benchmarks/bench_grade_import.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, print_table
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+
+
+COURSE_CODES = ['TI101', 'TI102', 'TI103', 'TI201', 'TI202', 'TI203', 'SI101', 'SI102', 'SI103']
+
+
+def make_records(student_count, academic_year):
+    return (
+        {
+            'nim': f"NIM{i:08d}",
+            'course_code': code,
+            'semester': 1,
+            'academic_year': academic_year,
+            'grade_value': round((i * 7 + n * 13) % 401 / 100, 2)
+        }
+        for i in range(student_count)
+        for n, code in enumerate(COURSE_CODES)
+    )
+
+
+def run(student_count=20000):
+    rows = []
+    
+    with temp_database() as db_config:
+        seed_students(db_config, student_count)
+        db_service = DatabaseService(db_config)
+        grade_service = GradeService(db_service)
+        
+        loop_count = min(student_count, 500)
+        start = time.perf_counter()
+        for student_id in range(1, loop_count + 1):
+            for course_id in range(1, len(COURSE_CODES) + 1):
+                grade_service.add_student_grade(student_id, course_id, 1, '2022/2023', 3.0)
+        elapsed = time.perf_counter() - start
+        grade_count = loop_count * len(COURSE_CODES)
+        rows.append(('add_student_grade loop', grade_count, elapsed, grade_count / elapsed))
+        
+        result = grade_service.import_grades(make_records(student_count, '2023/2024'))
+        rows.append(('import_grades', result['inserted'],
+                     result['elapsed_seconds'], result['rows_per_second']))
+        
+        result = grade_service.import_grades(make_records(student_count, '2023/2024'),
+                                             update_existing=True)
+        rows.append(('import_grades re-run', result['updated'],
+                     result['elapsed_seconds'], result['rows_per_second']))
+    
+    print_table(
+        "Grade ingestion throughput",
+        ['method', 'rows', 'seconds', 'rows/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
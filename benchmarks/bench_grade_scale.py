@@ -0,0 +1,78 @@
+# benchmarks/bench_grade_scale.py
+"""
+Benchmark: if/elif letter ladder vs GradeScale bisect and batch classification
+
+Usage: python benchmarks/bench_grade_scale.py [values]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from bench_utils import temp_database, seed_students, print_table
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+from utils.grade_scale import GradeScale
+
+
+def ladder_letter(grade_value):
+    """The if/elif chain calculate_grade_letter used to run"""
+    if grade_value >= 3.7:
+        return 'A'
+    elif grade_value >= 3.3:
+        return 'A-'
+    elif grade_value >= 3.0:
+        return 'B+'
+    elif grade_value >= 2.7:
+        return 'B'
+    elif grade_value >= 2.3:
+        return 'B-'
+    elif grade_value >= 2.0:
+        return 'C+'
+    elif grade_value >= 1.7:
+        return 'C'
+    elif grade_value >= 1.3:
+        return 'C-'
+    elif grade_value >= 1.0:
+        return 'D+'
+    else:
+        return 'D'
+
+
+def run(value_count=1000000, regrade_students=20000):
+    rng = random.Random(42)
+    values = [round(rng.uniform(0, 4), 2) for _ in range(value_count)]
+    array = np.array(values)
+    scale = GradeScale()
+    rows = []
+    
+    for label, classify in (
+        ('ladder, per value', lambda: [ladder_letter(v) for v in values]),
+        ('bisect, per value', lambda: [scale.classify(v) for v in values]),
+        ('classify_many, list', lambda: scale.classify_many(values)),
+        ('classify_many, ndarray', lambda: scale.classify_many(array)),
+    ):
+        start = time.perf_counter()
+        classify()
+        elapsed = time.perf_counter() - start
+        rows.append((label, value_count, elapsed, value_count / elapsed))
+    
+    with temp_database() as db_config:
+        seed_students(db_config, regrade_students, grades_per_student=8)
+        grade_service = GradeService(DatabaseService(db_config))
+        result = grade_service.regrade_grades()
+        rows.append(('regrade_grades (db)', result['checked'], result['elapsed_seconds'],
+                     result['rows_per_second']))
+    
+    print_table(
+        "Grade letter classification",
+        ['method', 'values', 'seconds', 'values/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
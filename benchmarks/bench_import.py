@@ -0,0 +1,93 @@
+# benchmarks/bench_import.py
+"""
+Benchmark: student file import throughput, per-record import_students vs the
+pipelined ImportService with inline, thread and process parsing
+
+Usage: python benchmarks/bench_import.py [rows] [xlsx_rows]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import MAJORS, temp_database, print_table
+from openpyxl import Workbook
+
+from services.database_service import DatabaseService
+from services.import_service import ImportService
+from services.student_service import StudentService
+
+HEADER = ['nim', 'name', 'major', 'admission_year', 'email', 'phone']
+
+
+def student_rows(row_count):
+    for i in range(row_count):
+        yield [f'NIM{i:08d}', 'Student Name', MAJORS[i % len(MAJORS)], 2015 + i % 10,
+               f'student{i}@example.com', f'0812-{i % 10000:04d}-{i % 9999:04d}']
+
+
+def write_csv(path, row_count):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(HEADER)
+        writer.writerows(student_rows(row_count))
+
+
+def write_xlsx(path, row_count):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in student_rows(row_count):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def timed_import(rows, label, row_count, func):
+    with temp_database() as db_config:
+        db_service = DatabaseService(db_config)
+        start = time.perf_counter()
+        result = func(db_service)
+        elapsed = time.perf_counter() - start
+    assert result['inserted'] == row_count, result.get('error', result['failed'])
+    rows.append((label, row_count, round(elapsed, 2), round(row_count / elapsed)))
+
+
+def run(row_count=1000000, xlsx_rows=None):
+    xlsx_rows = row_count if xlsx_rows is None else xlsx_rows
+    workers = os.cpu_count() or 1
+    rows = []
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'students.csv')
+        xlsx_path = os.path.join(tmp_dir, 'students.xlsx')
+        write_csv(csv_path, row_count)
+        write_xlsx(xlsx_path, xlsx_rows)
+        
+        def per_record(db_service):
+            with open(csv_path, newline='', encoding='utf-8') as csv_file:
+                return StudentService(db_service).import_students(csv.DictReader(csv_file))
+        
+        def pipelined(path, **options):
+            return lambda db_service: ImportService(db_service).import_students_file(path, **options)
+        
+        timed_import(rows, 'csv, import_students', row_count, per_record)
+        timed_import(rows, 'csv, inline', row_count, pipelined(csv_path, workers=0))
+        timed_import(rows, f'csv, {workers} threads', row_count, pipelined(csv_path))
+        timed_import(rows, f'csv, {workers} processes', row_count,
+                     pipelined(csv_path, use_processes=True))
+        timed_import(rows, 'xlsx, inline', xlsx_rows, pipelined(xlsx_path, workers=0))
+        timed_import(rows, f'xlsx, {workers} processes', xlsx_rows,
+                     pipelined(xlsx_path, use_processes=True))
+    
+    print_table(
+        f"Student file import ({os.cpu_count()} CPUs, 50000-row commits)",
+        ['method', 'rows', 'seconds', 'rows/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else None)
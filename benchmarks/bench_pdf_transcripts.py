@@ -0,0 +1,107 @@
+# benchmarks/bench_pdf_transcripts.py
+"""
+Benchmark: transcript rendering as Excel workbooks vs PDF files vs one combined PDF
+
+Time is measured on a plain run, peak memory on a second run under tracemalloc.
+Excel is only run on the smallest size; it is the slow baseline.
+
+Usage: python benchmarks/bench_pdf_transcripts.py [transcripts ...]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_utils import MAJORS, print_table
+
+from reports.excel_generator import ExcelReportGenerator
+from reports.pdf_generator import PDFReportGenerator
+
+
+def transcript_stream(count, semesters=8, courses_per_semester=6):
+    """(student, academic record) pairs shaped like TranscriptService.iter_cohort()"""
+    for i in range(count):
+        student = {
+            'id': i + 1,
+            'nim': f'NIM{i:08d}',
+            'name': f'Student Number {i}',
+            'major': MAJORS[i % len(MAJORS)],
+            'admission_year': 2015 + i % 10
+        }
+        grades_by_semester = []
+        for semester in range(1, semesters + 1):
+            courses = [
+                {
+                    'course_code': f'TI{semester}{course:02d}',
+                    'course_name': f'Course {course} of Semester {semester}',
+                    'credits': 3,
+                    'grade_value': (i + course) % 5 * 0.8,
+                    'grade_letter': 'ABCDE'[(i + course) % 5]
+                }
+                for course in range(courses_per_semester)
+            ]
+            grades_by_semester.append({
+                'semester': semester,
+                'academic_year': f'{2015 + semester // 2}/{2016 + semester // 2}',
+                'courses': courses,
+                'total_credits': 3 * courses_per_semester,
+                'gpa': 2.4
+            })
+        yield student, {
+            'grades_by_semester': grades_by_semester,
+            'overall_gpa': 2.4,
+            'total_credits': 3 * courses_per_semester * semesters,
+            'completed_courses': courses_per_semester * semesters
+        }
+
+
+def run(sizes=(200, 2000)):
+    rows = []
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel = ExcelReportGenerator(reports_dir=f'{tmp_dir}/xlsx')
+        pdf = PDFReportGenerator(reports_dir=f'{tmp_dir}/pdf')
+        
+        def excel_files(items):
+            count = sum(1 for student, record in items
+                        if excel.generate_academic_transcript(student, record))
+            # Workbooks have sheets, not pages
+            return {'transcripts': count, 'pages': None}
+        
+        modes = [
+            ('xlsx files', excel_files),
+            ('pdf files', lambda items: pdf.generate_transcripts_pdf(items, combined=False)),
+            ('combined pdf', lambda items: pdf.generate_transcripts_pdf(items))
+        ]
+        
+        for count in sizes:
+            for label, render in modes:
+                if label == 'xlsx files' and count != min(sizes):
+                    continue
+                start = time.perf_counter()
+                result = render(transcript_stream(count))
+                elapsed = time.perf_counter() - start
+                
+                tracemalloc.start()
+                render(transcript_stream(count))
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                
+                pages = result['pages']
+                rows.append((
+                    label, count, pages if pages is not None else '-', round(elapsed, 2),
+                    round(count / elapsed, 1),
+                    round(pages / elapsed, 1) if pages is not None else '-',
+                    round(peak / 1024 / 1024, 2)
+                ))
+    
+    print_table(
+        "Transcript rendering (8 semesters x 6 courses)",
+        ['mode', 'transcripts', 'pages', 'seconds', 'transcripts/s', 'pages/s', 'peak MiB'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or (200, 2000))
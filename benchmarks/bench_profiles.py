@@ -0,0 +1,90 @@
+# benchmarks/bench_profiles.py
+"""
+Benchmark: write throughput and concurrent read latency per database profile
+
+Usage: python benchmarks/bench_profiles.py [writes]
+"""
+
+import sys
+import threading
+import time
+
+from bench_utils import temp_database, seed_students, time_calls, print_table
+
+from config.database_config import PERFORMANCE_PROFILES
+from services.database_service import DatabaseService
+from models.course_model import Grade
+
+
+# The pre-profile behaviour: rollback journal with SQLite defaults
+PERFORMANCE_PROFILES.setdefault('legacy', {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'temp_store': 'DEFAULT',
+    'busy_timeout': 5000
+})
+
+
+def measure_writes(db_service, student_count, writes):
+    start = time.perf_counter()
+    for i in range(writes):
+        db_service.add_grade(Grade(
+            student_id=1 + i % student_count,
+            course_id=1 + (i // student_count) % 9,
+            semester=1 + i // (student_count * 9),
+            academic_year='2024/2025',
+            grade_value=3.0,
+            grade_letter='B+'
+        ))
+    return writes / (time.perf_counter() - start)
+
+
+def measure_concurrent_reads(db_service, student_count, reads):
+    stop = threading.Event()
+    
+    def writer():
+        i = 0
+        while not stop.is_set():
+            db_service.add_grade(Grade(
+                student_id=1 + i % student_count,
+                course_id=1 + (i // student_count) % 9,
+                semester=10 + i // (student_count * 9),
+                academic_year='2025/2026',
+                grade_value=2.5,
+                grade_letter='B-'
+            ))
+            i += 1
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        return time_calls(lambda i: db_service.get_student_by_id(1 + i % student_count), reads)
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run(writes=2000, student_count=1000):
+    rows = []
+    
+    for profile in ('legacy', 'durable', 'balanced', 'bulk-load'):
+        with temp_database(profile=profile) as db_config:
+            seed_students(db_config, student_count, grades_per_student=3)
+            db_service = DatabaseService(db_config)
+            
+            writes_per_second = measure_writes(db_service, student_count, writes)
+            reads = measure_concurrent_reads(db_service, student_count, writes)
+            
+            rows.append((profile, writes_per_second, reads['mean'], reads['p95']))
+    
+    print_table(
+        f"{writes} committed grade inserts, then reads under a concurrent writer",
+        ['profile', 'writes/s', 'read mean (us)', 'read p95 (us)'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,60 @@
+# benchmarks/bench_rankings.py
+"""
+Benchmark: top-N GPA rankings sorted in Python vs ranked in SQL
+
+Usage: python benchmarks/bench_rankings.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, print_table
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+
+
+def python_top_students(db_service, top=100):
+    """Load every student and sort them, as callers used to"""
+    students = sorted(db_service.iter_students(), key=lambda s: (-s['avg_grade'], s['nim']))
+    return students[:top]
+
+
+def run(student_count=200000, grades_per_student=4):
+    rows = []
+    
+    with temp_database() as db_config:
+        seed_students(db_config, student_count, grades_per_student=grades_per_student)
+        db_service = DatabaseService(db_config)
+        grade_service = GradeService(db_service)
+        
+        def timed(label, func):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            count = len(result['rankings']) if isinstance(result, dict) else len(result)
+            rows.append((label, count, elapsed * 1000))
+        
+        timed('get_students + sort', lambda: python_top_students(db_service))
+        timed('full window ranking', lambda: grade_service.get_rankings(top=None))
+        timed('top 100 overall', lambda: grade_service.get_rankings(top=100))
+        timed('top 100 dense', lambda: grade_service.get_rankings(top=100, method='dense'))
+        timed('top 100 per major', lambda: grade_service.get_rankings(partition_by='major', top=100))
+        timed('top 100 per year',
+              lambda: grade_service.get_rankings(partition_by='admission_year', top=100))
+        timed('page 50 (offset 4900)',
+              lambda: grade_service.get_rankings(top=None, limit=100, offset=4900))
+        timed('min 10 credits',
+              lambda: grade_service.get_rankings(top=100, min_credits=10))
+        timed('semester 1 term',
+              lambda: grade_service.get_rankings(semester=1, academic_year='2023/2024', top=100))
+    
+    print_table(
+        f"GPA rankings over {student_count} students ({grades_per_student} grades each)",
+        ['method', 'rows', 'milliseconds'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,62 @@
+# benchmarks/bench_streaming.py
+"""
+Benchmark: peak Python memory of get_students() lists vs iter_students() streams
+
+Usage: python benchmarks/bench_streaming.py [sizes...]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from bench_utils import temp_database, seed_students, print_table
+
+from services.database_service import DatabaseService
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def average_grade_from_list(db_service):
+    students = db_service.get_students()
+    return sum(s['avg_grade'] for s in students) / max(len(students), 1)
+
+
+def average_grade_from_stream(db_service):
+    total = 0
+    count = 0
+    for student in db_service.iter_students():
+        total += student['avg_grade']
+        count += 1
+    return total / max(count, 1)
+
+
+def run(sizes=(50000, 200000)):
+    rows = []
+    
+    for count in sizes:
+        with temp_database() as db_config:
+            seed_students(db_config, count, grades_per_student=2)
+            db_service = DatabaseService(db_config)
+            
+            for label, func in (('get_students list', average_grade_from_list),
+                                ('iter_students stream', average_grade_from_stream)):
+                elapsed, peak_mb = measure(lambda: func(db_service))
+                rows.append((count, label, elapsed, peak_mb))
+    
+    print_table(
+        "Averaging avg_grade over every student",
+        ['students', 'method', 'seconds', 'peak MiB'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(tuple(int(arg) for arg in sys.argv[1:]) or (50000, 200000))
@@ -0,0 +1,58 @@
+# benchmarks/bench_student_import.py
+"""
+Benchmark: StudentService.create_student loop vs StudentService.import_students
+
+Usage: python benchmarks/bench_student_import.py [students]
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, print_table, MAJORS
+
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+
+
+def make_records(count, offset=0):
+    return (
+        {
+            'nim': f"{20000000 + offset + i}",
+            'name': f"Student Name {chr(65 + i % 26)}",
+            'major': MAJORS[i % len(MAJORS)],
+            'admission_year': 2015 + i % 10,
+            'email': f"student{offset + i}@example.com",
+            'phone': ''
+        }
+        for i in range(count)
+    )
+
+
+def run(count=20000):
+    rows = []
+    
+    with temp_database() as db_config:
+        service = StudentService(DatabaseService(db_config))
+        loop_count = min(count, 5000)
+        
+        start = time.perf_counter()
+        for record in make_records(loop_count):
+            service.create_student(**record)
+        elapsed = time.perf_counter() - start
+        rows.append(('create_student loop', loop_count, elapsed, loop_count / elapsed))
+        
+        for run_number, chunk_size in enumerate((500, 5000), start=1):
+            records = make_records(count, offset=run_number * 1_000_000)
+            result = service.import_students(records, chunk_size=chunk_size)
+            rows.append((f'import chunk={chunk_size}', result['inserted'],
+                         result['elapsed_seconds'], result['rows_per_second']))
+    
+    print_table(
+        "Student import throughput",
+        ['method', 'rows', 'seconds', 'rows/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
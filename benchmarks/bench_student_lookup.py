@@ -0,0 +1,62 @@
+# benchmarks/bench_student_lookup.py
+"""
+Benchmark: StudentService update/detail/delete latency as the student count grows
+
+Each operation resolves one student by primary key, so its latency should stay
+flat from a thousand to hundreds of thousands of students. The "full listing"
+row times the get_students() + next() scan these paths used before, for contrast.
+
+Usage: python benchmarks/bench_student_lookup.py [sizes...]
+"""
+
+import sys
+
+from bench_utils import temp_database, seed_students, time_calls, print_table
+
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+
+
+def full_listing_lookup(db_service, student_id):
+    students = db_service.get_students()
+    return next((s for s in students if s['id'] == student_id), None)
+
+
+def run(sizes=(1000, 10000, 100000), iterations=200):
+    rows = []
+    
+    for count in sizes:
+        with temp_database() as db_config:
+            seed_students(db_config, count, grades_per_student=4)
+            service = StudentService(DatabaseService(db_config))
+            step = max(count // iterations, 1)
+            
+            operations = [
+                ('get_student_detail',
+                 lambda i: service.get_student_detail(1 + i * step % count)),
+                ('update_student',
+                 lambda i: service.update_student(1 + i * step % count,
+                                                  {'name': 'Updated Student Name'})),
+                # Delete from the top of the id range so each call removes a real row
+                ('delete_student',
+                 lambda i: service.delete_student(count - i)),
+            ]
+            for label, operation in operations:
+                stats = time_calls(operation, min(iterations, count))
+                rows.append((count, label, stats['mean'], stats['p95']))
+            
+            if count <= 10000:
+                stats = time_calls(
+                    lambda i: full_listing_lookup(service.db_service, 1 + i * step % count), 5
+                )
+                rows.append((count, 'full listing + next()', stats['mean'], stats['p95']))
+    
+    print_table(
+        "Single-student operation latency in microseconds",
+        ['students', 'operation', 'mean (us)', 'p95 (us)'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(tuple(int(arg) for arg in sys.argv[1:]) or (1000, 10000, 100000))
@@ -0,0 +1,53 @@
+# benchmarks/bench_student_search.py
+"""
+Benchmark: student search through the FTS5 trigram index vs the LIKE fallback
+
+Usage: python benchmarks/bench_student_search.py [sizes...]
+       python benchmarks/bench_student_search.py 100000 1000000
+"""
+
+import sys
+import time
+
+from bench_utils import temp_database, seed_students, time_calls, print_table
+
+from services.database_service import DatabaseService
+
+
+SEARCH_TERMS = [
+    ('NIM', lambda count: f"{count // 3:08d}"),
+    ('rare name', lambda count: f"Number {count // 7}"),
+    ('common name', lambda count: "Student Number 12"),
+]
+
+
+def run(sizes=(100000, 1000000), iterations=20):
+    rows = []
+    
+    for count in sizes:
+        with temp_database() as db_config:
+            start = time.perf_counter()
+            seed_students(db_config, count)
+            print(f"Seeded {count} students in {time.perf_counter() - start:.1f}s")
+            
+            db_service = DatabaseService(db_config)
+            
+            for label, make_term in SEARCH_TERMS:
+                term = make_term(count)
+                for mode, fulltext in (('LIKE', False), ('FTS5', True)):
+                    db_service._fulltext_enabled = fulltext
+                    matches = len(db_service.search_students(term, limit=20))
+                    stats = time_calls(
+                        lambda i: db_service.search_students(term, limit=20), iterations
+                    )
+                    rows.append((count, label, mode, matches, stats['mean'] / 1000, stats['p95'] / 1000))
+    
+    print_table(
+        f"Search latency in milliseconds (top 20, {iterations} calls)",
+        ['students', 'term', 'mode', 'matches', 'mean (ms)', 'p95 (ms)'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(tuple(int(arg) for arg in sys.argv[1:]) or (100000, 1000000))
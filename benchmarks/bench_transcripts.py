@@ -0,0 +1,65 @@
+# benchmarks/bench_transcripts.py
+"""
+Benchmark: per-student transcript loop vs the batch transcript job
+
+Usage: python benchmarks/bench_transcripts.py [students]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from bench_utils import temp_database, seed_students, print_table
+
+from reports.excel_generator import ExcelReportGenerator
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+from services.student_service import StudentService
+from services.transcript_service import TranscriptService
+
+
+def serial_transcripts(db_service, reports_dir):
+    """What a cohort export used to be: two lookups and a workbook per student"""
+    student_service = StudentService(db_service)
+    grade_service = GradeService(db_service)
+    generator = ExcelReportGenerator(reports_dir=reports_dir)
+    count = 0
+    for student in db_service.iter_students():
+        detail = student_service.get_student_detail(student['id'])
+        record = grade_service.get_student_academic_record(student['id'])
+        generator.generate_academic_transcript(detail, record)
+        count += 1
+    return count
+
+
+def run(student_count=500, grades_per_student=8):
+    workers = os.cpu_count() or 1
+    rows = []
+    
+    with temp_database() as db_config, tempfile.TemporaryDirectory() as tmp_dir:
+        seed_students(db_config, student_count, grades_per_student=grades_per_student)
+        db_service = DatabaseService(db_config)
+        
+        def timed(label, func):
+            start = time.perf_counter()
+            files = func(os.path.join(tmp_dir, label.replace(' ', '_')))
+            elapsed = time.perf_counter() - start
+            rows.append((label, files, round(elapsed, 2), round(files / elapsed, 1)))
+        
+        timed('serial loop', lambda out: serial_transcripts(db_service, out))
+        timed('batch, inline', lambda out: TranscriptService(db_service, out)
+              .generate_cohort_transcripts(workers=0)['generated'])
+        timed(f'batch, {workers} processes', lambda out: TranscriptService(db_service, out)
+              .generate_cohort_transcripts(workers=workers)['generated'])
+    
+    print_table(
+        f"Transcript workbooks for {student_count} students ({grades_per_student} grades each, "
+        f"{workers} CPUs)",
+        ['method', 'files', 'seconds', 'files/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,104 @@
+# benchmarks/bench_utils.py
+"""
+Shared helpers for Student Management System benchmarks
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database_config import DatabaseConfig
+
+
+MAJORS = [
+    'Informatics Engineering',
+    'Information Systems',
+    'Informatics Management',
+    'Computer Engineering'
+]
+
+# students.major_code values matching MAJORS
+MAJOR_CODES = ['TI', 'SI', 'MI', 'TK']
+
+
+@contextmanager
+def temp_database(config_class=DatabaseConfig, **config_kwargs):
+    """Yield an initialized DatabaseConfig backed by a throwaway file"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = config_class(
+            db_name=os.path.join(tmp_dir, "bench.db"), **config_kwargs
+        )
+        with redirect_stdout(StringIO()):
+            db_config.initialize_database()
+        try:
+            yield db_config
+        finally:
+            db_config.close()
+
+
+def seed_students(db_config, count, grades_per_student=0, batch_size=10000):
+    """Insert synthetic students (and optionally grades) directly via SQL"""
+    with db_config.connection() as conn:
+        course_ids = [row[0] for row in conn.execute("SELECT id FROM courses ORDER BY id")]
+        
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            conn.executemany(
+                "INSERT INTO students (nim, name, major_code, email, phone, admission_year) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (f"NIM{i:08d}", f"Student Number {i}", MAJOR_CODES[i % len(MAJOR_CODES)],
+                     f"student{i}@example.com", None, 2015 + i % 10)
+                    for i in range(start, end)
+                )
+            )
+        
+        if grades_per_student:
+            student_ids = [row[0] for row in conn.execute("SELECT id FROM students ORDER BY id")]
+            conn.executemany(
+                "INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (student_id, course_ids[n % len(course_ids)], 1 + n // len(course_ids),
+                     '2023/2024', round((student_id * 7 + n * 13) % 401 / 100, 2), 'B')
+                    for student_id in student_ids
+                    for n in range(grades_per_student)
+                )
+            )
+        
+        conn.commit()
+
+
+def time_calls(func, iterations):
+    """Call func repeatedly and return latency statistics in microseconds"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    
+    samples.sort()
+    return {
+        'mean': statistics.fmean(samples),
+        'p50': samples[len(samples) // 2],
+        'p95': samples[int(len(samples) * 0.95) - 1],
+        'calls_per_second': 1_000_000 / statistics.fmean(samples)
+    }
+
+
+def print_table(title, headers, rows):
+    print()
+    print(title)
+    print("-" * 88)
+    print("".join(f"{header:<22}" for header in headers))
+    for row in rows:
+        print("".join(
+            f"{value:<22.2f}" if isinstance(value, float) else f"{str(value):<22}"
+            for value in row
+        ))
@@ -0,0 +1,74 @@
+# benchmarks/bench_validation.py
+"""
+Benchmark: per-record student validation vs the column-wise batch validator
+
+Usage: python benchmarks/bench_validation.py [records]
+"""
+
+import sys
+
+from bench_utils import MAJORS, time_calls, print_table
+
+from services.validation_service import ValidationService
+
+
+def make_records(record_count):
+    """Import-shaped records, one in ten failing one or more checks"""
+    records = []
+    for i in range(record_count):
+        record = {
+            'nim': f'2023{i:06d}',
+            'name': 'Student Name',
+            'major': MAJORS[i % len(MAJORS)],
+            'admission_year': str(2018 + i % 6),
+            'email': f'student{i}@example.com',
+            'phone': f'0812-{i % 10000:04d}-{i % 9999:04d}'
+        }
+        if i % 10 == 0:
+            record['nim'] = 'bad'
+            record['email'] = 'not-an-email'
+        records.append(record)
+    return records
+
+
+def per_record(validator, records):
+    """What import_students used to do for every row"""
+    errors = []
+    for row, record in enumerate(records, start=1):
+        nim = str(record.get('nim') or '').strip()
+        name = str(record.get('name') or '').strip()
+        major = str(record.get('major') or '').strip()
+        email = str(record.get('email') or '').strip()
+        phone = str(record.get('phone') or '').strip()
+        try:
+            admission_year = int(record.get('admission_year'))
+        except (TypeError, ValueError):
+            errors.append((row, 'Admission year must be a number'))
+            continue
+        result = validator.validate_student_data(nim, name, major, admission_year, email, phone)
+        if not result['valid']:
+            errors.append((row, result['message']))
+    return errors
+
+
+def run(record_count=200000, repeats=5):
+    validator = ValidationService()
+    records = make_records(record_count)
+    rows = []
+    
+    for label, func in [
+        ('per-record', lambda _: per_record(validator, records)),
+        ('batch (all errors)', lambda _: validator.validate_student_batch(records)['errors']),
+    ]:
+        stats = time_calls(func, repeats)
+        rows.append((label, len(func(0)), record_count / (stats['p50'] / 1_000_000)))
+    
+    print_table(
+        f"Validating {record_count} student records (median of {repeats} runs)",
+        ['method', 'errors', 'records/s'],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
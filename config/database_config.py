@@ -4,39 +4,306 @@
 Database configuration module for Student Management System
 """
 
+import os
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from utils.grade_scale import DEFAULT_GRADE_SCALE
+
+
+# Connection-level PRAGMA settings, selectable by name via DatabaseConfig(profile=...)
+# or the SMS_DB_PROFILE environment variable
+PERFORMANCE_PROFILES = {
+    # Every commit is fsynced; for machines where losing the last commit is unacceptable
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 10000
+    },
+    # WAL + NORMAL never corrupts the database, a power loss may only drop the last commits
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    # For large imports that can simply be re-run after a crash
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -262144,
+        'mmap_size': 1073741824,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000
+    }
+}
+
+DEFAULT_PROFILE = 'balanced'
+PROFILE_ENV_VAR = 'SMS_DB_PROFILE'
+
+# Recomputes student_academic_summary rows from grades for the students matched
+# by {condition}. Shared by the maintenance triggers and the rebuild command so
+# both produce exactly the figures get_student_gpa used to aggregate on the fly.
+ACADEMIC_SUMMARY_REFRESH_SQL = '''
+INSERT INTO student_academic_summary
+    (student_id, course_count, grade_sum, total_credits, weighted_sum, gpa)
+SELECT
+    s.id,
+    COUNT(g.id),
+    COALESCE(SUM(g.grade_value), 0),
+    COALESCE(SUM(c.credits), 0),
+    COALESCE(SUM(g.grade_value * c.credits), 0),
+    CASE
+        WHEN SUM(c.credits) > 0 THEN CAST(SUM(g.grade_value * c.credits) AS REAL) / SUM(c.credits)
+        ELSE 0
+    END
+FROM students s
+{join} JOIN grades g ON g.student_id = s.id
+LEFT JOIN courses c ON c.id = g.course_id
+WHERE {condition}
+GROUP BY s.id
+ON CONFLICT (student_id) DO UPDATE SET
+    course_count = excluded.course_count,
+    grade_sum = excluded.grade_sum,
+    total_credits = excluded.total_credits,
+    weighted_sum = excluded.weighted_sum,
+    gpa = excluded.gpa
+'''
+
+# Adds one student's contribution, taken from the summary row aliased r, to
+# the per-major totals. {sign} is '+' or '-'; {source} selects the r row.
+MAJOR_SUMMARY_DELTA_SQL = '''
+INSERT INTO major_academic_summary
+    (major_code, student_count, graded_students, average_total,
+     course_count, grade_sum, gpa_students, gpa_total)
+SELECT
+    {major},
+    {sign}{student_count},
+    {sign}(r.grade_sum > 0),
+    {sign}(CASE WHEN r.course_count > 0 THEN r.grade_sum / r.course_count ELSE 0 END),
+    {sign}r.course_count,
+    {sign}r.grade_sum,
+    {sign}(r.total_credits > 0),
+    {sign}(CASE WHEN r.total_credits > 0 THEN r.gpa ELSE 0 END)
+FROM {source}
+ON CONFLICT (major_code) DO UPDATE SET
+    student_count = student_count + excluded.student_count,
+    graded_students = graded_students + excluded.graded_students,
+    average_total = average_total + excluded.average_total,
+    course_count = course_count + excluded.course_count,
+    grade_sum = grade_sum + excluded.grade_sum,
+    gpa_students = gpa_students + excluded.gpa_students,
+    gpa_total = gpa_total + excluded.gpa_total
+'''
+
+STUDENTS_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nim VARCHAR(20) UNIQUE NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    major_code VARCHAR(10) NOT NULL REFERENCES majors (code) ON UPDATE CASCADE,
+    email VARCHAR(100),
+    phone VARCHAR(20),
+    admission_year INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+'''
+
+
+class ConnectionPool:
+    """Pool of reusable SQLite connections with thread-local checkout"""
+    
+    def __init__(self, factory, size=5, health_check_interval=30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        
+        self._factory = factory
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+        self._stats = {'created': 0, 'reused': 0, 'discarded': 0}
+    
+    def acquire(self):
+        # Nested checkouts on the same thread share one connection
+        if getattr(self._local, 'conn', None) is not None:
+            self._local.depth += 1
+            return self._local.conn
+        
+        conn = self._checkout()
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+    
+    def release(self):
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        
+        conn = self._local.conn
+        self._local.conn = None
+        self._checkin(conn)
+    
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release()
+    
+    def close(self):
+        """Close all idle connections and stop pooling new ones"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        
+        for conn, _ in idle:
+            self._discard(conn)
+    
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'idle': len(self._idle), 'size': self.size}
+    
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                entry = self._idle.pop() if self._idle else None
+            
+            if entry is None:
+                with self._lock:
+                    self._stats['created'] += 1
+                return self._factory()
+            
+            conn, last_used = entry
+            idle_time = time.monotonic() - last_used
+            if idle_time < self.health_check_interval or self._is_healthy(conn):
+                with self._lock:
+                    self._stats['reused'] += 1
+                return conn
+            
+            self._discard(conn)
+    
+    def _checkin(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        
+        self._discard(conn)
+    
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _discard(self, conn):
+        with self._lock:
+            self._stats['discarded'] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
 class DatabaseConfig:
-    def __init__(self, db_name="student_management.db"):
+    def __init__(self, db_name="student_management.db", pool_size=5,
+                 health_check_interval=30.0, profile=None):
         self.db_path = Path(__file__).parent.parent / "data" / db_name
         self.db_path.parent.mkdir(exist_ok=True)
+        
+        self.profile = profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+        if self.profile not in PERFORMANCE_PROFILES:
+            raise ValueError(
+                f"Unknown database profile '{self.profile}'. "
+                f"Choose one of: {', '.join(PERFORMANCE_PROFILES)}"
+            )
+        
+        # Bumped when a connection of this process writes the catalog tables
+        self.catalog_changes = 0
+        
+        self.pool = ConnectionPool(
+            self.get_connection,
+            size=pool_size,
+            health_check_interval=health_check_interval
+        )
     
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        """Open a new, unpooled connection"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")  
         conn.execute("PRAGMA foreign_keys = ON;")
         conn.execute("PRAGMA recursive_triggers = ON;")
+        self.apply_profile(conn)
+        conn.create_function("catalog_changed", 0, self._count_catalog_change)
+        self._watch_catalog(conn)
         return conn
     
+    def _count_catalog_change(self):
+        self.catalog_changes += 1
+    
+    def _watch_catalog(self, conn):
+        """Count this connection's catalog writes through a TEMP trigger, which
+        other processes and tools never see"""
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'catalog_version'").fetchone():
+            conn.execute('''
+            CREATE TEMP TRIGGER IF NOT EXISTS catalog_version_local
+            AFTER UPDATE ON main.catalog_version BEGIN
+                SELECT catalog_changed();
+            END
+            ''')
+    
+    def apply_profile(self, conn, profile=None):
+        """Apply the PRAGMA settings of a performance profile to a connection"""
+        settings = PERFORMANCE_PROFILES[profile or self.profile]
+        
+        # busy_timeout first so switching journal mode can wait for other writers
+        conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])};")
+        conn.execute(f"PRAGMA journal_mode = {settings['journal_mode']};")
+        conn.execute(f"PRAGMA synchronous = {settings['synchronous']};")
+        conn.execute(f"PRAGMA cache_size = {int(settings['cache_size'])};")
+        conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])};")
+        conn.execute(f"PRAGMA temp_store = {settings['temp_store']};")
+    
+    def connection(self):
+        """Check out a pooled connection for the current thread"""
+        return self.pool.connection()
+    
+    def close(self):
+        self.pool.close()
+    
     def initialize_database(self):
-        conn = self.get_connection()
+        with self.connection() as conn:
+            self._create_schema(conn)
+        print("Database initialized successfully")
+    
+    def _create_schema(self, conn):
         cursor = conn.cursor()
         
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nim VARCHAR(20) UNIQUE NOT NULL,
-            name VARCHAR(100) NOT NULL,
-            major VARCHAR(50) NOT NULL,
-            email VARCHAR(100),
-            phone VARCHAR(20),
-            admission_year INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
+        cursor.execute(STUDENTS_TABLE_SQL.format(table='students'))
         
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS majors (
@@ -104,6 +371,339 @@ class DatabaseConfig:
             sample_courses
         )
         
+        self._migrate_student_majors(conn)
+        
+        # Secondary indexes for the hot read paths. The transcript index covers
+        # every grades column read by get_student_grades, so it never touches the table.
+        # Student filters end in nim so keyset pages are read in index order.
+        cursor.executescript('''
+        CREATE INDEX IF NOT EXISTS idx_grades_student_transcript
+            ON grades (student_id, semester, academic_year, course_id,
+                       grade_value, grade_letter, created_at);
+        CREATE INDEX IF NOT EXISTS idx_grades_course
+            ON grades (course_id, grade_value, grade_letter);
+        CREATE INDEX IF NOT EXISTS idx_grades_term_course
+            ON grades (academic_year, semester, course_id, grade_value, grade_letter);
+        DROP INDEX IF EXISTS idx_students_major_year;
+        DROP INDEX IF EXISTS idx_students_admission_year;
+        CREATE INDEX IF NOT EXISTS idx_students_major_code_nim
+            ON students (major_code, nim);
+        CREATE INDEX IF NOT EXISTS idx_students_year_nim
+            ON students (admission_year, nim);
+        CREATE INDEX IF NOT EXISTS idx_students_major_code_year_nim
+            ON students (major_code, admission_year, nim);
+        CREATE INDEX IF NOT EXISTS idx_courses_major_semester
+            ON courses (major_code, semester);
+        ''')
+        
+        # Letter bands by minimum grade value; seeded once, then owned by the admin
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS grade_scale (
+            letter VARCHAR(2) PRIMARY KEY,
+            min_value REAL NOT NULL UNIQUE
+        )
+        ''')
+        if cursor.execute("SELECT COUNT(*) FROM grade_scale").fetchone()[0] == 0:
+            cursor.executemany(
+                "INSERT INTO grade_scale (letter, min_value) VALUES (?, ?)",
+                DEFAULT_GRADE_SCALE
+            )
+        
+        conn.commit()
+        self._create_catalog_version(conn)
+        self._create_academic_summary(conn)
+        self._create_major_summary(conn)
+        self._create_search_index(conn)
+    
+    def _create_catalog_version(self, conn):
+        """Single-row counter bumped by triggers whenever majors, courses or the
+        grade scale change, so in-memory catalog snapshots know when to reload"""
+        bump = "UPDATE catalog_version SET version = version + 1 WHERE id = 1;"
+        triggers = "".join(
+            f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_catalog_{event.lower()} AFTER {event} ON {table} BEGIN
+            {bump}
+        END;
+        '''
+            for table in ('majors', 'courses', 'grade_scale')
+            for event in ('INSERT', 'UPDATE', 'DELETE')
+        )
+        
+        conn.executescript('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1);
+        ''' + triggers)
+        self._watch_catalog(conn)
+    
+    def _create_academic_summary(self, conn):
+        """Per-student course_count, grade_sum, total_credits, weighted_sum and gpa,
+        kept current by triggers on grades and courses"""
+        cursor = conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_academic_summary'"
+        ).fetchone()
+        
+        def refresh(condition):
+            return ACADEMIC_SUMMARY_REFRESH_SQL.format(join='LEFT', condition=condition)
+        
+        cursor.executescript(f'''
+        CREATE TABLE IF NOT EXISTS student_academic_summary (
+            student_id INTEGER PRIMARY KEY,
+            course_count INTEGER NOT NULL DEFAULT 0,
+            grade_sum REAL NOT NULL DEFAULT 0,
+            total_credits INTEGER NOT NULL DEFAULT 0,
+            weighted_sum REAL NOT NULL DEFAULT 0,
+            gpa REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+        );
+        
+        -- GPA rankings read the best students straight off this index, keyed
+        -- on the GPA as displayed
+        DROP INDEX IF EXISTS idx_academic_summary_gpa;
+        CREATE INDEX IF NOT EXISTS idx_academic_summary_gpa_rounded
+            ON student_academic_summary (ROUND(gpa, 2), total_credits);
+        
+        CREATE TRIGGER IF NOT EXISTS grades_summary_insert AFTER INSERT ON grades BEGIN
+            {refresh('s.id = NEW.student_id')};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS grades_summary_update
+        AFTER UPDATE OF student_id, course_id, grade_value ON grades BEGIN
+            {refresh('s.id = OLD.student_id')};
+            {refresh('s.id = NEW.student_id AND NEW.student_id != OLD.student_id')};
+        END;
+        
+        -- A deleted student has no row to refresh, so cascaded deletes are no-ops
+        CREATE TRIGGER IF NOT EXISTS grades_summary_delete AFTER DELETE ON grades BEGIN
+            {refresh('s.id = OLD.student_id')};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS courses_summary_credits
+        AFTER UPDATE OF credits ON courses BEGIN
+            {refresh('s.id IN (SELECT student_id FROM grades WHERE course_id = NEW.id)')};
+        END;
+        ''')
+        
+        if not exists:
+            self._fill_academic_summary(conn)
+            conn.commit()
+    
+    def rebuild_academic_summary(self, conn):
+        """Recompute every student_academic_summary row from the grades table,
+        then the per-major totals built on top of it"""
+        rows = self._fill_academic_summary(conn)
+        self.rebuild_major_summary(conn)
+        return rows
+    
+    def _fill_academic_summary(self, conn):
+        conn.execute("DELETE FROM student_academic_summary")
+        cursor = conn.execute(
+            ACADEMIC_SUMMARY_REFRESH_SQL.format(join='INNER', condition='1=1')
+        )
+        return cursor.rowcount
+    
+    def _create_major_summary(self, conn):
+        """Per-major student counts and grade totals, so the academic summary
+        never scans students. Kept current by triggers on students and on
+        student_academic_summary."""
+        cursor = conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'major_academic_summary'"
+        ).fetchone()
+        
+        def delta(major_code, sign, student_count, source):
+            return MAJOR_SUMMARY_DELTA_SQL.format(
+                major=major_code, sign=sign, student_count=student_count, source=source
+            )
+        
+        def student_row(student_id):
+            return f'student_academic_summary r WHERE r.student_id = {student_id}'
+        
+        def summary_values(alias):
+            return (f'(SELECT {alias}.grade_sum AS grade_sum, {alias}.course_count AS course_count, '
+                    f'{alias}.total_credits AS total_credits, {alias}.gpa AS gpa) r WHERE 1')
+        
+        def major_of(student_id):
+            return f'(SELECT major_code FROM students WHERE id = {student_id})'
+        
+        # Counts the student without touching the grade totals
+        no_grades = '(SELECT 0 AS grade_sum, 0 AS course_count, 0 AS total_credits, 0 AS gpa) r WHERE 1'
+        
+        cursor.executescript(f'''
+        CREATE TABLE IF NOT EXISTS major_academic_summary (
+            major_code VARCHAR(10) PRIMARY KEY,
+            student_count INTEGER NOT NULL DEFAULT 0,
+            graded_students INTEGER NOT NULL DEFAULT 0,
+            average_total REAL NOT NULL DEFAULT 0,
+            course_count INTEGER NOT NULL DEFAULT 0,
+            grade_sum REAL NOT NULL DEFAULT 0,
+            gpa_students INTEGER NOT NULL DEFAULT 0,
+            gpa_total REAL NOT NULL DEFAULT 0
+        );
+        
+        CREATE TRIGGER IF NOT EXISTS students_major_summary_insert AFTER INSERT ON students BEGIN
+            {delta('NEW.major_code', '+', 1, no_grades)};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS students_major_summary_update
+        AFTER UPDATE OF major_code ON students WHEN OLD.major_code IS NOT NEW.major_code BEGIN
+            {delta('OLD.major_code', '-', 1, no_grades)};
+            {delta('OLD.major_code', '-', 0, student_row('OLD.id'))};
+            {delta('NEW.major_code', '+', 1, no_grades)};
+            {delta('NEW.major_code', '+', 0, student_row('NEW.id'))};
+        END;
+        
+        -- Runs before the cascade removes the student's summary row
+        CREATE TRIGGER IF NOT EXISTS students_major_summary_delete BEFORE DELETE ON students BEGIN
+            {delta('OLD.major_code', '-', 1, no_grades)};
+            {delta('OLD.major_code', '-', 0, student_row('OLD.id'))};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS academic_summary_major_insert
+        AFTER INSERT ON student_academic_summary BEGIN
+            {delta(major_of('NEW.student_id'), '+', 0, summary_values('NEW'))};
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS academic_summary_major_update
+        AFTER UPDATE ON student_academic_summary BEGIN
+            {delta(major_of('OLD.student_id'), '-', 0, summary_values('OLD'))};
+            {delta(major_of('NEW.student_id'), '+', 0, summary_values('NEW'))};
+        END;
+        ''')
+        
+        if not exists:
+            self.rebuild_major_summary(conn)
+    
+    def rebuild_major_summary(self, conn):
+        """Recompute major_academic_summary in one pass grouped by major_code
+        
+        gpa_total sums each student's credit-weighted GPA, so dividing it by
+        gpa_students gives the mean student GPA of the major.
+        """
+        conn.execute("DELETE FROM major_academic_summary")
+        conn.execute('''
+        INSERT INTO major_academic_summary
+            (major_code, student_count, graded_students, average_total,
+             course_count, grade_sum, gpa_students, gpa_total)
+        SELECT
+            s.major_code,
+            COUNT(*),
+            COALESCE(SUM(r.grade_sum > 0), 0),
+            COALESCE(SUM(CASE WHEN r.course_count > 0 THEN r.grade_sum / r.course_count ELSE 0 END), 0),
+            COALESCE(SUM(r.course_count), 0),
+            COALESCE(SUM(r.grade_sum), 0),
+            COALESCE(SUM(r.total_credits > 0), 0),
+            COALESCE(SUM(CASE WHEN r.total_credits > 0 THEN r.gpa ELSE 0 END), 0)
+        FROM students s
+        LEFT JOIN student_academic_summary r ON r.student_id = s.id
+        GROUP BY s.major_code
+        ''')
+        conn.commit()
+    
+    def _migrate_student_majors(self, conn):
+        """Rebuild a students table that still stores the free-text major name
+        so it references majors.code instead
+        
+        Names with no matching major are added to majors first, so no student
+        is dropped. Returns True when a migration ran.
+        """
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(students)")}
+        if 'major_code' in columns:
+            return False
+        
+        codes = {row['code'] for row in conn.execute("SELECT code FROM majors")}
+        names = {row['name'] for row in conn.execute("SELECT name FROM majors")}
+        for row in conn.execute("SELECT DISTINCT major FROM students").fetchall():
+            if row['major'] in names:
+                continue
+            base = "".join(word[0] for word in row['major'].split()).upper()[:8] or 'MJ'
+            code, suffix = base, 1
+            while code in codes:
+                suffix += 1
+                code = f"{base}{suffix}"
+            conn.execute(
+                "INSERT INTO majors (code, name, faculty) VALUES (?, ?, ?)",
+                (code, row['major'], 'Unassigned')
+            )
+            codes.add(code)
+            names.add(row['major'])
+        conn.commit()
+        
+        # Every trigger that mentions students must go before the table swap,
+        # or the rename fails on triggers pointing at the dropped table. The
+        # summary and search index setup that runs next recreates them.
+        stale_triggers = "".join(
+            f"DROP TRIGGER IF EXISTS {row['name']};\n"
+            for row in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+            if re.search(r'\bstudents\b', row['sql'])
+        )
+        
+        # Table rebuild: foreign keys must be off so dropping students does not
+        # cascade into grades
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.executescript(f'''
+            BEGIN;
+            {stale_triggers}
+            DROP TABLE IF EXISTS major_academic_summary;
+            {STUDENTS_TABLE_SQL.format(table='students_migrated')};
+            INSERT INTO students_migrated
+                (id, nim, name, major_code, email, phone, admission_year, created_at, updated_at)
+            SELECT s.id, s.nim, s.name,
+                   (SELECT MIN(m.code) FROM majors m WHERE m.name = s.major),
+                   s.email, s.phone, s.admission_year, s.created_at, s.updated_at
+            FROM students s;
+            DROP TABLE students;
+            ALTER TABLE students_migrated RENAME TO students;
+            COMMIT;
+            ''')
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
+        return True
+    
+    def _create_search_index(self, conn):
+        """Trigram full-text index over students.nim and students.name, kept in
+        sync by triggers. Skipped when SQLite was built without FTS5."""
+        cursor = conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'"
+        ).fetchone()
+        
+        if not exists:
+            try:
+                cursor.execute('''
+                CREATE VIRTUAL TABLE students_fts USING fts5(
+                    nim, name,
+                    content='students', content_rowid='id',
+                    tokenize='trigram'
+                )
+                ''')
+            except sqlite3.OperationalError:
+                return False
+        
+        cursor.executescript('''
+        CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts (rowid, nim, name) VALUES (new.id, new.nim, new.name);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+            INSERT INTO students_fts (students_fts, rowid, nim, name)
+            VALUES ('delete', old.id, old.nim, old.name);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS students_fts_update AFTER UPDATE OF nim, name ON students BEGIN
+            INSERT INTO students_fts (students_fts, rowid, nim, name)
+            VALUES ('delete', old.id, old.nim, old.name);
+            INSERT INTO students_fts (rowid, nim, name) VALUES (new.id, new.nim, new.name);
+        END;
+        ''')
+        
+        if not exists:
+            # Index students that were added before the search table existed
+            cursor.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+        
         conn.commit()
-        conn.close()
-        print("Database initialized successfully")
\ No newline at end of file
+        return True
\ No newline at end of file
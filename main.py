@@ -3,8 +3,10 @@
 Student Management System - Main Application
 """
 
+import argparse
 import sys
 import os
+import time
 
 # Add project root to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,20 +14,28 @@ sys.path.append(current_dir)
 
 
 class StudentManagementSystem:
-    def __init__(self):
+    def __init__(self, page_size=20):
+        self.page_size = page_size
         self.db_config = None
+        self.db_service = None
         self.student_service = None
         self.grade_service = None
+        self.import_service = None
         self.initialize_services()
     
     def initialize_services(self):
         from config.database_config import DatabaseConfig
+        from services.database_service import DatabaseService
         from services.student_service import StudentService
         from services.grade_service import GradeService
+        from services.import_service import ImportService
         
+        # All services share one config so they draw from the same connection pool
         self.db_config = DatabaseConfig()
-        self.student_service = StudentService()
-        self.grade_service = GradeService()
+        self.db_service = DatabaseService(self.db_config)
+        self.student_service = StudentService(self.db_service)
+        self.grade_service = GradeService(self.db_service)
+        self.import_service = ImportService(self.db_service)
     
     def clear_screen(self):
         """Clear terminal screen"""
@@ -100,18 +110,51 @@ class StudentManagementSystem:
         print("ALL STUDENTS")
         print("-" * 40)
         
-        students = self.student_service.search_students()
+        page = self.student_service.get_student_page(page_size=self.page_size)
         
-        if not students:
+        if 'error' in page:
+            print(f"❌ {page['error']}")
+            return
+        if not page['students']:
             print("No students found in database.")
             return
         
-        print(f"Total Students: {len(students)}\n")
-        print(f"{'ID':<5} {'NIM':<15} {'NAME':<25} {'MAJOR':<20}")
-        print("-" * 70)
-        
-        for student in students:
-            print(f"{student['id']:<5} {student['nim']:<15} {student['name']:<25} {student['major']:<20}")
+        page_number = 1
+        while True:
+            print(f"\nPage {page_number}\n")
+            print(f"{'ID':<5} {'NIM':<15} {'NAME':<25} {'MAJOR':<20}")
+            print("-" * 70)
+            
+            for student in page['students']:
+                print(f"{student['id']:<5} {student['nim']:<15} {student['name']:<25} {student['major']:<20}")
+            
+            options = []
+            if page['has_previous']:
+                options.append("[p]revious")
+            if page['has_next']:
+                options.append("[n]ext")
+            if not options:
+                return
+            options.append("[q]uit")
+            
+            choice = input(f"\n{', '.join(options)}: ").strip().lower()
+            
+            if choice == 'n' and page['has_next']:
+                page = self.student_service.get_student_page(
+                    page_size=self.page_size, after=page['next_cursor']
+                )
+                page_number += 1
+            elif choice == 'p' and page['has_previous']:
+                page = self.student_service.get_student_page(
+                    page_size=self.page_size, before=page['previous_cursor']
+                )
+                page_number -= 1
+            elif choice == 'q':
+                return
+            
+            if not page['students']:
+                print("No more students.")
+                return
     
     def search_students(self):
         """Search for students"""
@@ -152,12 +195,7 @@ class StudentManagementSystem:
             return
         
         # Get current student data first
-        students = self.student_service.search_students()
-        current_student = None
-        for student in students:
-            if student['id'] == int(student_id):
-                current_student = student
-                break
+        current_student = self.student_service.get_student_by_id(int(student_id))
         
         if not current_student:
             print("Student not found.")
@@ -199,7 +237,7 @@ class StudentManagementSystem:
             return
         
         # Show student info first
-        detail = self.student_service.get_student_detail(int(student_id))
+        detail = self.student_service.get_student_by_id(int(student_id))
         if not detail:
             print("Student not found.")
             return
@@ -212,9 +250,7 @@ class StudentManagementSystem:
         confirm = input("\nAre you sure you want to delete this student? (yes/no): ")
         
         if confirm.lower() == 'yes':
-            from services.database_service import DatabaseService
-            db_service = DatabaseService()
-            success = db_service.delete_student(int(student_id))
+            success = self.db_service.delete_student(int(student_id))
             
             if success:
                 print("\nStudent deleted successfully!")
@@ -290,15 +326,18 @@ class StudentManagementSystem:
             
             print("1. Add Grade")
             print("2. View Student Transcript")
-            print("3. Back to Main Menu")
+            print("3. GPA Rankings")
+            print("4. Back to Main Menu")
             
-            choice = input("\nSelect option (1-3): ")
+            choice = input("\nSelect option (1-4): ")
             
             if choice == '1':
                 self.add_grade()
             elif choice == '2':
                 self.view_transcript()
             elif choice == '3':
+                self.view_rankings()
+            elif choice == '4':
                 break
             else:
                 print("Invalid option")
@@ -311,8 +350,7 @@ class StudentManagementSystem:
         print("ADD GRADE")
         print("-" * 40)
         
-        from services.database_service import DatabaseService
-        db_service = DatabaseService()
+        db_service = self.db_service
         
         student_id = input("Student ID: ")
         
@@ -330,8 +368,7 @@ class StudentManagementSystem:
         print(f"Major: {student['major']}")
         
         # Show available courses for student's major
-        major_code = student['major'][:2] if student['major'] else "TI"
-        courses = db_service.get_courses(major_code=major_code)
+        courses = db_service.get_courses(major_code=student['major_code'])
         
         if not courses:
             print(f"No courses available for {student['major']} major.")
@@ -405,6 +442,195 @@ class StudentManagementSystem:
         else:
             print("\nNo grades recorded yet.")
     
+    def view_rankings(self):
+        """Show a GPA leaderboard, overall or per major / admission year"""
+        print("\n" + "-" * 40)
+        print("GPA RANKINGS")
+        print("-" * 40)
+        
+        print("1. Overall")
+        print("2. Per Major")
+        print("3. Per Admission Year")
+        print("4. One Semester")
+        scope = input("Select scope (1-4): ").strip()
+        
+        options = {}
+        if scope == '2':
+            options['partition_by'] = 'major'
+        elif scope == '3':
+            options['partition_by'] = 'admission_year'
+        elif scope == '4':
+            semester = input("Semester: ").strip()
+            if not semester.isdigit():
+                print("Invalid semester")
+                return
+            options['semester'] = int(semester)
+            options['academic_year'] = input("Academic Year (e.g., 2023/2024, blank for all): ").strip() or None
+        elif scope != '1':
+            print("Invalid option")
+            return
+        
+        top = input("Top N (default 10): ").strip()
+        min_credits = input("Minimum credits (default 1): ").strip()
+        options['top'] = int(top) if top.isdigit() else 10
+        options['min_credits'] = int(min_credits) if min_credits.isdigit() else 1
+        
+        start = time.perf_counter()
+        result = self.grade_service.get_rankings(**options)
+        elapsed = time.perf_counter() - start
+        if not result['success']:
+            print(f"❌ {result['error']}")
+            return
+        
+        header = f"{'Rank':<6} {'NIM':<15} {'Name':<25} {'GPA':<6} {'Credits':<8}"
+        partition_key = result['partition_by']
+        if not partition_key:
+            print("\n" + header)
+        
+        current = None
+        for row in result['rankings']:
+            if partition_key and row[partition_key] != current:
+                current = row[partition_key]
+                print(f"\n{current}")
+                print(header)
+            print(f"{row['rank']:<6} {row['nim']:<15} {row['name'][:25]:<25} "
+                  f"{row['gpa']:<6.2f} {row['total_credits']:<8}")
+        
+        if not result['rankings']:
+            print("No students match these criteria.")
+        print(f"\n{len(result['rankings'])} students ranked in {elapsed * 1000:.1f} ms")
+    
+    def import_students_file(self, file_path, batch_size=50000, start_row=1,
+                             workers=None, use_processes=False):
+        """Bulk import students from a CSV or XLSX file with a header row of
+        nim,name,major,admission_year and optional email,phone"""
+        self.db_config.initialize_database()
+        
+        result = self.import_service.import_students_file(
+            file_path,
+            start_row=start_row,
+            commit_size=batch_size,
+            workers=workers,
+            use_processes=use_processes,
+            progress=self._print_import_progress
+        )
+        
+        self._print_import_result(result)
+        return result
+    
+    def import_grades_file(self, file_path, batch_size=50000, update_existing=False,
+                           start_row=1, workers=None, use_processes=False):
+        """Bulk import grades from a CSV or XLSX file with a header row of
+        nim,course_code,semester,academic_year,grade_value"""
+        self.db_config.initialize_database()
+        
+        result = self.import_service.import_grades_file(
+            file_path,
+            start_row=start_row,
+            commit_size=batch_size,
+            update_existing=update_existing,
+            workers=workers,
+            use_processes=use_processes,
+            progress=self._print_import_progress
+        )
+        
+        self._print_import_result(result)
+        for conflict in result.get('conflicts', [])[:20]:
+            print(f"  Row {conflict['row']}: {conflict['nim']} {conflict['course_code']} "
+                  f"semester {conflict['semester']} ({conflict['academic_year']}) "
+                  f"{conflict['action']} - {conflict['reason']}")
+        
+        return result
+    
+    def _print_import_progress(self, progress):
+        print(f"  Committed through row {progress['committed_row']}: "
+              f"{progress['inserted']} inserted, {progress['failed']} failed, "
+              f"{progress['rows_per_second']} rows/s")
+    
+    def _print_import_result(self, result):
+        print(f"Rows read: {result['total_rows']}")
+        print(f"Inserted: {result['inserted']}")
+        if 'updated' in result:
+            print(f"Updated: {result['updated']}")
+            print(f"Conflicts: {len(result['conflicts'])}")
+        print(f"Failed: {result['failed']}")
+        print(f"Throughput: {result['rows_per_second']} rows/s ({result['elapsed_seconds']}s)")
+        
+        for error in result['errors'][:20]:
+            print(f"  Row {error['row']}: {error['error']}")
+        
+        if 'error' in result:
+            print(f"❌ {result['error']}")
+            print(f"Rows up to {result['last_committed_row']} were saved. "
+                  f"Resume with --start-row {result['resume_row']}")
+    
+    def generate_transcripts(self, major=None, admission_year=None, student_ids=None,
+                             workers=None, output_dir=None, output_format='xlsx', combined=False):
+        """Write transcript files for a cohort using a process pool, or one
+        combined PDF"""
+        from services.transcript_service import TranscriptService
+        
+        self.db_config.initialize_database()
+        service = TranscriptService(self.db_service, reports_dir=output_dir)
+        
+        if combined:
+            result = service.generate_cohort_pdf(
+                major=major,
+                admission_year=admission_year,
+                student_ids=student_ids
+            )
+            if result['success']:
+                print(f"Transcripts written: {result['transcripts']} "
+                      f"({result['pages']} pages) to {result['file']}")
+                print(f"Throughput: {result['pages_per_second']} pages/s "
+                      f"({result['elapsed_seconds']}s)")
+            else:
+                print(f"❌ {result['error']}")
+            return result
+        
+        result = service.generate_cohort_transcripts(
+            major=major,
+            admission_year=admission_year,
+            student_ids=student_ids,
+            workers=workers,
+            progress=lambda p: print(f"  {p['generated']} written, {p['failed']} failed, "
+                                     f"{p['files_per_second']} files/s"),
+            output_format=output_format
+        )
+        # Rejected before anything was rendered
+        if 'reports_dir' not in result:
+            print(f"❌ {result['error']}")
+            return result
+        
+        print(f"Transcripts written: {result['generated']} to {result['reports_dir']}")
+        print(f"Failed: {result['failed']}")
+        print(f"Throughput: {result['files_per_second']} files/s ({result['elapsed_seconds']}s)")
+        for failure in result['failures'][:20]:
+            print(f"  {failure['nim']}: {failure['error']}")
+        if 'error' in result:
+            print(f"❌ {result['error']}")
+        return result
+    
+    def rebuild_academic_summary(self):
+        """Recompute the per-student GPA summary table from the grades table"""
+        self.db_config.initialize_database()
+        start = time.perf_counter()
+        rows = self.db_service.rebuild_academic_summary()
+        print(f"Rebuilt academic summary for {rows} students "
+              f"in {time.perf_counter() - start:.2f}s")
+        return rows
+    
+    def regrade(self, batch_size=5000):
+        """Recompute stored grade letters after the grade_scale table changed"""
+        self.db_config.initialize_database()
+        result = self.grade_service.regrade_grades(batch_size=batch_size)
+        if result['success']:
+            print(f"Checked {result['checked']} grades, updated {result['updated']} letters "
+                  f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/s)")
+        else:
+            print(f"❌ {result['error']}")
+        return result
+    
     def run(self):
         """Main entry point for the system"""
         try:
@@ -435,6 +661,7 @@ class StudentManagementSystem:
                     self.manage_grades()
                 elif choice == '9':
                     print("\nExiting system. Goodbye!")
+                    self.db_config.close()
                     break
                 else:
                     print("Invalid option. Please try again.")
@@ -448,11 +675,115 @@ class StudentManagementSystem:
             input("Press Enter to exit...")
 
 
-def main():
+def build_parser():
+    parser = argparse.ArgumentParser(description="Student Management System")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    def add_import_options(command):
+        command.add_argument('--batch-size', type=int, default=50000,
+                             help='Rows per transaction (default: 50000)')
+        command.add_argument('--start-row', type=int, default=1,
+                             help='First data row to import, to resume a failed import (default: 1)')
+        command.add_argument('--workers', type=int, default=None,
+                             help='Parse and validate workers, 0 to run inline (default: CPU count)')
+        command.add_argument('--processes', action='store_true',
+                             help='Use worker processes instead of threads')
+    
+    import_students = subparsers.add_parser(
+        'import-students', help='Bulk import students from a CSV or XLSX file'
+    )
+    import_students.add_argument('file', help='CSV or XLSX with nim,name,major,admission_year[,email,phone]')
+    add_import_options(import_students)
+    
+    import_grades = subparsers.add_parser(
+        'import-grades', help='Bulk import grades from a CSV or XLSX file'
+    )
+    import_grades.add_argument('file', help='CSV or XLSX with nim,course_code,semester,academic_year,grade_value')
+    add_import_options(import_grades)
+    import_grades.add_argument('--update-existing', action='store_true',
+                               help='Overwrite grades that are already recorded instead of skipping them')
+    
+    transcripts = subparsers.add_parser(
+        'transcripts', help='Write transcripts for a cohort of students'
+    )
+    transcripts.add_argument('--major', help='Only students of this major (full name)')
+    transcripts.add_argument('--year', type=int, help='Only students admitted in this year')
+    transcripts.add_argument('--ids', type=int, nargs='+', help='Only these student ids')
+    transcripts.add_argument('--workers', type=int, default=None,
+                             help='Rendering processes, 0 to render inline (default: CPU count)')
+    transcripts.add_argument('--output-dir', help='Directory for the transcripts (default: reports/exports)')
+    transcripts.add_argument('--format', choices=['xlsx', 'pdf'], default='xlsx',
+                             help='Transcript file format (default: xlsx)')
+    transcripts.add_argument('--combined', action='store_true',
+                             help='Write every transcript into one multi-page PDF')
+    
+    subparsers.add_parser(
+        'rebuild-summary', help='Recompute the per-student GPA summary table'
+    )
+    
+    regrade = subparsers.add_parser(
+        'regrade', help='Recompute grade letters from the grade_scale table'
+    )
+    regrade.add_argument('--batch-size', type=int, default=5000,
+                         help='Grades per transaction (default: 5000)')
+    
+    return parser
+
+
+def main(argv=None):
     """Main entry point"""
+    args = build_parser().parse_args(argv)
     system = StudentManagementSystem()
+    
+    if args.command == 'import-students':
+        result = system.import_students_file(
+            args.file,
+            batch_size=args.batch_size,
+            start_row=args.start_row,
+            workers=args.workers,
+            use_processes=args.processes
+        )
+        system.db_config.close()
+        return 0 if result['success'] else 1
+    
+    if args.command == 'import-grades':
+        result = system.import_grades_file(
+            args.file,
+            batch_size=args.batch_size,
+            update_existing=args.update_existing,
+            start_row=args.start_row,
+            workers=args.workers,
+            use_processes=args.processes
+        )
+        system.db_config.close()
+        return 0 if result['success'] else 1
+    
+    if args.command == 'transcripts':
+        result = system.generate_transcripts(
+            major=args.major,
+            admission_year=args.year,
+            student_ids=args.ids,
+            workers=args.workers,
+            output_dir=args.output_dir,
+            output_format=args.format,
+            combined=args.combined
+        )
+        system.db_config.close()
+        return 0 if result['success'] else 1
+    
+    if args.command == 'rebuild-summary':
+        system.rebuild_academic_summary()
+        system.db_config.close()
+        return 0
+    
+    if args.command == 'regrade':
+        result = system.regrade(batch_size=args.batch_size)
+        system.db_config.close()
+        return 0 if result['success'] else 1
+    
     system.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -2,5 +2,6 @@
 """Reporting modules"""
 
 from .excel_generator import ExcelReportGenerator
+from .pdf_generator import PDFReportGenerator
 
-__all__ = ['ExcelReportGenerator']
\ No newline at end of file
+__all__ = ['ExcelReportGenerator', 'PDFReportGenerator']
\ No newline at end of file
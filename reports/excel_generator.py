@@ -3,56 +3,266 @@
 Excel report generator for Student Management System
 """
 
+import re
 import pandas as pd
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence, Tuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from utils.grade_scale import GradeScale
 
 
 class ExcelReportGenerator:
-    def __init__(self):
-        self.reports_dir = Path(__file__).parent.parent / "reports" / "exports"
+    # Student dict keys and their report headers
+    STUDENT_COLUMNS = {
+        'nim': 'Student ID',
+        'name': 'Name',
+        'major': 'Major',
+        'email': 'Email',
+        'phone': 'Phone',
+        'admission_year': 'Admission Year',
+        'course_count': 'Course Count',
+        'avg_grade': 'Average Grade'
+    }
+    STUDENT_DISPLAY_COLUMNS = ['Student ID', 'Name', 'Major', 'Admission Year',
+                               'Course Count', 'Average Grade', 'Average Letter', 'Email', 'Phone']
+    MAX_COLUMN_WIDTH = 50
+    # Rows a streamed report measures for column widths when width_sample is not given
+    STREAM_WIDTH_SAMPLE = 1000
+    # Rows in an Excel worksheet, including the header row
+    EXCEL_MAX_ROWS = 1048576
+    # Student keys the students report can be partitioned on, and their headers
+    REPORT_PARTITIONS = {'major': 'Major', 'admission_year': 'Admission Year'}
+    DATA_SHEET = 'Data Mahasiswa'
+    # Below this many rows a Python loop measures widths faster than pandas calls
+    SMALL_FRAME_ROWS = 256
+    
+    def __init__(self, reports_dir: Optional[str] = None, grade_scale: Optional[GradeScale] = None):
+        if reports_dir:
+            self.reports_dir = Path(reports_dir)
+        else:
+            self.reports_dir = Path(__file__).parent.parent / "reports" / "exports"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # When set, the students report gets a letter for each average grade
+        self.grade_scale = grade_scale
     
-    def generate_students_report(self, students: List[Dict]) -> str:
+    def generate_students_report(self, students: Iterable[Dict], streaming: bool = False,
+                                 width_sample: Optional[int] = None,
+                                 rows_per_sheet: Optional[int] = None,
+                                 partition_by: Optional[str] = None,
+                                 split_workbooks: bool = False) -> str:
+        """Write the students report from a list or a one-pass stream such as iter_students()"""
+        if rows_per_sheet is None:
+            rows_per_sheet = self.EXCEL_MAX_ROWS - 1
+        if not 1 <= rows_per_sheet < self.EXCEL_MAX_ROWS:
+            raise ValueError(f"rows_per_sheet must be between 1 and {self.EXCEL_MAX_ROWS - 1}")
+        if partition_by is not None and partition_by not in self.REPORT_PARTITIONS:
+            raise ValueError(f"partition_by must be one of: {', '.join(self.REPORT_PARTITIONS)}")
+        split = {'rows_per_sheet': rows_per_sheet, 'partition_by': partition_by,
+                 'split_workbooks': split_workbooks}
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"students_report_{timestamp}.xlsx"
         filepath = self.reports_dir / filename
         
-        df = pd.DataFrame(students)
+        # Write-only workbook, so memory stays flat however many students there are
+        if streaming:
+            if width_sample is None:
+                width_sample = self.STREAM_WIDTH_SAMPLE
+            self._stream_students_report(filepath, students, width_sample, **split)
+            return str(filepath)
+        
+        column_mapping = self.STUDENT_COLUMNS
         
-        column_mapping = {
-            'nim': 'Student ID',
-            'name': 'Name',
-            'major': 'Major',
-            'email': 'Email',
-            'phone': 'Phone',
-            'admission_year': 'Admission Year',
-            'course_count': 'Course Count',
-            'avg_grade': 'Average Grade'
-        }
+        # Keep only the report columns and the running summary, not the row dicts
+        columns = {key: [] for key in column_mapping}
+        present_keys = set()
+        summary = self._new_summary()
         
+        for student in students:
+            present_keys.update(key for key in column_mapping if key in student)
+            for key, values in columns.items():
+                values.append(student.get(key))
+            self._update_summary(summary, student)
+        
+        df = pd.DataFrame({key: values for key, values in columns.items() if key in present_keys})
         df = df.rename(columns=column_mapping)
         
-        display_columns = ['Student ID', 'Name', 'Major', 'Admission Year',
-                          'Course Count', 'Average Grade', 'Email', 'Phone']
+        display_columns = self.STUDENT_DISPLAY_COLUMNS
+        
+        if 'Average Grade' in df.columns:
+            df['Average Grade'] = df['Average Grade'].round(2)
+            if self.grade_scale is not None:
+                letters = self.grade_scale.classify_many(df['Average Grade'].fillna(0))
+                df['Average Letter'] = letters.where(df['Average Grade'] > 0)
         
         available_columns = [col for col in display_columns if col in df.columns]
         df = df[available_columns]
+        widths = self._column_widths(df, sample_size=width_sample)
         
-        if 'Average Grade' in df.columns:
-            df['Average Grade'] = df['Average Grade'].round(2)
+        if partition_by is not None or split_workbooks or len(df) > rows_per_sheet:
+            # Splitting goes through the write-only part writer, row by row
+            header = self.REPORT_PARTITIONS.get(partition_by)
+            position = available_columns.index(header) if header in available_columns else None
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            self._write_student_parts(
+                filepath, available_columns, widths,
+                ((row[position] if position is not None else None, row) for row in rows),
+                lambda: self._summary_rows(summary), **split
+            )
+            return str(filepath)
         
         with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Data Mahasiswa', index=False)  # Fix: nama sheet sesuai blueprint
-            self._add_summary_sheet(writer, students)
-            
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                self._auto_adjust_columns(worksheet, df)
+            df.to_excel(writer, sheet_name=self.DATA_SHEET, index=False)  # Fix: nama sheet sesuai blueprint
+            self._apply_column_widths(writer.sheets[self.DATA_SHEET], widths)
+            self._add_summary_sheet(writer, summary)
         
         return str(filepath)
     
+    def _stream_students_report(self, filepath: Path, students: Iterable[Dict], width_sample: int,
+                                rows_per_sheet: int, partition_by: Optional[str],
+                                split_workbooks: bool):
+        students = iter(students)
+        sample = list(islice(students, max(width_sample, 1)))
+        
+        present_keys = {key for student in sample for key in self.STUDENT_COLUMNS if key in student}
+        columns = [(key, header) for key, header in self.STUDENT_COLUMNS.items() if key in present_keys]
+        if 'avg_grade' in present_keys and self.grade_scale is not None:
+            columns.append(('avg_letter', 'Average Letter'))
+        order = {header: position for position, header in enumerate(self.STUDENT_DISPLAY_COLUMNS)}
+        columns.sort(key=lambda column: order[column[1]])
+        keys = [key for key, _ in columns]
+        headers = [header for _, header in columns]
+        
+        summary = self._new_summary()
+        
+        def report_rows(stream):
+            for student in stream:
+                self._update_summary(summary, student)
+                partition = student.get(partition_by) if partition_by is not None else None
+                yield partition, self._student_row(student, keys)
+        
+        sample_rows = list(report_rows(sample))
+        widths = self._sample_widths(headers, [row for _, row in sample_rows])
+        
+        self._write_student_parts(
+            filepath, headers, widths, chain(sample_rows, report_rows(students)),
+            lambda: self._summary_rows(summary),
+            rows_per_sheet=rows_per_sheet, partition_by=partition_by,
+            split_workbooks=split_workbooks
+        )
+    
+    def _write_student_parts(self, filepath: Path, headers: List[str], widths: List[int],
+                             rows: Iterable[Tuple[Any, Sequence]],
+                             summary_rows: Callable[[], List[Tuple[str, Any]]],
+                             rows_per_sheet: int, partition_by: Optional[str],
+                             split_workbooks: bool):
+        """Write (partition, row) pairs into write-only sheets of at most
+        rows_per_sheet rows, one run of sheets per partition, then the Index
+        and Summary sheets. summary_rows is called once the rows are written."""
+        workbook = Workbook(write_only=True)
+        index = []
+        open_parts = {}
+        part_counts = {}
+        sheet_names = set()
+        
+        def open_part(partition):
+            previous = open_parts.get(partition)
+            if previous is not None and split_workbooks:
+                previous['workbook'].save(previous['path'])
+            
+            part = part_counts[partition] = part_counts.get(partition, 0) + 1
+            sheet_name = self._part_sheet_name(partition, part, sheet_names)
+            if split_workbooks:
+                slug = re.sub(r'[^0-9A-Za-z]+', '_', sheet_name).strip('_')
+                target = {'workbook': Workbook(write_only=True),
+                          'path': filepath.with_name(f"{filepath.stem}_{slug}.xlsx")}
+            else:
+                target = {'workbook': workbook, 'path': filepath}
+            
+            target['sheet'] = target['workbook'].create_sheet(sheet_name)
+            self._apply_column_widths(target['sheet'], widths)
+            target['sheet'].append(headers)
+            target['entry'] = [sheet_name, target['path'].name,
+                               '' if partition is None else partition, 0]
+            index.append(target['entry'])
+            open_parts[partition] = target
+            return target
+        
+        for partition, row in rows:
+            target = open_parts.get(partition)
+            if target is None or target['entry'][3] >= rows_per_sheet:
+                target = open_part(partition)
+            target['sheet'].append(row)
+            target['entry'][3] += 1
+        
+        if not index:
+            open_part(None)
+        if split_workbooks:
+            for target in open_parts.values():
+                target['workbook'].save(target['path'])
+        
+        if len(index) > 1 or partition_by is not None or split_workbooks:
+            index_headers = ['Sheet', 'File', 'Partition', 'Rows']
+            index_sheet = workbook.create_sheet('Index')
+            self._apply_column_widths(index_sheet, self._sample_widths(index_headers, index))
+            index_sheet.append(index_headers)
+            for entry in index:
+                index_sheet.append(entry)
+        
+        summary = summary_rows()
+        summary_sheet = workbook.create_sheet('Summary')
+        self._apply_column_widths(summary_sheet, self._sample_widths(['Metric', 'Value'], summary))
+        summary_sheet.append(['Metric', 'Value'])
+        for row in summary:
+            summary_sheet.append(row)
+        
+        workbook.save(filepath)
+    
+    def _part_sheet_name(self, partition: Any, part: int, used: set) -> str:
+        """A unique worksheet name for one part of a partition, within Excel's
+        31 characters and without the characters Excel rejects"""
+        if partition is None:
+            base = self.DATA_SHEET
+        else:
+            base = re.sub(r'[\[\]:*?/\\]', '-', str(partition)).strip() or 'Unknown'
+        
+        suffix = f' ({part})' if part > 1 else ''
+        name = base[:31 - len(suffix)] + suffix
+        while name in used or name in ('Index', 'Summary'):
+            part += 1
+            suffix = f' ({part})'
+            name = base[:31 - len(suffix)] + suffix
+        used.add(name)
+        return name
+    
+    def _student_row(self, student: Dict, keys: List[str]) -> List:
+        row = []
+        for key in keys:
+            if key == 'avg_grade':
+                value = student.get(key)
+                row.append(round(value, 2) if value is not None else None)
+            elif key == 'avg_letter':
+                average = round(student.get('avg_grade') or 0, 2)
+                row.append(self.grade_scale.classify(average) if average > 0 else None)
+            else:
+                row.append(student.get(key))
+        return row
+    
+    def _sample_widths(self, headers: List[str], sample_rows: Iterable[Sequence]) -> List[int]:
+        """Widths for write-only sheets, from the header and a sample of rows"""
+        widths = [len(str(header)) for header in headers]
+        for row in sample_rows:
+            for position, value in enumerate(row):
+                if value is not None:
+                    widths[position] = max(widths[position], len(str(value)))
+        
+        return [min(width + 2, self.MAX_COLUMN_WIDTH) for width in widths]
+    
     def generate_academic_transcript(self, student_data: Dict, academic_record: Dict) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"transcript_{student_data['nim']}_{timestamp}.xlsx"
@@ -73,6 +283,8 @@ class ExcelReportGenerator:
             
             info_df = pd.DataFrame(info_data)
             info_df.to_excel(writer, sheet_name='Student Information', index=False)
+            self._apply_column_widths(writer.sheets['Student Information'],
+                                      self._column_widths(info_df))
             
             for semester in academic_record['grades_by_semester']:
                 sheet_name = f"Semester {semester['semester']}"
@@ -101,76 +313,81 @@ class ExcelReportGenerator:
                 start_row = len(grades_df) + 3
                 summary_df.to_excel(writer, sheet_name=sheet_name,
                                    startrow=start_row, index=False)
-            
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                self._auto_adjust_columns(worksheet, pd.DataFrame())
+                self._apply_column_widths(writer.sheets[sheet_name],
+                                          self._column_widths(grades_df, summary_df))
         
         return str(filepath)
     
-    def _add_summary_sheet(self, writer, students: List[Dict]):
-        summary_data = []
-        
-        total_students = len(students)
-        students_with_grades = [s for s in students if s.get('avg_grade', 0) > 0]
+    def _new_summary(self) -> Dict[str, Any]:
+        return {'total_students': 0, 'with_grades': 0, 'total_gpa': 0, 'majors': {}}
+    
+    def _update_summary(self, summary: Dict[str, Any], student: Dict):
+        summary['total_students'] += 1
+        if student.get('avg_grade', 0) > 0:
+            summary['with_grades'] += 1
+            summary['total_gpa'] += student['avg_grade']
         
-        if students_with_grades:
-            avg_gpa = sum(s['avg_grade'] for s in students_with_grades) / len(students_with_grades)
+        major = student['major']
+        if major not in summary['majors']:
+            summary['majors'][major] = {'count': 0, 'total_gpa': 0, 'with_grades': 0}
+        summary['majors'][major]['count'] += 1
+        if student.get('avg_grade', 0) > 0:
+            summary['majors'][major]['total_gpa'] += student['avg_grade']
+            summary['majors'][major]['with_grades'] += 1
+    
+    def _summary_rows(self, summary: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """(Metric, Value) rows of the Summary sheet"""
+        if summary['with_grades']:
+            avg_gpa = summary['total_gpa'] / summary['with_grades']
         else:
             avg_gpa = 0
         
-        summary_data.append({
-            'Metric': 'Total Students',
-            'Value': total_students
-        })
-        
-        summary_data.append({
-            'Metric': 'Students with Grades',
-            'Value': len(students_with_grades)
-        })
+        rows = [
+            ('Total Students', summary['total_students']),
+            ('Students with Grades', summary['with_grades']),
+            ('Average GPA', round(avg_gpa, 2))
+        ]
         
-        summary_data.append({
-            'Metric': 'Average GPA',
-            'Value': round(avg_gpa, 2)
-        })
-        
-        majors = {}
-        for student in students:
-            major = student['major']
-            if major not in majors:
-                majors[major] = {'count': 0, 'total_gpa': 0, 'with_grades': 0}
-            majors[major]['count'] += 1
-            if student.get('avg_grade', 0) > 0:
-                majors[major]['total_gpa'] += student['avg_grade']
-                majors[major]['with_grades'] += 1
-        
-        for major, stats in majors.items():
+        for major, stats in summary['majors'].items():
             avg_major_gpa = stats['total_gpa'] / stats['with_grades'] if stats['with_grades'] > 0 else 0
-            
-            summary_data.append({
-                'Metric': f'Students in {major}',
-                'Value': stats['count']
-            })
-            
-            summary_data.append({
-                'Metric': f'Average GPA for {major}',
-                'Value': round(avg_major_gpa, 2)
-            })
+            rows.append((f'Students in {major}', stats['count']))
+            rows.append((f'Average GPA for {major}', round(avg_major_gpa, 2)))
         
-        summary_df = pd.DataFrame(summary_data)
+        return rows
+    
+    def _add_summary_sheet(self, writer, summary: Dict[str, Any]):
+        summary_df = pd.DataFrame(self._summary_rows(summary), columns=['Metric', 'Value'])
         summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        self._apply_column_widths(writer.sheets['Summary'], self._column_widths(summary_df))
     
-    def _auto_adjust_columns(self, worksheet, df):
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
\ No newline at end of file
+    def _column_widths(self, *frames: pd.DataFrame, sample_size: Optional[int] = None) -> List[int]:
+        """Widths for frames written one below another from the first column,
+        from the string length of each header and value. With sample_size only
+        the first rows of each frame are measured."""
+        widths = []
+        for df in frames:
+            if sample_size is not None:
+                df = df.head(sample_size)
+            for position, column in enumerate(df.columns):
+                width = len(str(column))
+                if len(df) <= self.SMALL_FRAME_ROWS:
+                    # On small frames pandas call overhead outweighs a Python loop
+                    width = max([width] + [len(str(value)) for value in df[column].tolist()
+                                           if value is not None and value == value])
+                else:
+                    values = df[column].dropna()
+                    if len(values) and pd.api.types.is_integer_dtype(values):
+                        # The longest integer is the largest or the most negative one
+                        width = max(width, len(str(values.max())), len(str(values.min())))
+                    elif len(values):
+                        width = max(width, int(values.astype(str).str.len().max()))
+                if position < len(widths):
+                    widths[position] = max(widths[position], width)
+                else:
+                    widths.append(width)
+        
+        return [min(width + 2, self.MAX_COLUMN_WIDTH) for width in widths]
+    
+    def _apply_column_widths(self, worksheet, widths: List[int]):
+        for position, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(position)].width = width
@@ -3,10 +3,355 @@
 PDF report generator for Student Management System
 """
 
+import zlib
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate, chain, islice
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+
+# Advance widths of the standard Helvetica fonts for characters 32-126, in
+# 1/1000 of the font size (Adobe AFM metrics), so text can be measured
+# without loading a font file
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584
+)
+# Width assumed for characters outside the table
+DEFAULT_CHAR_WIDTH = 556
+
+FONTS = {
+    'F1': ('Helvetica', {chr(code): width for code, width in enumerate(HELVETICA_WIDTHS, start=32)}),
+    'F2': ('Helvetica-Bold', {chr(code): width for code, width in enumerate(HELVETICA_BOLD_WIDTHS, start=32)})
+}
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '(': '\\(', ')': '\\)', '\r': ' ', '\n': ' ', '\t': ' '})
+
+
+# Course names, majors and labels repeat across a cohort, so measurements are memoized
+@lru_cache(maxsize=4096)
+def text_width(text: str, font: str = 'F1', size: float = 10) -> float:
+    """Width of text in points when set in one of FONTS"""
+    widths = FONTS[font][1]
+    return sum(widths.get(char, DEFAULT_CHAR_WIDTH) for char in text) * size / 1000
+
+
+@lru_cache(maxsize=4096)
+def fit_text(text: str, max_width: float, font: str = 'F1', size: float = 10) -> str:
+    """Cut text down to max_width points, ending it with '...' if it was cut"""
+    if text_width(text, font, size) <= max_width:
+        return text
+    widths = FONTS[font][1]
+    advances = list(accumulate(widths.get(char, DEFAULT_CHAR_WIDTH) for char in text))
+    limit = max_width * 1000 / size
+    keep = bisect_right(advances, limit - 3 * widths['.'])
+    return text[:keep].rstrip() + '...'
+
+
+class _PDFWriter:
+    """Writes a PDF one page at a time. Pages are flushed to the file as they
+    are added; only object offsets and page numbers are kept, in compact
+    arrays, until close() writes the page tree, cross-reference table and
+    trailer.
+    
+    Objects 1 and 2 are the catalog and page tree, written last. `shared`
+    holds prebuilt objects numbered from 3 (fonts, page template, resources);
+    `page_dict` is the page tree body without /Kids and /Count.
+    """
+    
+    def __init__(self, file: BinaryIO, shared: List[bytes], page_dict: bytes, compress: bool):
+        self.file = file
+        self.page_dict = page_dict
+        self.compress = compress
+        self.offsets = array('q', [0, 0, 0])
+        self.page_ids = array('q')
+        self.position = 0
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        for body in shared:
+            self._add_object(body)
+    
+    def _write(self, data: bytes):
+        self.file.write(data)
+        self.position += len(data)
+    
+    def _add_object(self, body: bytes, object_id: Optional[int] = None) -> int:
+        if object_id is None:
+            object_id = len(self.offsets)
+            self.offsets.append(0)
+        self.offsets[object_id] = self.position
+        self._write(b'%d 0 obj\n%s\nendobj\n' % (object_id, body))
+        return object_id
+    
+    def add_page(self, content: bytes):
+        if self.compress:
+            content = zlib.compress(content)
+            stream = b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content)
+        else:
+            stream = b'<< /Length %d >>\nstream\n' % len(content)
+        contents_id = self._add_object(stream + content + b'\nendstream')
+        self.page_ids.append(
+            self._add_object(b'<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>' % contents_id)
+        )
+    
+    def _write_chunked(self, template: bytes, values: array, chunk_size: int = 4096):
+        """Write template % value for every value without building it all at once"""
+        values = iter(values)
+        while True:
+            chunk = b''.join(template % value for value in islice(values, chunk_size))
+            if not chunk:
+                break
+            self._write(chunk)
+    
+    def close(self):
+        self.offsets[2] = self.position
+        self._write(b'2 0 obj\n<< /Type /Pages %s /Count %d /Kids ['
+                    % (self.page_dict, len(self.page_ids)))
+        self._write_chunked(b'%d 0 R ', self.page_ids)
+        self._write(b']\n>>\nendobj\n')
+        self._add_object(b'<< /Type /Catalog /Pages 2 0 R >>', object_id=1)
+        
+        xref_offset = self.position
+        self._write(b'xref\n0 %d\n0000000000 65535 f \n' % len(self.offsets))
+        self._write_chunked(b'%010d 00000 n \n', self.offsets[1:])
+        self._write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                    % (len(self.offsets), xref_offset))
+
+
 class PDFReportGenerator:
-    def __init__(self):
-        pass
+    """Transcripts as A4 PDFs written directly, without a PDF library.
+    
+    Text is set in the built-in Helvetica fonts and measured from the
+    precomputed metrics above. The title block and rules shared by every page
+    are a form XObject built once per generator and drawn on each page, so a
+    page only carries its own text.
+    """
+    
+    PAGE_WIDTH = 595
+    PAGE_HEIGHT = 842
+    MARGIN = 50
+    # Lowest baseline for body text; the footer sits below it
+    BOTTOM = 62
+    ROW_HEIGHT = 13
+    TITLE = 'ACADEMIC TRANSCRIPT'
+    SUBTITLE = 'Student Management System'
+    # Grade table columns: (header, x, alignment); right-aligned columns end at x
+    GRADE_COLUMNS = [
+        ('Code', 50, 'left'),
+        ('Course Name', 115, 'left'),
+        ('Credits', 405, 'right'),
+        ('Grade', 470, 'right'),
+        ('Letter', 495, 'left')
+    ]
+    COURSE_NAME_WIDTH = 240
+    
+    def __init__(self, reports_dir: Optional[str] = None, compress: bool = True):
+        if reports_dir:
+            self.reports_dir = Path(reports_dir)
+        else:
+            self.reports_dir = Path(__file__).parent.parent / "reports" / "exports"
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Deflate page content streams; off only makes files easier to inspect
+        self.compress = compress
+        self._shared_objects = self._build_shared_objects()
+        self._page_dict = b'/MediaBox [0 0 %d %d] /Resources 6 0 R' % (self.PAGE_WIDTH, self.PAGE_HEIGHT)
+        self._grade_header = self._grade_header_cells()
+    
+    def generate_transcript_pdf(self, student_data: Dict, academic_record: Dict) -> str:
+        filepath = self._transcript_path(student_data)
+        self._write_pdf(filepath, [(student_data, academic_record)])
+        return str(filepath)
+    
+    def generate_transcripts_pdf(self, items: Iterable[Tuple[Dict, Dict]], combined: bool = True,
+                                 filename: Optional[str] = None) -> Dict[str, Any]:
+        """Write transcripts for many (student, academic record) pairs
+        
+        combined=True streams them all into one PDF, each transcript starting
+        on a new page; otherwise every student gets their own file in
+        reports_dir. items is consumed lazily, so a cohort query can be
+        passed straight in. Returns the files written and the transcript and
+        page counts; no file is written when items is empty.
+        """
+        items = iter(items)
+        first = next(items, None)
+        if first is None:
+            return {'files': [], 'transcripts': 0, 'pages': 0}
+        items = chain([first], items)
+        
+        if not combined:
+            files = []
+            pages = 0
+            for student, record in items:
+                filepath = self._transcript_path(student)
+                pages += self._write_pdf(filepath, [(student, record)])[1]
+                files.append(str(filepath))
+            return {'files': files, 'transcripts': len(files), 'pages': pages}
+        
+        if not filename:
+            filename = f"transcripts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filepath = self.reports_dir / filename
+        transcripts, pages = self._write_pdf(filepath, items)
+        return {'files': [str(filepath)], 'transcripts': transcripts, 'pages': pages}
+    
+    def _transcript_path(self, student: Dict) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.reports_dir / f"transcript_{student['nim']}_{timestamp}.pdf"
+    
+    def _write_pdf(self, filepath: Path, items: Iterable[Tuple[Dict, Dict]]) -> Tuple[int, int]:
+        """Write the transcripts to filepath, returning (transcripts, pages)"""
+        issued = datetime.now().strftime('%Y-%m-%d')
+        transcripts = 0
+        with open(filepath, 'wb') as pdf_file:
+            writer = _PDFWriter(pdf_file, self._shared_objects, self._page_dict, self.compress)
+            for student, record in items:
+                for page in self._transcript_pages(student, record, issued):
+                    writer.add_page(page)
+                transcripts += 1
+            writer.close()
+        return transcripts, len(writer.page_ids)
+    
+    def _build_shared_objects(self) -> List[bytes]:
+        """Font, page template and resource objects, numbered from 3"""
+        width, height, margin = self.PAGE_WIDTH, self.PAGE_HEIGHT, self.MARGIN
+        right = width - margin
+        template = ' '.join([
+            f'q 0.8 w {margin} 788 m {right} 788 l S 0.5 w {margin} 44 m {right} 44 l S Q',
+            self._text(margin, 800, self.TITLE, 'F2', 16),
+            self._text(right - text_width(self.SUBTITLE, 'F1', 9), 803, self.SUBTITLE, 'F1', 9)
+        ]).encode('ascii')
+        
+        fonts = [
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>'
+            % FONTS[name][0].encode('ascii')
+            for name in ('F1', 'F2')
+        ]
+        form = (b'<< /Type /XObject /Subtype /Form /BBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Length %d >>\nstream\n%s\nendstream'
+                % (width, height, len(template), template))
+        resources = b'<< /Font << /F1 3 0 R /F2 4 0 R >> /XObject << /Tpl 5 0 R >> >>'
+        return fonts + [form, resources]
+    
+    def _grade_header_cells(self) -> List[Tuple[float, str]]:
+        cells = []
+        for header, x, align in self.GRADE_COLUMNS:
+            if align == 'right':
+                x -= text_width(header, 'F2', 9)
+            cells.append((x, header))
+        return cells
+    
+    def _text(self, x: float, y: float, text: str, font: str = 'F1', size: float = 10) -> str:
+        return f'BT /{font} {size} Tf {x:.2f} {y:.2f} Td ({str(text).translate(_ESCAPES)}) Tj ET'
+    
+    def _text_row(self, y: float, cells: List[Tuple[float, Any]], font: str = 'F1',
+                  size: float = 10) -> str:
+        """Several (x, text) cells on one baseline as a single text object;
+        each Td moves relative to the previous cell"""
+        x, text = cells[0]
+        parts = [f'BT /{font} {size} Tf {x:.2f} {y:.2f} Td ({str(text).translate(_ESCAPES)}) Tj']
+        for next_x, text in cells[1:]:
+            parts.append(f'{next_x - x:.2f} 0 Td ({str(text).translate(_ESCAPES)}) Tj')
+            x = next_x
+        parts.append('ET')
+        return ' '.join(parts)
     
-    def generate_transcript_pdf(self, student_data, academic_record):
-        print("PDF generation feature not yet implemented")
-        return ""
\ No newline at end of file
+    def _transcript_pages(self, student: Dict, record: Dict, issued: str) -> List[bytes]:
+        """Content streams for one transcript, one per page"""
+        margin = self.MARGIN
+        right = self.PAGE_WIDTH - margin
+        footer_name = fit_text(f"{student['name']} ({student['nim']})", 300, 'F1', 8)
+        pages = []
+        ops = []
+        y = 0
+        
+        def new_page(continued: Optional[str] = None):
+            nonlocal ops, y
+            if ops:
+                finish_page()
+            page_label = f'Page {len(pages) + 1}'
+            ops = [
+                'q /Tpl Do Q',
+                self._text(margin, 30, footer_name, 'F1', 8),
+                self._text(right - text_width(page_label, 'F1', 8), 30, page_label, 'F1', 8)
+            ]
+            y = 765
+            if continued:
+                ops.append(self._text(margin, y, continued, 'F2', 10))
+                y -= 24
+        
+        def finish_page():
+            pages.append('\n'.join(ops).encode('cp1252', errors='replace'))
+        
+        def table_header():
+            nonlocal y
+            ops.append(self._text_row(y, self._grade_header, 'F2', 9))
+            ops.append(f'0.5 w {margin} {y - 4:.2f} m {right} {y - 4:.2f} l S')
+            y -= 17
+        
+        new_page()
+        info = [
+            ('Student ID', student['nim'], 'Admission Year', student['admission_year']),
+            ('Name', student['name'], 'GPA', f"{record['overall_gpa']:.2f}"),
+            ('Major', student['major'], 'Total Credits', record['total_credits']),
+            ('Issued', issued, 'Completed Courses', record['completed_courses'])
+        ]
+        for left_label, left_value, right_label, right_value in info:
+            ops.append(self._text_row(y, [(margin, left_label), (340, right_label)], 'F2', 10))
+            ops.append(self._text_row(y, [(margin + 85, fit_text(str(left_value), 190, 'F1', 10)),
+                                          (455, right_value)], 'F1', 10))
+            y -= 15
+        ops.append(f'0.5 w {margin} {y + 4:.2f} m {right} {y + 4:.2f} l S')
+        y -= 20
+        
+        if not record['grades_by_semester']:
+            ops.append(self._text(margin, y, 'No grades recorded.', 'F1', 10))
+        
+        continued = f"{student['name']} ({student['nim']}), continued"
+        for semester in record['grades_by_semester']:
+            heading = f"Semester {semester['semester']} - {semester['academic_year']}"
+            # Keep a heading with its table header and first row
+            if y - 16 - 17 - self.ROW_HEIGHT < self.BOTTOM:
+                new_page(continued)
+            ops.append(self._text(margin, y, heading, 'F2', 11))
+            y -= 16
+            table_header()
+            
+            for course in semester['courses']:
+                if y < self.BOTTOM:
+                    new_page(continued)
+                    ops.append(self._text(margin, y, f'{heading} (continued)', 'F2', 11))
+                    y -= 16
+                    table_header()
+                credits = str(course['credits'])
+                grade = f"{course['grade_value']:.2f}"
+                ops.append(self._text_row(y, [
+                    (margin, course['course_code']),
+                    (115, fit_text(course['course_name'], self.COURSE_NAME_WIDTH, 'F1', 9)),
+                    (405 - text_width(credits, 'F1', 9), credits),
+                    (470 - text_width(grade, 'F1', 9), grade),
+                    (495, course['grade_letter'])
+                ], 'F1', 9))
+                y -= self.ROW_HEIGHT
+            
+            if y < self.BOTTOM:
+                new_page(continued)
+            summary = (f"Semester GPA: {semester['gpa']:.2f}    "
+                       f"Credits: {semester['total_credits']}")
+            ops.append(self._text(margin, y - 2, summary, 'F2', 9))
+            y -= 26
+        
+        finish_page()
+        return pages
@@ -3,7 +3,9 @@
 Student Management System - Main Entry Point
 """
 
+import sys
+
 from main import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -5,5 +5,7 @@ from .database_service import DatabaseService
 from .student_service import StudentService
 from .grade_service import GradeService
 from .validation_service import ValidationService
+from .catalog_service import CatalogService, CatalogSnapshot
 
-__all__ = ['DatabaseService', 'StudentService', 'GradeService', 'ValidationService']
\ No newline at end of file
+__all__ = ['DatabaseService', 'StudentService', 'GradeService', 'ValidationService',
+           'CatalogService', 'CatalogSnapshot']
\ No newline at end of file
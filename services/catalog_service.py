@@ -0,0 +1,138 @@
+# services/catalog_service.py
+"""
+Reference data (majors, courses and grade scale) catalog for Student Management System
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from config.database_config import DatabaseConfig
+from utils.grade_scale import GradeScale
+
+
+def _freeze_index(index: Dict) -> Mapping:
+    return MappingProxyType({key: tuple(rows) for key, rows in index.items()})
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the majors, courses and grade_scale tables at one catalog version
+    
+    Rows are read-only mappings shared by every caller, so copy them with
+    dict() before changing anything.
+    """
+    version: int
+    majors: Tuple[Mapping, ...]
+    courses: Tuple[Mapping, ...]
+    majors_by_code: Mapping[str, Mapping]
+    majors_by_name: Mapping[str, Mapping]
+    courses_by_id: Mapping[int, Mapping]
+    courses_by_code: Mapping[str, Mapping]
+    courses_by_major: Mapping[str, Tuple[Mapping, ...]]
+    courses_by_semester: Mapping[int, Tuple[Mapping, ...]]
+    courses_by_major_semester: Mapping[Tuple[str, int], Tuple[Mapping, ...]]
+    grade_scale: GradeScale
+    
+    @classmethod
+    def from_rows(cls, version: int, majors: Iterable[Dict], courses: Iterable[Dict],
+                  grade_scale: Iterable[Dict] = ()) -> 'CatalogSnapshot':
+        majors = tuple(MappingProxyType(dict(row)) for row in sorted(majors, key=lambda m: m['code']))
+        courses = tuple(
+            MappingProxyType(dict(row))
+            for row in sorted(courses, key=lambda c: (c['semester'], c['code']))
+        )
+        
+        by_major, by_semester, by_major_semester = {}, {}, {}
+        for course in courses:
+            by_major.setdefault(course['major_code'], []).append(course)
+            by_semester.setdefault(course['semester'], []).append(course)
+            by_major_semester.setdefault((course['major_code'], course['semester']), []).append(course)
+        
+        return cls(
+            version=version,
+            majors=majors,
+            courses=courses,
+            majors_by_code=MappingProxyType({major['code']: major for major in majors}),
+            majors_by_name=MappingProxyType({major['name']: major for major in majors}),
+            courses_by_id=MappingProxyType({course['id']: course for course in courses}),
+            courses_by_code=MappingProxyType({course['code']: course for course in courses}),
+            courses_by_major=_freeze_index(by_major),
+            courses_by_semester=_freeze_index(by_semester),
+            courses_by_major_semester=_freeze_index(by_major_semester),
+            grade_scale=GradeScale.from_rows(grade_scale)
+        )
+    
+    def find_courses(self, major_code: Optional[str] = None,
+                     semester: Optional[int] = None) -> Tuple[Mapping, ...]:
+        """Courses ordered by semester and code, optionally filtered"""
+        if major_code and semester:
+            return self.courses_by_major_semester.get((major_code, semester), ())
+        if major_code:
+            return self.courses_by_major.get(major_code, ())
+        if semester:
+            return self.courses_by_semester.get(semester, ())
+        return self.courses
+    
+    def major_code_for(self, major_name: str) -> Optional[str]:
+        major = self.majors_by_name.get(major_name)
+        return major['code'] if major else None
+
+
+class CatalogService:
+    """Serves CatalogSnapshot objects, reloading when catalog_version changes
+    
+    The version row is bumped by triggers on every write to majors, courses
+    or grade_scale. Writes made through this process's connections are seen
+    straight away; the version is otherwise re-read at most once per
+    check_interval seconds, so edits made by another process show up within
+    that window.
+    """
+    
+    def __init__(self, db_config: Optional[DatabaseConfig] = None, check_interval: float = 1.0):
+        self.db_config = db_config or DatabaseConfig()
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._seen_changes = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+    
+    def snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        changes = self.db_config.catalog_changes
+        if (snapshot is not None and changes == self._seen_changes
+                and time.monotonic() - self._checked_at < self.check_interval):
+            return snapshot
+        
+        with self._lock:
+            with self.db_config.connection() as conn:
+                version = self._read_version(conn)
+                if self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = self._load(conn, version)
+            self._checked_at = time.monotonic()
+            self._seen_changes = changes
+            return self._snapshot
+    
+    def reload(self) -> CatalogSnapshot:
+        """Load a fresh snapshot regardless of the stored version"""
+        with self._lock:
+            changes = self.db_config.catalog_changes
+            with self.db_config.connection() as conn:
+                self._snapshot = self._load(conn, self._read_version(conn))
+            self._checked_at = time.monotonic()
+            self._seen_changes = changes
+            return self._snapshot
+    
+    def _read_version(self, conn) -> int:
+        row = conn.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+        return row['version'] if row else 0
+    
+    def _load(self, conn, version: int) -> CatalogSnapshot:
+        majors = [dict(row) for row in conn.execute("SELECT * FROM majors")]
+        courses = [dict(row) for row in conn.execute("SELECT * FROM courses")]
+        grade_scale = [dict(row) for row in conn.execute("SELECT letter, min_value FROM grade_scale")]
+        self.reloads += 1
+        return CatalogSnapshot.from_rows(version, majors, courses, grade_scale)
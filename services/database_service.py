@@ -4,191 +4,744 @@ Database service module for Student Management System
 """
 
 
+import json
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 from config.database_config import DatabaseConfig
+from services.catalog_service import CatalogService, CatalogSnapshot
 from models.student_model import Student
 from models.course_model import Grade
+from utils.cache import LRUCache
 
 
 class DatabaseService:
-    def __init__(self):
-        self.db_config = DatabaseConfig()
+    # The trigram tokenizer needs at least three characters to match anything
+    MIN_FULLTEXT_TERM_LENGTH = 3
+    # Rows fetched per round-trip by the iter_* streaming queries
+    FETCH_CHUNK_SIZE = 1000
+    
+    def __init__(self, db_config: Optional[DatabaseConfig] = None,
+                 cache_size: int = 1024, cache_ttl: Optional[float] = 300.0):
+        self.db_config = db_config or DatabaseConfig()
+        self._fulltext_enabled = None
+        self.catalog = CatalogService(self.db_config)
+        
+        # Student rows from get_student_by_id/get_student_by_nim, keyed by id.
+        # _student_nims maps the NIM of every cached row to its id.
+        self._student_nims = {}
+        self.student_cache = LRUCache(cache_size, ttl=cache_ttl, on_evict=self._forget_student_nim)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters of the student lookup cache"""
+        return self.student_cache.stats()
+    
+    def invalidate_student_cache(self, student_id: Optional[int] = None, nim: Optional[str] = None):
+        """Drop a cached student row after writing to the students or grades tables
+        outside of this service's own write methods"""
+        if student_id is None and nim is not None:
+            student_id = self._student_nims.get(nim)
+        
+        if student_id is not None:
+            student = self.student_cache.pop(student_id)
+            if student is not None:
+                self._forget_student_nim(student_id, student)
+        
+        if nim is not None:
+            self._student_nims.pop(nim, None)
+    
+    def clear_student_cache(self):
+        self.student_cache.clear()
+        self._student_nims.clear()
+    
+    def _cache_student(self, student: Dict):
+        self._student_nims[student['nim']] = student['id']
+        self.student_cache.put(student['id'], student)
+    
+    def _forget_student_nim(self, student_id: int, student: Dict):
+        if self._student_nims.get(student['nim']) == student_id:
+            self._student_nims.pop(student['nim'], None)
+    
+    def has_fulltext_search(self) -> bool:
+        """Whether the students_fts index exists in this database"""
+        if self._fulltext_enabled is None:
+            with self.db_config.connection() as conn:
+                self._fulltext_enabled = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'"
+                ).fetchone() is not None
+        
+        return self._fulltext_enabled
+    
+    def _iter_rows(self, query: str, params=(), chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream query results in fetchmany chunks, holding one pooled
+        connection until the iterator is exhausted or closed"""
+        chunk_size = chunk_size or self.FETCH_CHUNK_SIZE
+        
+        with self.db_config.connection() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+    
+    def _fulltext_phrase(self, search_term: str) -> Optional[str]:
+        """Quote a search term as an FTS5 phrase, or None when LIKE must be used"""
+        if len(search_term) < self.MIN_FULLTEXT_TERM_LENGTH or not self.has_fulltext_search():
+            return None
+        return '"' + search_term.replace('"', '""') + '"'
+    
+    def _major_code(self, major_name: str) -> str:
+        """majors.code for a major name, as stored in students.major_code"""
+        major_code = self.catalog.snapshot().major_code_for(major_name)
+        if major_code is None:
+            raise ValueError(f"Unknown major: {major_name}")
+        return major_code
     
     def add_student(self, student: Student) -> int:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO students (nim, name, major, email, phone, admission_year)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            student.nim, student.name, student.major,
-            student.email, student.phone, student.admission_year
-        ))
-        
-        student_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        major_code = self._major_code(student.major)
+        
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO students (nim, name, major_code, email, phone, admission_year)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                student.nim, student.name, major_code,
+                student.email, student.phone, student.admission_year
+            ))
+            
+            student_id = cursor.lastrowid
+            conn.commit()
+        
+        self.invalidate_student_cache(student_id, student.nim)
         return student_id
     
-    def get_students(self, filters: Optional[Dict] = None) -> List[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT s.*,
-               COUNT(g.id) as course_count,
-               COALESCE(AVG(g.grade_value), 0) as avg_grade
-        FROM students s
-        LEFT JOIN grades g ON s.id = g.student_id
-        WHERE 1=1
+    def add_students(self, students: List[Student]) -> int:
+        """Insert many students in a single transaction"""
+        if not students:
+            return 0
+        
+        rows = [
+            (student.nim, student.name, self._major_code(student.major),
+             student.email, student.phone, student.admission_year)
+            for student in students
+        ]
+        with self.db_config.connection() as conn:
+            try:
+                conn.executemany('''
+                INSERT INTO students (nim, name, major_code, email, phone, admission_year)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        
+        for student in students:
+            self.invalidate_student_cache(nim=student.nim)
+        return len(students)
+    
+    def get_existing_nims(self, nims: List[str], chunk_size: int = 500) -> Set[str]:
+        """Return which of the given NIMs are already registered"""
+        existing = set()
+        
+        with self.db_config.connection() as conn:
+            for start in range(0, len(nims), chunk_size):
+                chunk = nims[start:start + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT nim FROM students WHERE nim IN ({placeholders})", chunk
+                )
+                existing.update(row['nim'] for row in cursor)
+        
+        return existing
+    
+    def get_students(self, filters: Optional[Dict] = None, limit: Optional[int] = None,
+                     after: Optional[Tuple[str, int]] = None,
+                     before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """List students ordered by (nim, id)
+        
+        With limit, returns one keyset page: the first rows after the `after`
+        cursor, or the last rows before the `before` cursor. Cursors are
+        (nim, id) pairs taken from a previously returned row.
+        """
+        query, params = self._students_query(filters, limit, after, before)
+        return list(self._iter_rows(query, params))
+    
+    def iter_students(self, filters: Optional[Dict] = None,
+                      chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream students ordered by (nim, id) without building a list"""
+        query, params = self._students_query(filters)
+        return self._iter_rows(query, params, chunk_size)
+    
+    def _students_query(self, filters: Optional[Dict] = None, limit: Optional[int] = None,
+                        after: Optional[Tuple[str, int]] = None,
+                        before: Optional[Tuple[str, int]] = None) -> Tuple[str, List]:
+        where, params = self._student_filters(filters)
+        
+        order = "ASC"
+        if after:
+            where += " AND (s.nim, s.id) > (?, ?)"
+            params.extend(after)
+        elif before:
+            # Walk backwards from the cursor, then restore ascending order below
+            where += " AND (s.nim, s.id) < (?, ?)"
+            params.extend(before)
+            order = "DESC"
+        
+        page = f"SELECT * FROM students s {where} ORDER BY s.nim {order}, s.id {order}"
+        if limit:
+            page += " LIMIT ?"
+            params.append(limit)
+        
+        # Per-student totals come from the trigger-maintained summary table
+        query = f'''
+        SELECT p.*, mj.name as major,
+               COALESCE(sas.course_count, 0) as course_count,
+               COALESCE(sas.grade_sum / sas.course_count, 0) as avg_grade
+        FROM ({page}) p
+        LEFT JOIN majors mj ON mj.code = p.major_code
+        LEFT JOIN student_academic_summary sas ON sas.student_id = p.id
+        ORDER BY p.nim, p.id
         '''
         
+        return query, params
+    
+    def _student_filters(self, filters: Optional[Dict] = None) -> Tuple[str, List]:
+        """WHERE clause over students aliased as s for search_term, major, year and ids filters
+        
+        Raises ValueError for a major name that is not in the catalog.
+        """
+        where = "WHERE 1=1"
         params = []
         
         if filters:
             if 'search_term' in filters:
-                query += " AND (s.nim LIKE ? OR s.name LIKE ?)"
-                params.extend([f"%{filters['search_term']}%", f"%{filters['search_term']}%"])
+                phrase = self._fulltext_phrase(filters['search_term'])
+                if phrase:
+                    where += " AND s.id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)"
+                    params.append(phrase)
+                else:
+                    where += " AND (s.nim LIKE ? OR s.name LIKE ?)"
+                    params.extend([f"%{filters['search_term']}%", f"%{filters['search_term']}%"])
             
             if 'major' in filters:
-                query += " AND s.major = ?"
-                params.append(filters['major'])
+                where += " AND s.major_code = ?"
+                params.append(self._major_code(filters['major']))
             
             if 'year' in filters:
-                query += " AND s.admission_year = ?"
+                where += " AND s.admission_year = ?"
                 params.append(filters['year'])
+            
+            if 'ids' in filters:
+                # One JSON parameter instead of a placeholder per id
+                where += " AND s.id IN (SELECT value FROM json_each(?))"
+                params.append(json.dumps(list(filters['ids'])))
         
-        query += " GROUP BY s.id ORDER BY s.nim"
-        
-        cursor.execute(query, params)
-        students = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        return where, params
+    
+    def search_students(self, search_term: str, major: Optional[str] = None,
+                        year: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Students whose NIM or name contains search_term, best matches first;
+        raises ValueError for an unknown major"""
+        phrase = self._fulltext_phrase(search_term)
+        params = []
         
-        return students
+        if phrase:
+            # bm25 weights favour NIM hits over name hits. LIMIT -1 keeps SQLite
+            # from flattening the subquery, since bm25() only works on the FTS scan.
+            query = '''
+            SELECT s.*, mj.name as major,
+                   COALESCE(sas.course_count, 0) as course_count,
+                   COALESCE(sas.grade_sum / sas.course_count, 0) as avg_grade
+            FROM (
+                SELECT rowid AS student_id, bm25(students_fts, 10.0, 1.0) AS score
+                FROM students_fts
+                WHERE students_fts MATCH ?
+                LIMIT -1
+            ) m
+            JOIN students s ON s.id = m.student_id
+            LEFT JOIN majors mj ON mj.code = s.major_code
+            LEFT JOIN student_academic_summary sas ON sas.student_id = s.id
+            WHERE 1=1
+            '''
+            params.append(phrase)
+            order_by = "m.score, s.nim"
+        else:
+            query = '''
+            SELECT s.*, mj.name as major,
+                   COALESCE(sas.course_count, 0) as course_count,
+                   COALESCE(sas.grade_sum / sas.course_count, 0) as avg_grade
+            FROM students s
+            LEFT JOIN majors mj ON mj.code = s.major_code
+            LEFT JOIN student_academic_summary sas ON sas.student_id = s.id
+            WHERE (s.nim LIKE ? OR s.name LIKE ?)
+            '''
+            params.extend([f"%{search_term}%", f"%{search_term}%"])
+            # Without FTS5, rank exact and prefix matches ahead of substring matches
+            order_by = "s.nim = ? DESC, s.nim LIKE ? DESC, s.name LIKE ? DESC, s.nim"
+        
+        if major:
+            query += " AND s.major_code = ?"
+            params.append(self._major_code(major))
+        
+        if year:
+            query += " AND s.admission_year = ?"
+            params.append(year)
+        
+        query += f" ORDER BY {order_by}"
+        if not phrase:
+            params.extend([search_term, f"{search_term}%", f"{search_term}%"])
+        
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        return list(self._iter_rows(query, params))
     
     def get_student_by_nim(self, nim: str) -> Optional[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
+        cached = self.student_cache.get(self._student_nims.get(nim))
+        if cached is not None:
+            return dict(cached)
         
-        cursor.execute('''
-        SELECT s.*,
-               COUNT(g.id) as course_count,
-               COALESCE(AVG(g.grade_value), 0) as avg_grade
-        FROM students s
-        LEFT JOIN grades g ON s.id = g.student_id
-        WHERE s.nim = ?
-        GROUP BY s.id
-        ''', (nim,))
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT s.*, mj.name as major,
+                   COALESCE(sas.course_count, 0) as course_count,
+                   COALESCE(sas.grade_sum / sas.course_count, 0) as avg_grade
+            FROM students s
+            LEFT JOIN majors mj ON mj.code = s.major_code
+            LEFT JOIN student_academic_summary sas ON sas.student_id = s.id
+            WHERE s.nim = ?
+            ''', (nim,))
+            
+            result = cursor.fetchone()
         
-        result = cursor.fetchone()
-        conn.close()
-        return dict(result) if result else None
+        if not result:
+            return None
+        self._cache_student(dict(result))
+        return dict(result)
     
     def get_student_by_id(self, student_id: int) -> Optional[Dict]:
         """Get student by ID"""
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
+        cached = self.student_cache.get(student_id)
+        if cached is not None:
+            return dict(cached)
         
-        cursor.execute('''
-        SELECT s.*,
-               COUNT(g.id) as course_count,
-               COALESCE(AVG(g.grade_value), 0) as avg_grade
-        FROM students s
-        LEFT JOIN grades g ON s.id = g.student_id
-        WHERE s.id = ?
-        GROUP BY s.id
-        ''', (student_id,))
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT s.*, mj.name as major,
+                   COALESCE(sas.course_count, 0) as course_count,
+                   COALESCE(sas.grade_sum / sas.course_count, 0) as avg_grade
+            FROM students s
+            LEFT JOIN majors mj ON mj.code = s.major_code
+            LEFT JOIN student_academic_summary sas ON sas.student_id = s.id
+            WHERE s.id = ?
+            ''', (student_id,))
+            
+            result = cursor.fetchone()
         
-        result = cursor.fetchone()
-        conn.close()
-        return dict(result) if result else None
+        if not result:
+            return None
+        self._cache_student(dict(result))
+        return dict(result)
     
     def update_student(self, student_id: int, student: Student) -> bool:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        UPDATE students
-        SET nim = ?, name = ?, major = ?, email = ?, phone = ?,
-            admission_year = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-        ''', (
-            student.nim, student.name, student.major,
-            student.email, student.phone, student.admission_year, student_id
-        ))
-        
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        major_code = self._major_code(student.major)
+        
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            UPDATE students
+            SET nim = ?, name = ?, major_code = ?, email = ?, phone = ?,
+                admission_year = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            ''', (
+                student.nim, student.name, major_code,
+                student.email, student.phone, student.admission_year, student_id
+            ))
+            
+            rows_affected = cursor.rowcount
+            conn.commit()
+        
+        self.invalidate_student_cache(student_id)
         return rows_affected > 0
     
     def delete_student(self, student_id: int) -> bool:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM students WHERE id = ?', (student_id,))
-        rows_affected = cursor.rowcount
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM students WHERE id = ?', (student_id,))
+            rows_affected = cursor.rowcount
+            
+            conn.commit()
         
-        conn.commit()
-        conn.close()
+        self.invalidate_student_cache(student_id)
         return rows_affected > 0
     
     def add_grade(self, grade: Grade) -> int:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            grade.student_id, grade.course_id, grade.semester,
-            grade.academic_year, grade.grade_value, grade.grade_letter
-        ))
-        
-        grade_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                grade.student_id, grade.course_id, grade.semester,
+                grade.academic_year, grade.grade_value, grade.grade_letter
+            ))
+            
+            grade_id = cursor.lastrowid
+            conn.commit()
+        
+        # Cached rows carry course_count and avg_grade
+        self.invalidate_student_cache(grade.student_id)
         return grade_id
     
+    def get_student_ids_by_nim(self, nims: List[str], chunk_size: int = 500) -> Dict[str, int]:
+        """Map NIMs to student ids with one IN query per chunk"""
+        ids = {}
+        
+        with self.db_config.connection() as conn:
+            for start in range(0, len(nims), chunk_size):
+                chunk = nims[start:start + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT nim, id FROM students WHERE nim IN ({placeholders})", chunk
+                )
+                ids.update((row['nim'], row['id']) for row in cursor)
+        
+        return ids
+    
+    def get_course_ids_by_code(self, codes: List[str]) -> Dict[str, int]:
+        courses = self.catalog.snapshot().courses_by_code
+        return {code: courses[code]['id'] for code in codes if code in courses}
+    
+    def get_existing_grade_keys(self, student_ids: List[int],
+                                chunk_size: int = 500) -> Set[Tuple[int, int, int, str]]:
+        """Return (student_id, course_id, semester, academic_year) keys already graded"""
+        keys = set()
+        
+        with self.db_config.connection() as conn:
+            for start in range(0, len(student_ids), chunk_size):
+                chunk = student_ids[start:start + chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(f'''
+                SELECT student_id, course_id, semester, academic_year
+                FROM grades
+                WHERE student_id IN ({placeholders})
+                ''', chunk)
+                keys.update(tuple(row) for row in cursor)
+        
+        return keys
+    
+    def upsert_grades(self, grades: List[Tuple], update_existing: bool = False) -> int:
+        """Insert many (student_id, course_id, semester, academic_year, grade_value, grade_letter)
+        rows in one transaction. Rows hitting the unique key are updated or left alone."""
+        if not grades:
+            return 0
+        
+        if update_existing:
+            conflict_action = '''DO UPDATE SET grade_value = excluded.grade_value,
+                                  grade_letter = excluded.grade_letter'''
+        else:
+            conflict_action = "DO NOTHING"
+        
+        with self.db_config.connection() as conn:
+            try:
+                conn.executemany(f'''
+                INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (student_id, course_id, semester, academic_year) {conflict_action}
+                ''', grades)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        
+        for student_id in {grade[0] for grade in grades}:
+            self.invalidate_student_cache(student_id)
+        return len(grades)
+    
+    def iter_grade_values(self, batch_size: int = 5000) -> Iterator[List[Tuple[int, float, str]]]:
+        """Yield (id, grade_value, grade_letter) pages of every grade in id order"""
+        last_id = 0
+        with self.db_config.connection() as conn:
+            while True:
+                page = conn.execute(
+                    "SELECT id, grade_value, grade_letter FROM grades WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+                if not page:
+                    return
+                yield [tuple(row) for row in page]
+                last_id = page[-1][0]
+    
+    def update_grade_letters(self, letters: List[Tuple[str, int]]) -> int:
+        """Set many (grade_letter, grade id) pairs in one transaction"""
+        if not letters:
+            return 0
+        
+        with self.db_config.connection() as conn:
+            try:
+                conn.executemany("UPDATE grades SET grade_letter = ? WHERE id = ?", letters)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        
+        self.clear_student_cache()
+        return len(letters)
+    
     def get_student_grades(self, student_id: int) -> List[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        return list(self.iter_student_grades(student_id))
+    
+    def iter_student_grades(self, student_id: int,
+                            chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        return self._iter_rows('''
         SELECT g.*, c.code as course_code, c.name as course_name, c.credits
         FROM grades g
         JOIN courses c ON g.course_id = c.id
         WHERE g.student_id = ?
-        ORDER BY g.semester, g.academic_year
-        ''', (student_id,))
+        ORDER BY g.semester, g.academic_year, g.course_id
+        ''', (student_id,), chunk_size)
+    
+    def iter_cohort_grades(self, student_ids: Optional[Iterable[int]] = None,
+                           filters: Optional[Dict] = None,
+                           chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Stream the transcript rows of many students in one query
+        
+        Students are selected by id or by the get_students filters and come out
+        in (nim, id) order, each followed by its grades in transcript order.
+        Every row carries record_student_id; students without grades yield a
+        single row whose grade columns are NULL.
+        """
+        if student_ids is not None:
+            filters = {**(filters or {}), 'ids': student_ids}
+        where, params = self._student_filters(filters)
+        
+        return self._iter_rows(f'''
+        SELECT g.*, c.code as course_code, c.name as course_name, c.credits,
+               s.id as record_student_id
+        FROM students s
+        LEFT JOIN grades g ON g.student_id = s.id
+        LEFT JOIN courses c ON g.course_id = c.id
+        {where}
+        ORDER BY s.nim, s.id, g.semester, g.academic_year, g.course_id
+        ''', params, chunk_size)
+    
+    def iter_course_statistics(self, course_id: Optional[int] = None,
+                               semester: Optional[int] = None,
+                               academic_year: Optional[str] = None,
+                               percentiles: Iterable[int] = (25, 50, 75, 90),
+                               chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Per-course grade statistics computed in one query
+        
+        Yields course_id, total_students, mean, min_grade, max_grade, variance,
+        histogram (JSON object of letter counts) and p<N> columns holding the
+        linearly interpolated percentiles, for every course with grades in scope.
+        """
+        where = "WHERE 1=1"
+        params = []
+        
+        if course_id is not None:
+            where += " AND g.course_id = ?"
+            params.append(course_id)
         
-        grades = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return grades
+        if academic_year:
+            where += " AND g.academic_year = ?"
+            params.append(academic_year)
+        
+        if semester:
+            where += " AND g.semester = ?"
+            params.append(semester)
+        
+        # Grades take few distinct values, so collapse each course to
+        # (value, letter, freq) rows first; the index already returns them in
+        # that order. Running totals give each row the 1-based positions
+        # upto - freq + 1 .. upto it occupies in the sorted grade list.
+        # Percentile p sits at 0-based position p/100 * (n - 1) and is
+        # interpolated between the values either side of it.
+        percentile_columns = []
+        for percentile in percentiles:
+            if not 0 <= int(percentile) <= 100:
+                raise ValueError(f"Percentile {percentile} is outside 0-100")
+            position = f"({int(percentile) / 100!r} * (n - 1))"
+            lower = f"CAST({position} AS INTEGER)"
+            percentile_columns.append(
+                f"MAX(CASE WHEN {lower} + 1 BETWEEN upto - freq + 1 AND upto THEN grade_value END)"
+                f" * (1 - ({position} - {lower}))"
+                f" + MAX(CASE WHEN MIN({lower} + 2, n) BETWEEN upto - freq + 1 AND upto THEN grade_value END)"
+                f" * ({position} - {lower}) AS p{int(percentile)}"
+            )
+        
+        return self._iter_rows(f'''
+        WITH grade_counts AS (
+            -- Whole grades are stored as integers; REAL keeps the divisions below exact
+            SELECT g.course_id, CAST(g.grade_value AS REAL) AS grade_value, g.grade_letter, COUNT(*) AS freq
+            FROM grades g
+            {where}
+            GROUP BY g.course_id, g.grade_value, g.grade_letter
+        ),
+        cumulative AS (
+            SELECT course_id, grade_value, freq,
+                   SUM(freq) OVER (PARTITION BY course_id ORDER BY grade_value, grade_letter
+                                   ROWS UNBOUNDED PRECEDING) AS upto,
+                   SUM(freq) OVER (PARTITION BY course_id) AS n
+            FROM grade_counts
+        ),
+        letters AS (
+            SELECT course_id, json_group_object(grade_letter, letter_count) AS histogram
+            FROM (
+                SELECT course_id, grade_letter, SUM(freq) AS letter_count
+                FROM grade_counts
+                GROUP BY course_id, grade_letter
+            )
+            GROUP BY course_id
+        )
+        SELECT c.course_id,
+               SUM(freq) AS total_students,
+               SUM(grade_value * freq) / SUM(freq) AS mean,
+               MIN(grade_value) AS min_grade,
+               MAX(grade_value) AS max_grade,
+               MAX(SUM(grade_value * grade_value * freq) / SUM(freq)
+                   - (SUM(grade_value * freq) / SUM(freq)) * (SUM(grade_value * freq) / SUM(freq)), 0) AS variance,
+               {"".join(column + ", " for column in percentile_columns)}l.histogram
+        FROM cumulative c
+        JOIN letters l USING (course_id)
+        GROUP BY c.course_id
+        ORDER BY c.course_id
+        ''', params, chunk_size)
     
-    def get_student_gpa(self, student_id: int) -> Dict[str, Any]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
+    def iter_gpa_rankings(self, major_code: Optional[str] = None,
+                          admission_year: Optional[int] = None,
+                          semester: Optional[int] = None, academic_year: Optional[str] = None,
+                          min_credits: int = 1, dense: bool = False, top: Optional[int] = None,
+                          limit: Optional[int] = None, offset: int = 0,
+                          chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Students ranked by credit-weighted GPA, best first, ties sharing a rank
+        
+        Without a semester the cumulative GPA comes from the summary table;
+        with one, the term GPA is aggregated from that term's grades. top keeps
+        ranks up to and including top, then limit/offset page through them.
+        """
+        # For cumulative rankings the unary + keeps the planner on the GPA
+        # index, probing students as it walks down, instead of collecting and
+        # sorting a whole major or cohort
+        unindexed = "+" if semester is None else ""
+        conditions = ["r.total_credits >= ?"]
+        params = [max(min_credits, 1)]
+        if major_code:
+            conditions.append(f"{unindexed}s.major_code = ?")
+            params.append(major_code)
+        if admission_year:
+            conditions.append(f"{unindexed}s.admission_year = ?")
+            params.append(admission_year)
+        
+        if semester is None:
+            source = "student_academic_summary"
+            source_params = []
+        else:
+            term = "g.semester = ?"
+            source_params = [semester]
+            if academic_year:
+                term = "g.academic_year = ? AND " + term
+                source_params.insert(0, academic_year)
+            source = f'''(
+                SELECT g.student_id,
+                       CAST(SUM(g.grade_value * c.credits) AS REAL) / SUM(c.credits) AS gpa,
+                       SUM(c.credits) AS total_credits
+                FROM grades g
+                JOIN courses c ON c.id = g.course_id
+                WHERE {term}
+                GROUP BY g.student_id
+            )'''
+        
+        filtered = f'''
+            FROM {source} r
+            JOIN students s ON s.id = r.student_id
+            WHERE {" AND ".join(conditions)}'''
+        filter_params = source_params + params
+        
+        # Students are ranked on the GPA as displayed, matching the expression
+        # of the summary GPA index, so equal grades over different credit
+        # mixes tie even when their float GPAs differ in the last bit
+        key = "ROUND(r.gpa, 2)"
+        
+        # Ranks only depend on higher GPAs, so when few rows are wanted the
+        # window can run over just the GPAs at or above the last one needed,
+        # found by walking the summary GPA index from the top
+        cutoffs = []
+        cutoff_params = []
+        if semester is None:
+            if top:
+                distinct = "DISTINCT " if dense else ""
+                cutoffs.append(f"SELECT {distinct}{key} {filtered} ORDER BY {key} DESC LIMIT 1 OFFSET ?")
+                cutoff_params += filter_params + [top - 1]
+            if limit:
+                cutoffs.append(f"SELECT {key} {filtered} ORDER BY {key} DESC LIMIT 1 OFFSET ?")
+                cutoff_params += filter_params + [offset + limit - 1]
+        cutoff = "".join(f" AND {key} >= COALESCE(({query}), -1)" for query in cutoffs)
+        
+        rank_function = "DENSE_RANK" if dense else "RANK"
+        query = f'''
+        SELECT * FROM (
+            SELECT {rank_function}() OVER (ORDER BY {key} DESC) AS rank,
+                   s.id AS student_id, s.nim, s.name, s.major_code,
+                   (SELECT name FROM majors WHERE code = s.major_code) AS major,
+                   s.admission_year, r.gpa, r.total_credits
+            {filtered}{cutoff}
+        ) ranked
+        '''
+        query_params = filter_params + cutoff_params
         
-        cursor.execute('''
-        SELECT
-            COUNT(g.id) as total_courses,
-            SUM(c.credits) as total_credits,
-            SUM(g.grade_value * c.credits) as weighted_sum,
-            CASE
-                WHEN SUM(c.credits) > 0 THEN SUM(g.grade_value * c.credits) / SUM(c.credits)
-                ELSE 0
-            END as gpa
-        FROM grades g
-        JOIN courses c ON g.course_id = c.id
-        WHERE g.student_id = ?
-        ''', (student_id,))
+        if top:
+            query += " WHERE rank <= ?"
+            query_params.append(top)
+        query += " ORDER BY rank, nim"
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            query_params += [limit, offset]
         
-        result = cursor.fetchone()
-        conn.close()
+        return self._iter_rows(query, query_params, chunk_size)
+    
+    def get_admission_years(self) -> List[int]:
+        """Distinct admission years, found by hopping along the year index"""
+        with self.db_config.connection() as conn:
+            rows = conn.execute('''
+            WITH RECURSIVE years(year) AS (
+                SELECT MIN(admission_year) FROM students
+                UNION ALL
+                SELECT (SELECT MIN(admission_year) FROM students WHERE admission_year > year)
+                FROM years
+                WHERE year IS NOT NULL
+            )
+            SELECT year FROM years WHERE year IS NOT NULL
+            ''').fetchall()
+        return [row['year'] for row in rows]
+    
+    def get_student_gpa(self, student_id: int) -> Dict[str, Any]:
+        with self.db_config.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT course_count as total_courses, total_credits, weighted_sum, gpa
+            FROM student_academic_summary
+            WHERE student_id = ?
+            ''', (student_id,))
+            
+            result = cursor.fetchone()
         
         return dict(result) if result else {
             'total_courses': 0,
@@ -197,74 +750,69 @@ class DatabaseService:
             'gpa': 0
         }
     
+    def rebuild_academic_summary(self) -> int:
+        """Recompute the per-student summary table, returns the rows written"""
+        with self.db_config.connection() as conn:
+            rows = self.db_config.rebuild_academic_summary(conn)
+        
+        self.clear_student_cache()
+        return rows
+    
+    def get_catalog(self) -> CatalogSnapshot:
+        """Current immutable snapshot of the majors, courses and grade_scale tables"""
+        return self.catalog.snapshot()
+    
+    # Course and major lookups are served from the catalog snapshot and return
+    # copies, so callers may modify the dicts they get back
     def get_courses(self, major_code: Optional[str] = None,
                    semester: Optional[int] = None) -> List[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM courses WHERE 1=1"
-        params = []
-        
-        if major_code:
-            query += " AND major_code = ?"
-            params.append(major_code)
-        
-        if semester:
-            query += " AND semester = ?"
-            params.append(semester)
-        
-        query += " ORDER BY semester, code"
-        cursor.execute(query, params)
-        courses = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return courses
+        return list(self.iter_courses(major_code, semester))
+    
+    def iter_courses(self, major_code: Optional[str] = None,
+                     semester: Optional[int] = None) -> Iterator[Dict]:
+        """Courses from the catalog snapshot, which is already in memory"""
+        courses = self.catalog.snapshot().find_courses(major_code, semester)
+        return (dict(course) for course in courses)
     
     def get_course_by_code(self, course_code: str) -> Optional[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM courses WHERE code = ?', (course_code,))
-        result = cursor.fetchone()
-        conn.close()
-        return dict(result) if result else None
+        course = self.catalog.snapshot().courses_by_code.get(course_code)
+        return dict(course) if course else None
     
     def get_course_by_id(self, course_id: int) -> Optional[Dict]:
         """Get course by ID"""
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM courses WHERE id = ?', (course_id,))
-        result = cursor.fetchone()
-        conn.close()
-        return dict(result) if result else None
+        course = self.catalog.snapshot().courses_by_id.get(course_id)
+        return dict(course) if course else None
     
     def get_majors(self) -> List[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM majors ORDER BY code')
-        majors = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return majors
+        return [dict(major) for major in self.catalog.snapshot().majors]
     
     def get_major_statistics(self) -> List[Dict]:
-        conn = self.db_config.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        return list(self.iter_major_statistics())
+    
+    def iter_major_statistics(self, chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """Student count and mean credit-weighted student GPA per major; students
+        without graded credits are left out of the mean"""
+        return self._iter_rows('''
         SELECT
             m.code,
             m.name,
             m.faculty,
-            COUNT(s.id) as student_count,
-            COALESCE(AVG(g.grade_value), 0) as avg_gpa
+            COALESCE(ms.student_count, 0) as student_count,
+            COALESCE(ms.gpa_total / ms.gpa_students, 0) as avg_gpa
         FROM majors m
-        LEFT JOIN students s ON m.name = s.major
-        LEFT JOIN grades g ON s.id = g.student_id
-        GROUP BY m.code, m.name, m.faculty
+        LEFT JOIN major_academic_summary ms ON ms.major_code = m.code
         ORDER BY m.code
-        ''')
-        
-        stats = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return stats
\ No newline at end of file
+        ''', (), chunk_size)
+    
+    def get_academic_totals(self) -> Dict[str, Any]:
+        """Student counts and the summed per-student average grade, read from
+        the per-major summary table instead of scanning students"""
+        with self.db_config.connection() as conn:
+            row = conn.execute('''
+            SELECT
+                COALESCE(SUM(student_count), 0) as total_students,
+                COALESCE(SUM(graded_students), 0) as students_with_grades,
+                COALESCE(SUM(average_total), 0) as average_total
+            FROM major_academic_summary
+            ''').fetchone()
+        return dict(row)
@@ -3,41 +3,67 @@
 Grade service module for Student Management System
 """
 
-from typing import List, Dict, Any, Optional
+import json
+import math
+import sqlite3
+import time
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-from config.database_config import DatabaseConfig
 from models.course_model import Grade
 from services.database_service import DatabaseService
 from services.validation_service import ValidationService
+from utils.grade_scale import GradeScale
+
+
+def parse_grade_records(records: Iterable[Tuple[int, Dict]],
+                        validator: ValidationService) -> Tuple[List[Tuple], List[Dict]]:
+    """Convert (row_number, record) pairs into grade rows for store_grade_rows, plus row errors"""
+    parsed = []
+    errors = []
+    for row_number, record in records:
+        try:
+            nim = str(record['nim']).strip()
+            course_code = str(record['course_code']).strip()
+            semester = int(record['semester'])
+            academic_year = str(record['academic_year']).strip()
+            grade_value = float(record['grade_value'])
+        except (KeyError, TypeError, ValueError):
+            errors.append({'row': row_number, 'error': 'Missing or malformed grade fields'})
+            continue
+        
+        grade_validation = validator.validate_grade(grade_value)
+        if not grade_validation['valid']:
+            errors.append({'row': row_number, 'error': grade_validation['message']})
+            continue
+        
+        parsed.append((row_number, nim, course_code, semester, academic_year, grade_value))
+    
+    return parsed, errors
 
 
 class GradeService:
-    def __init__(self):
-        self.db_service = DatabaseService()
-        self.validator = ValidationService()
-        self.db_config = DatabaseConfig()
+    # Percentiles reported by the course statistics methods; 50 is the median
+    STATISTICS_PERCENTILES = (25, 50, 75, 90)
+    # Leaderboards that get_rankings can split results into
+    RANKING_PARTITIONS = ('major', 'admission_year')
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        self.db_service = db_service or DatabaseService()
+        self.validator = ValidationService(self.db_service.catalog)
+        self.db_config = self.db_service.db_config
+    
+    @property
+    def grade_scale(self) -> GradeScale:
+        """Letter bands from the grade_scale table, via the catalog snapshot"""
+        return self.db_service.get_catalog().grade_scale
     
     def calculate_grade_letter(self, grade_value: float) -> str:
-        if grade_value >= 3.7:
-            return 'A'
-        elif grade_value >= 3.3:
-            return 'A-'
-        elif grade_value >= 3.0:
-            return 'B+'
-        elif grade_value >= 2.7:
-            return 'B'
-        elif grade_value >= 2.3:
-            return 'B-'
-        elif grade_value >= 2.0:
-            return 'C+'
-        elif grade_value >= 1.7:
-            return 'C'
-        elif grade_value >= 1.3:
-            return 'C-'
-        elif grade_value >= 1.0:
-            return 'D+'
-        else:
-            return 'D'
+        return self.grade_scale.classify(grade_value)
+    
+    def calculate_grade_letters(self, grade_values: Iterable[float]) -> List[str]:
+        return self.grade_scale.classify_many(grade_values)
     
     def add_student_grade(self, student_id: int, course_id: int,
                          semester: int, academic_year: str, grade_value: float) -> Dict[str, Any]:
@@ -49,6 +75,12 @@ class GradeService:
                     'error': grade_validation['message']
                 }
             
+            if course_id not in self.db_service.get_catalog().courses_by_id:
+                return {
+                    'success': False,
+                    'error': 'Course not found'
+                }
+            
             grade_letter = self.calculate_grade_letter(grade_value)
             
             grade = Grade(
@@ -67,7 +99,171 @@ class GradeService:
                 'grade_id': grade_id,
                 'message': f'Grade successfully added: {grade_letter}'
             }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error: {str(e)}'
+            }
+    
+    def import_grades(self, records: Iterable[Dict], batch_size: int = 5000,
+                      update_existing: bool = False) -> Dict[str, Any]:
+        """Load many grades keyed by NIM and course code in batched transactions
+        
+        Each record is a dict with nim, course_code, semester, academic_year and
+        grade_value. Rows that hit the UNIQUE(student_id, course_id, semester,
+        academic_year) key are reported as conflicts and either skipped or,
+        with update_existing, overwritten.
+        """
+        start_time = time.perf_counter()
+        errors = []
+        conflicts = []
+        total_rows = 0
+        inserted = 0
+        updated = 0
+        
+        rows = enumerate(records, start=1)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            total_rows += len(batch)
+            
+            parsed, parse_errors = parse_grade_records(batch, self.validator)
+            errors.extend(parse_errors)
+            
+            outcome = self.store_grade_rows(parsed, update_existing=update_existing)
+            inserted += outcome['inserted']
+            updated += outcome['updated']
+            conflicts.extend(outcome['conflicts'])
+            errors.extend(outcome['errors'])
+        
+        elapsed = time.perf_counter() - start_time
+        errors.sort(key=lambda error: error['row'])
+        
+        return {
+            'success': not errors,
+            'total_rows': total_rows,
+            'inserted': inserted,
+            'updated': updated,
+            'conflicts': conflicts,
+            'failed': len(errors),
+            'errors': errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else 0
+        }
+    
+    def store_grade_rows(self, parsed: List[Tuple], update_existing: bool = False) -> Dict[str, Any]:
+        """Resolve and write one batch of rows from parse_grade_records in a transaction
+        
+        Returns the inserted and updated counts, conflicts and per-row errors.
+        If the write itself fails the batch is rolled back, every row that was
+        to be written is reported, and write_error holds the database error.
+        """
+        errors = []
+        conflicts = []
+        
+        student_ids = self.db_service.get_student_ids_by_nim(list({row[1] for row in parsed}))
+        course_ids = self.db_service.get_course_ids_by_code(list({row[2] for row in parsed}))
+        letters = self.calculate_grade_letters([row[5] for row in parsed])
+        
+        resolved = []
+        for (row_number, nim, course_code, semester, academic_year, grade_value), letter in zip(parsed, letters):
+            if nim not in student_ids:
+                errors.append({'row': row_number, 'error': f'Unknown NIM {nim}'})
+            elif course_code not in course_ids:
+                errors.append({'row': row_number, 'error': f'Unknown course code {course_code}'})
+            else:
+                key = (student_ids[nim], course_ids[course_code], semester, academic_year)
+                resolved.append((row_number, nim, course_code, key, grade_value, letter))
+        
+        existing_keys = self.db_service.get_existing_grade_keys(
+            list({row[3][0] for row in resolved})
+        )
+        
+        batch_keys = {}
+        to_write = []
+        batch_inserted = 0
+        batch_updated = 0
+        for row_number, nim, course_code, key, grade_value, letter in resolved:
+            conflict = {
+                'row': row_number,
+                'nim': nim,
+                'course_code': course_code,
+                'semester': key[2],
+                'academic_year': key[3]
+            }
+            
+            if key in batch_keys:
+                conflicts.append({**conflict, 'action': 'skipped',
+                                  'reason': f'Duplicate of row {batch_keys[key]} in the import'})
+                continue
+            batch_keys[key] = row_number
+            
+            if key in existing_keys:
+                if not update_existing:
+                    conflicts.append({**conflict, 'action': 'skipped',
+                                      'reason': 'Grade already recorded'})
+                    continue
+                conflicts.append({**conflict, 'action': 'updated',
+                                  'reason': 'Grade already recorded'})
+                batch_updated += 1
+            else:
+                batch_inserted += 1
+            
+            to_write.append(key + (grade_value, letter))
+        
+        write_error = None
+        try:
+            self.db_service.upsert_grades(to_write, update_existing=update_existing)
+        except sqlite3.Error as e:
+            # The whole batch was rolled back
+            write_error = str(e)
+            batch_inserted = batch_updated = 0
+            errors.extend(
+                {'row': row[0], 'error': f'Error: {str(e)}'}
+                for row in resolved if batch_keys.get(row[3]) == row[0]
+            )
+        
+        return {
+            'inserted': batch_inserted,
+            'updated': batch_updated,
+            'conflicts': conflicts,
+            'errors': errors,
+            'write_error': write_error
+        }
+    
+    def regrade_grades(self, batch_size: int = 5000) -> Dict[str, Any]:
+        """Recompute every stored letter from the current grade scale
+        
+        Grades are read in id-ordered pages, classified a page at a time and
+        only rows whose letter changed are written back.
+        """
+        try:
+            start_time = time.perf_counter()
+            grade_scale = self.grade_scale
+            checked = 0
+            updated = 0
+            
+            for page in self.db_service.iter_grade_values(batch_size):
+                letters = grade_scale.classify_many([row[1] for row in page])
+                changed = [
+                    (letter, grade_id)
+                    for (grade_id, _, old_letter), letter in zip(page, letters)
+                    if letter != old_letter
+                ]
+                checked += len(page)
+                updated += self.db_service.update_grade_letters(changed)
             
+            elapsed = time.perf_counter() - start_time
+            return {
+                'success': True,
+                'checked': checked,
+                'updated': updated,
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_second': round(checked / elapsed, 1) if elapsed > 0 else 0
+            }
+        
         except Exception as e:
             return {
                 'success': False,
@@ -75,10 +271,53 @@ class GradeService:
             }
     
     def get_student_academic_record(self, student_id: int) -> Dict[str, Any]:
-        grades = self.db_service.get_student_grades(student_id)
         gpa_data = self.db_service.get_student_gpa(student_id)
+        semesters, _ = self._group_by_semester(self.db_service.iter_student_grades(student_id))
+        
+        return {
+            'grades_by_semester': semesters,
+            'overall_gpa': round(gpa_data['gpa'], 2),
+            'total_credits': gpa_data['total_credits'],
+            'completed_courses': gpa_data['total_courses']
+        }
+    
+    def get_academic_records(self, student_ids: Optional[Iterable[int]] = None,
+                             filters: Optional[Dict] = None,
+                             chunk_size: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (student_id, academic record) for many students from one streamed query
         
+        Select students by id or with the get_students filters (major, year,
+        search_term); with neither, every student is included. Records are
+        identical to get_student_academic_record and come out in NIM order.
+        """
+        rows = self.db_service.iter_cohort_grades(student_ids, filters, chunk_size)
+        
+        for student_id, student_rows in groupby(rows, key=itemgetter('record_student_id')):
+            grades = []
+            for row in student_rows:
+                del row['record_student_id']
+                if row['id'] is not None:
+                    grades.append(row)
+            
+            semesters, totals = self._group_by_semester(grades)
+            if totals['total_credits'] > 0:
+                gpa = totals['weighted_sum'] / totals['total_credits']
+            else:
+                gpa = 0
+            
+            yield student_id, {
+                'grades_by_semester': semesters,
+                'overall_gpa': round(gpa, 2),
+                'total_credits': totals['total_credits'],
+                'completed_courses': totals['total_courses']
+            }
+    
+    def _group_by_semester(self, grades: Iterable[Dict]) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Group transcript-ordered grades by semester, computing semester GPAs
+        and overall totals in the same pass"""
         semesters = {}
+        totals = {'total_courses': 0, 'total_credits': 0, 'weighted_sum': 0}
+        
         for grade in grades:
             semester_key = f"{grade['semester']}_{grade['academic_year']}"
             if semester_key not in semesters:
@@ -93,6 +332,10 @@ class GradeService:
             semesters[semester_key]['courses'].append(grade)
             semesters[semester_key]['total_credits'] += grade['credits']
             semesters[semester_key]['weighted_sum'] += grade['grade_value'] * grade['credits']
+            
+            totals['total_courses'] += 1
+            totals['total_credits'] += grade['credits']
+            totals['weighted_sum'] += grade['grade_value'] * grade['credits']
         
         for semester in semesters.values():
             if semester['total_credits'] > 0:
@@ -100,12 +343,64 @@ class GradeService:
             else:
                 semester['gpa'] = 0
         
-        return {
-            'grades_by_semester': list(semesters.values()),
-            'overall_gpa': round(gpa_data['gpa'], 2),
-            'total_credits': gpa_data['total_credits'],
-            'completed_courses': gpa_data['total_courses']
-        }
+        return list(semesters.values()), totals
+    
+    def get_rankings(self, partition_by: Optional[str] = None, major: Optional[str] = None,
+                     admission_year: Optional[int] = None, semester: Optional[int] = None,
+                     academic_year: Optional[str] = None, min_credits: int = 1,
+                     method: str = 'rank', top: Optional[int] = 100,
+                     limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
+        """GPA leaderboard, overall or one per major or admission year
+        
+        Students are ranked by credit-weighted GPA (the term GPA when a
+        semester is given) among those with at least min_credits. method
+        'rank' leaves gaps after ties, 'dense' does not. top, limit and offset
+        apply within each leaderboard.
+        """
+        try:
+            if method not in ('rank', 'dense'):
+                return {'success': False, 'error': "Ranking method must be 'rank' or 'dense'"}
+            if partition_by is not None and partition_by not in self.RANKING_PARTITIONS:
+                return {'success': False, 'error': f'Cannot partition rankings by {partition_by}'}
+            
+            major_code = None
+            if major:
+                major_code = self.db_service.get_catalog().major_code_for(major)
+                if major_code is None:
+                    return {'success': False, 'error': f'Unknown major: {major}'}
+            
+            scopes = [{'major_code': major_code, 'admission_year': admission_year}]
+            if partition_by == 'major' and not major_code:
+                scopes = [{'major_code': m['code'], 'admission_year': admission_year}
+                          for m in self.db_service.get_catalog().majors]
+            elif partition_by == 'admission_year' and not admission_year:
+                scopes = [{'major_code': major_code, 'admission_year': year}
+                          for year in self.db_service.get_admission_years()]
+            
+            rankings = []
+            for scope in scopes:
+                for row in self.db_service.iter_gpa_rankings(
+                    semester=semester, academic_year=academic_year, min_credits=min_credits,
+                    dense=method == 'dense', top=top, limit=limit, offset=offset, **scope
+                ):
+                    row['gpa'] = round(row['gpa'], 2)
+                    rankings.append(row)
+            
+            return {
+                'success': True,
+                'partition_by': partition_by,
+                'method': method,
+                'semester': semester,
+                'academic_year': academic_year,
+                'min_credits': min_credits,
+                'rankings': rankings
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error: {str(e)}'
+            }
     
     def get_course_statistics(self, course_id: int) -> Dict[str, Any]:
         """Get statistics for a specific course"""
@@ -118,49 +413,82 @@ class GradeService:
                     'error': 'Course not found'
                 }
             
-            # Get grades for this course
-            conn = self.db_config.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT g.*, s.name as student_name, s.nim
-            FROM grades g
-            JOIN students s ON g.student_id = s.id
-            WHERE g.course_id = ?
-            ''', (course_id,))
-            
-            grades = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            
-            if not grades:
-                return {
-                    'course_id': course_id,
-                    'course_name': course['name'],
-                    'total_students': 0,
-                    'average_grade': 0,
-                    'grade_distribution': {}
-                }
-            
-            # Calculate statistics
-            total_students = len(grades)
-            average_grade = sum(g['grade_value'] for g in grades) / total_students
+            rows = list(self.db_service.iter_course_statistics(
+                course_id=course_id, percentiles=self.STATISTICS_PERCENTILES
+            ))
+            return self._format_course_statistics(course, rows[0] if rows else None)
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error: {str(e)}'
+            }
+    
+    def get_all_course_statistics(self, semester: Optional[int] = None,
+                                  academic_year: Optional[str] = None) -> Dict[str, Any]:
+        """Statistics for every course, or every course graded in one term,
+        from a single aggregate query"""
+        try:
+            rows = {
+                row['course_id']: row
+                for row in self.db_service.iter_course_statistics(
+                    semester=semester, academic_year=academic_year,
+                    percentiles=self.STATISTICS_PERCENTILES
+                )
+            }
             
-            # Grade distribution
-            distribution = {}
-            for grade in grades:
-                letter = grade['grade_letter']
-                distribution[letter] = distribution.get(letter, 0) + 1
+            # Without a term, courses nobody has taken are listed with zero counts
+            term = semester or academic_year
+            courses = [
+                self._format_course_statistics(course, rows.get(course['id']))
+                for course in self.db_service.get_courses()
+                if course['id'] in rows or not term
+            ]
             
             return {
-                'course_id': course_id,
-                'course_name': course['name'],
-                'total_students': total_students,
-                'average_grade': round(average_grade, 2),
-                'grade_distribution': distribution
+                'success': True,
+                'semester': semester,
+                'academic_year': academic_year,
+                'courses': courses
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
                 'error': f'Error: {str(e)}'
-            }
\ No newline at end of file
+            }
+    
+    def _format_course_statistics(self, course: Dict, row: Optional[Dict]) -> Dict[str, Any]:
+        if not row:
+            return {
+                'course_id': course['id'],
+                'course_code': course['code'],
+                'course_name': course['name'],
+                'total_students': 0,
+                'average_grade': 0,
+                'min_grade': 0,
+                'max_grade': 0,
+                'std_dev': 0,
+                'median': 0,
+                'percentiles': {},
+                'grade_distribution': {}
+            }
+        
+        percentiles = {
+            percentile: round(row[f'p{percentile}'], 2)
+            for percentile in self.STATISTICS_PERCENTILES
+        }
+        
+        return {
+            'course_id': course['id'],
+            'course_code': course['code'],
+            'course_name': course['name'],
+            'total_students': row['total_students'],
+            'average_grade': round(row['mean'], 2),
+            'min_grade': row['min_grade'],
+            'max_grade': row['max_grade'],
+            'std_dev': round(math.sqrt(row['variance']), 2),
+            'median': percentiles[50],
+            'percentiles': percentiles,
+            'grade_distribution': json.loads(row['histogram'])
+        }
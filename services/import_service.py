@@ -0,0 +1,217 @@
+# services/import_service.py
+"""
+File import service module for Student Management System
+"""
+
+import csv
+import os
+import sqlite3
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService, parse_grade_records
+from services.student_service import StudentService, validate_student_records
+from services.validation_service import ValidationService
+from utils.pipeline import run_in_order
+
+
+SUPPORTED_FORMATS = ('.csv', '.xlsx')
+
+
+@contextmanager
+def open_rows(file_path: str) -> Iterator[Tuple[List[str], Iterator[Sequence]]]:
+    """Open a CSV or XLSX file as (header, data rows)
+    
+    CSV goes through the csv module and XLSX through an openpyxl read-only
+    workbook, so neither is loaded into memory. Header names are stripped
+    and lowercased.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    
+    if extension == '.csv':
+        with open(file_path, newline='', encoding='utf-8-sig') as csv_file:
+            reader = csv.reader(csv_file)
+            header = next(reader, [])
+            yield [str(name).strip().lower() for name in header], reader
+    elif extension == '.xlsx':
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            yield [str(name or '').strip().lower() for name in header], rows
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported file type {extension or file_path!r}, "
+                         f"expected one of: {', '.join(SUPPORTED_FORMATS)}")
+
+
+def _numbered_records(header: List[str], first_row: int,
+                      rows: List[Sequence]) -> List[Tuple[int, Dict]]:
+    """Pair rows with their row numbers as dicts, dropping blank rows"""
+    return [
+        (row_number, dict(zip(header, row)))
+        for row_number, row in enumerate(rows, start=first_row)
+        if any(value not in (None, '') for value in row)
+    ]
+
+
+def _parse_student_chunk(validator: ValidationService, header: List[str],
+                         first_row: int, rows: List[Sequence]) -> Tuple[List[Tuple], List[Dict]]:
+    return validate_student_records(_numbered_records(header, first_row, rows), validator)
+
+
+def _parse_grade_chunk(validator: ValidationService, header: List[str],
+                       first_row: int, rows: List[Sequence]) -> Tuple[List[Tuple], List[Dict]]:
+    return parse_grade_records(_numbered_records(header, first_row, rows), validator)
+
+
+class ImportService:
+    """Pipelined file imports: one reader, a pool that parses and validates
+    chunks, and a single writer that commits in large batches.
+    
+    Row numbers count data rows from 1, after the header row. A failed run
+    reports resume_row; passing it back as start_row skips everything that
+    was already committed.
+    """
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        self.db_service = db_service or DatabaseService()
+        self.student_service = StudentService(self.db_service)
+        self.grade_service = GradeService(self.db_service)
+    
+    def import_students_file(self, file_path: str, start_row: int = 1, chunk_size: int = 2000,
+                             commit_size: int = 50000, workers: Optional[int] = None,
+                             use_processes: bool = False,
+                             progress: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+        """Import students from a CSV or XLSX file with a header row of
+        nim,name,major,admission_year and optional email,phone"""
+        validator = ValidationService(majors=self.db_service.get_catalog().majors_by_name)
+        seen_nims = set()
+        
+        return self._run_pipeline(
+            file_path, _parse_student_chunk, validator,
+            lambda rows: self.student_service.store_student_rows(rows, seen_nims),
+            counters=('inserted',), collections=('errors',),
+            start_row=start_row, chunk_size=chunk_size, commit_size=commit_size,
+            workers=workers, use_processes=use_processes, progress=progress
+        )
+    
+    def import_grades_file(self, file_path: str, start_row: int = 1, chunk_size: int = 2000,
+                           commit_size: int = 50000, update_existing: bool = False,
+                           workers: Optional[int] = None, use_processes: bool = False,
+                           progress: Optional[Callable[[Dict], None]] = None) -> Dict[str, Any]:
+        """Import grades from a CSV or XLSX file with a header row of
+        nim,course_code,semester,academic_year,grade_value"""
+        return self._run_pipeline(
+            file_path, _parse_grade_chunk, ValidationService(),
+            lambda rows: self.grade_service.store_grade_rows(rows, update_existing=update_existing),
+            counters=('inserted', 'updated'), collections=('errors', 'conflicts'),
+            start_row=start_row, chunk_size=chunk_size, commit_size=commit_size,
+            workers=workers, use_processes=use_processes, progress=progress
+        )
+    
+    def _run_pipeline(self, file_path: str, parse: Callable, validator: ValidationService,
+                      store: Callable[[List[Tuple]], Dict], counters: Tuple[str, ...],
+                      collections: Tuple[str, ...], start_row: int, chunk_size: int,
+                      commit_size: int, workers: Optional[int], use_processes: bool,
+                      progress: Optional[Callable[[Dict], None]]) -> Dict[str, Any]:
+        """Read chunks of rows, parse them with `parse` in a worker pool (or
+        inline when workers is 0) and hand the results to `store` in row
+        order, committing once commit_size parsed rows are buffered."""
+        start_time = time.perf_counter()
+        start_row = max(start_row, 1)
+        totals = {name: 0 for name in counters}
+        results = {name: [] for name in collections}
+        total_rows = 0
+        committed_row = start_row - 1
+        
+        buffer = []
+        buffer_errors = []
+        buffered_row = committed_row
+        
+        def elapsed_stats():
+            elapsed = time.perf_counter() - start_time
+            return {
+                'elapsed_seconds': round(elapsed, 3),
+                'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else 0
+            }
+        
+        def commit():
+            nonlocal committed_row
+            outcome = store(buffer)
+            if outcome['write_error']:
+                raise sqlite3.Error(outcome['write_error'])
+            
+            for name in counters:
+                totals[name] += outcome[name]
+            for name in collections:
+                results[name].extend(outcome[name])
+            results['errors'].extend(buffer_errors)
+            committed_row = buffered_row
+            buffer.clear()
+            buffer_errors.clear()
+            
+            if progress is not None:
+                progress({
+                    'rows_read': total_rows,
+                    'committed_row': committed_row,
+                    **totals,
+                    'failed': len(results['errors']),
+                    **elapsed_stats()
+                })
+        
+        def receive(last_row, parsed):
+            nonlocal buffered_row
+            rows, errors = parsed
+            buffer.extend(rows)
+            buffer_errors.extend(errors)
+            buffered_row = last_row
+            if len(buffer) >= commit_size:
+                commit()
+        
+        def chunks(header, rows):
+            nonlocal total_rows
+            numbered = enumerate(rows, start=1)
+            # Rows before start_row were committed by an earlier run
+            deque(islice(numbered, start_row - 1), maxlen=0)
+            while True:
+                chunk = list(islice(numbered, chunk_size))
+                if not chunk:
+                    return
+                total_rows += len(chunk)
+                yield chunk[-1][0], (validator, header, chunk[0][0], [row for _, row in chunk])
+        
+        error = None
+        try:
+            with open_rows(file_path) as (header, rows):
+                run_in_order(parse, chunks(header, rows), receive,
+                             workers=workers, use_processes=use_processes)
+                if buffered_row > committed_row:
+                    commit()
+        except Exception as e:
+            error = f'Error: {str(e)}'
+        
+        errors = results['errors']
+        errors.sort(key=lambda row_error: row_error['row'])
+        result = {
+            'success': error is None and not errors,
+            'file': file_path,
+            'start_row': start_row,
+            'total_rows': total_rows,
+            **totals,
+            'failed': len(errors),
+            **results,
+            'last_committed_row': committed_row,
+            **elapsed_stats()
+        }
+        if error is not None:
+            result['error'] = error
+            result['resume_row'] = committed_row + 1
+        return result
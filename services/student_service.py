@@ -3,17 +3,44 @@
 Student service module for Student Management System
 """
 
-from typing import List, Dict, Any, Optional
+import sqlite3
+import time
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 
 from models.student_model import Student
 from services.database_service import DatabaseService
-from services.validation_service import ValidationService
+from services.validation_service import ValidationService, field_text
+
+
+def validate_student_records(records: List[Tuple[int, Dict]],
+                             validator: ValidationService) -> Tuple[List[Tuple], List[Dict]]:
+    """Validate (row_number, record) pairs into rows for store_student_rows and row errors"""
+    if not records:
+        return [], []
+    
+    # Blank rows may have been dropped, so the batch numbers records by index
+    # and each index is mapped back to its own row number
+    validation = validator.validate_student_batch(
+        (record for _, record in records), first_row=0
+    )
+    row_messages = {}
+    for index, _, message in validation['errors']:
+        row_messages.setdefault(index, []).append(message)
+    
+    valid_rows = [(records[row[0]][0],) + row[1:] for row in validation['valid_rows']]
+    errors = [
+        {'row': records[index][0], 'nim': records[index][1].get('nim'),
+         'error': '; '.join(messages)}
+        for index, messages in row_messages.items()
+    ]
+    return valid_rows, errors
 
 
 class StudentService:
-    def __init__(self):
-        self.db_service = DatabaseService()
-        self.validator = ValidationService()
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        self.db_service = db_service or DatabaseService()
+        self.validator = ValidationService(self.db_service.catalog)
     
     def create_student(self, nim: str, name: str, major: str,
                       admission_year: int, email: str = "", phone: str = "") -> Dict[str, Any]:
@@ -28,13 +55,6 @@ class StudentService:
                     'error': validation_result['message']
                 }
             
-            existing_student = self.db_service.get_student_by_nim(nim)
-            if existing_student:
-                return {
-                    'success': False,
-                    'error': f'NIM {nim} is already registered'
-                }
-            
             student = Student(
                 nim=nim,
                 name=name,
@@ -44,26 +64,143 @@ class StudentService:
                 admission_year=admission_year
             )
             
-            student_id = self.db_service.add_student(student)
+            # The UNIQUE constraint on nim detects duplicates without a lookup first
+            try:
+                student_id = self.db_service.add_student(student)
+            except sqlite3.IntegrityError as e:
+                # Other constraint failures are reported as they are below
+                if 'students.nim' not in str(e):
+                    raise
+                return {
+                    'success': False,
+                    'error': f'NIM {nim} is already registered'
+                }
             
             return {
                 'success': True,
                 'student_id': student_id,
                 'message': 'Student successfully added'
             }
-            
+        
         except Exception as e:
             return {
                 'success': False,
                 'error': f'Error: {str(e)}'
             }
     
+    def import_students(self, records: Iterable[Dict], chunk_size: int = 1000) -> Dict[str, Any]:
+        """Validate and insert many student records in chunked transactions
+        
+        Each record is a dict with nim, name, major, admission_year and optional
+        email and phone. Invalid rows and duplicate NIMs (within the import or
+        already in the database) are reported per row instead of aborting; a
+        row failing several checks gets all of its messages joined by '; '.
+        """
+        start_time = time.perf_counter()
+        errors = []
+        seen_nims = set()
+        total_rows = 0
+        inserted = 0
+        
+        rows = enumerate(records, start=1)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            total_rows += len(chunk)
+            
+            valid_rows, chunk_errors = validate_student_records(chunk, self.validator)
+            errors.extend(chunk_errors)
+            
+            outcome = self.store_student_rows(valid_rows, seen_nims)
+            inserted += outcome['inserted']
+            errors.extend(outcome['errors'])
+        
+        elapsed = time.perf_counter() - start_time
+        errors.sort(key=lambda error: error['row'])
+        
+        return {
+            'success': not errors,
+            'total_rows': total_rows,
+            'inserted': inserted,
+            'failed': len(errors),
+            'errors': errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else 0
+        }
+    
+    def store_student_rows(self, valid_rows: List[Tuple], seen_nims: Set[str]) -> Dict[str, Any]:
+        """Insert one batch of rows from validate_student_records in a transaction
+        
+        NIMs already in seen_nims or in the database are reported as errors;
+        inserted NIMs are added to seen_nims. If the insert fails the batch is
+        rolled back, every row is reported, and write_error holds the error.
+        """
+        errors = []
+        candidates = []
+        for row_number, nim, name, major, admission_year, email, phone in valid_rows:
+            if nim in seen_nims:
+                errors.append({
+                    'row': row_number,
+                    'nim': nim,
+                    'error': f'NIM {nim} is duplicated in the import'
+                })
+                continue
+            seen_nims.add(nim)
+            candidates.append((row_number, Student(
+                nim=nim,
+                name=name,
+                major=major,
+                email=email or None,
+                phone=phone or None,
+                admission_year=admission_year
+            )))
+        
+        existing = self.db_service.get_existing_nims([s.nim for _, s in candidates])
+        to_insert = []
+        for row_number, student in candidates:
+            if student.nim in existing:
+                errors.append({
+                    'row': row_number,
+                    'nim': student.nim,
+                    'error': f'NIM {student.nim} is already registered'
+                })
+            else:
+                to_insert.append((row_number, student))
+        
+        inserted = 0
+        write_error = None
+        try:
+            inserted = self.db_service.add_students([s for _, s in to_insert])
+        except sqlite3.Error as e:
+            # The whole chunk was rolled back
+            write_error = str(e)
+            errors.extend(
+                {'row': row_number, 'nim': student.nim, 'error': f'Error: {str(e)}'}
+                for row_number, student in to_insert
+            )
+        
+        return {'inserted': inserted, 'errors': errors, 'write_error': write_error}
+    
     def get_students(self) -> List[Dict]:
         """Get all students"""
         return self.db_service.get_students()
     
     def search_students(self, search_term: str = "",
-                       major: str = "", year: int = 0) -> List[Dict]:
+                       major: str = "", year: int = 0,
+                       limit: Optional[int] = None, page_size: Optional[int] = None,
+                       after: Optional[Tuple[str, int]] = None,
+                       before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        # A search term alone returns ranked matches; filters and keyset pages
+        # (page_size with an optional (nim, id) cursor) are ordered by NIM.
+        # An unknown major raises ValueError.
+        paged = page_size is not None or after is not None or before is not None
+        
+        if search_term.strip() and not paged:
+            return self.db_service.search_students(
+                search_term.strip(), major=major or None, year=year or None, limit=limit
+            )
+        
         filters = {}
         
         if search_term.strip():
@@ -73,12 +210,49 @@ class StudentService:
         if year > 0:
             filters['year'] = year
         
-        return self.db_service.get_students(filters)
+        return self.db_service.get_students(
+            filters, limit=page_size or limit, after=after, before=before
+        )
+    
+    def get_student_page(self, page_size: int = 20, after: Optional[Tuple[str, int]] = None,
+                         before: Optional[Tuple[str, int]] = None, search_term: str = "",
+                         major: str = "", year: int = 0) -> Dict[str, Any]:
+        """One keyset page of students with cursors for the neighbouring pages;
+        an unknown major gives an empty page with an error"""
+        # Fetch one extra row to learn whether another page exists in that direction
+        try:
+            students = self.search_students(
+                search_term, major, year, page_size=page_size + 1, after=after, before=before
+            )
+        except ValueError as e:
+            return {
+                'students': [],
+                'has_previous': False,
+                'has_next': False,
+                'previous_cursor': None,
+                'next_cursor': None,
+                'error': str(e)
+            }
+        has_more = len(students) > page_size
+        
+        if before is not None:
+            students = students[1:] if has_more else students
+            has_previous, has_next = has_more, True
+        else:
+            students = students[:page_size]
+            has_previous, has_next = after is not None, has_more
+        
+        return {
+            'students': students,
+            'has_previous': has_previous and bool(students),
+            'has_next': has_next and bool(students),
+            'previous_cursor': (students[0]['nim'], students[0]['id']) if students else None,
+            'next_cursor': (students[-1]['nim'], students[-1]['id']) if students else None
+        }
     
     def update_student(self, student_id: int, kwargs) -> Dict[str, Any]:
         try:
-            students = self.db_service.get_students()
-            current_student = next((s for s in students if s['id'] == student_id), None)
+            current_student = self.db_service.get_student_by_id(student_id)
             
             if not current_student:
                 return {
@@ -90,16 +264,13 @@ class StudentService:
             updated_data.update(kwargs)
             
             # Handle None values for email and phone
-            email = updated_data.get('email', '')
-            phone = updated_data.get('phone', '')
-            
             validation_result = self.validator.validate_student_data(
                 updated_data['nim'],
                 updated_data['name'],
                 updated_data['major'],
                 updated_data['admission_year'],
-                email if email is not None else '',
-                phone if phone is not None else ''
+                field_text(updated_data.get('email')),
+                field_text(updated_data.get('phone'))
             )
             
             if not validation_result['valid']:
@@ -138,7 +309,7 @@ class StudentService:
                     'success': False,
                     'error': 'Failed to update student data'
                 }
-                
+        
         except Exception as e:
             return {
                 'success': False,
@@ -146,8 +317,7 @@ class StudentService:
             }
     
     def get_student_detail(self, student_id: int) -> Dict[str, Any]:
-        students = self.db_service.get_students()
-        student = next((s for s in students if s['id'] == student_id), None)
+        student = self.db_service.get_student_by_id(student_id)
         
         if not student:
             return {}
@@ -166,20 +336,19 @@ class StudentService:
         return detail
     
     def get_academic_summary(self) -> Dict[str, Any]:
-        students = self.db_service.get_students()
+        # Both reads hit the trigger-maintained major summary, not the students table
         majors_stats = self.db_service.get_major_statistics()
+        totals = self.db_service.get_academic_totals()
         
-        total_students = len(students)
-        students_with_grades = [s for s in students if s['avg_grade'] > 0]
-        
+        students_with_grades = totals['students_with_grades']
         if students_with_grades:
-            overall_gpa = sum(s['avg_grade'] for s in students_with_grades) / len(students_with_grades)
+            overall_gpa = totals['average_total'] / students_with_grades
         else:
             overall_gpa = 0
         
         return {
-            'total_students': total_students,
-            'students_with_grades': len(students_with_grades),
+            'total_students': totals['total_students'],
+            'students_with_grades': students_with_grades,
             'overall_gpa': round(overall_gpa, 2),
             'majors_statistics': majors_stats
         }
@@ -188,8 +357,8 @@ class StudentService:
         """Delete student from database"""
         try:
             # First check if student exists
-            detail = self.get_student_detail(student_id)
-            if not detail:
+            student = self.db_service.get_student_by_id(student_id)
+            if not student:
                 return {
                     'success': False,
                     'error': 'Student not found'
@@ -201,14 +370,14 @@ class StudentService:
             if success:
                 return {
                     'success': True,
-                    'message': f'Student {detail.get("name", "")} deleted successfully'
+                    'message': f'Student {student.get("name", "")} deleted successfully'
                 }
             else:
                 return {
                     'success': False,
                     'error': 'Failed to delete student'
                 }
-                
+        
         except Exception as e:
             return {
                 'success': False,
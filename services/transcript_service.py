@@ -0,0 +1,168 @@
+# services/transcript_service.py
+"""
+Batch transcript service module for Student Management System
+"""
+
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from reports.excel_generator import ExcelReportGenerator
+from reports.pdf_generator import PDFReportGenerator
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+from utils.pipeline import run_in_order
+
+
+TRANSCRIPT_FORMATS = ('xlsx', 'pdf')
+
+
+def render_transcripts(reports_dir: str, items: List[Tuple[Dict, Dict]],
+                       output_format: str = 'xlsx') -> List[Tuple[int, str, Optional[str], Optional[str]]]:
+    """Write one transcript file per (student, academic record) pair"""
+    if output_format == 'pdf':
+        render = PDFReportGenerator(reports_dir=reports_dir).generate_transcript_pdf
+    else:
+        render = ExcelReportGenerator(reports_dir=reports_dir).generate_academic_transcript
+    results = []
+    for student, record in items:
+        try:
+            path = render(student, record)
+            results.append((student['id'], student['nim'], path, None))
+        except Exception as e:
+            # Reported rather than raised, so the rest of the chunk still renders
+            results.append((student['id'], student['nim'], None, f'Error: {str(e)}'))
+    return results
+
+
+class TranscriptService:
+    """Transcripts for whole cohorts: students and their grades are
+    prefetched with two streamed queries and the files are rendered in a
+    process pool, or streamed into a single PDF."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 reports_dir: Optional[str] = None):
+        self.db_service = db_service or DatabaseService()
+        self.grade_service = GradeService(self.db_service)
+        self.reports_dir = reports_dir
+    
+    def iter_cohort(self, major: Optional[str] = None, admission_year: Optional[int] = None,
+                    student_ids: Optional[Iterable[int]] = None,
+                    chunk_size: Optional[int] = None) -> Iterator[Tuple[Dict, Dict]]:
+        """Yield (student, academic record) pairs for the selected students in
+        NIM order; with no filter every student is included"""
+        filters = {}
+        if major:
+            filters['major'] = major
+        if admission_year:
+            filters['year'] = admission_year
+        if student_ids is not None:
+            filters['ids'] = list(student_ids)
+        
+        # Both streams come out in (nim, id) order, so they pair up one to one
+        students = self.db_service.iter_students(filters, chunk_size)
+        records = self.grade_service.get_academic_records(filters=filters, chunk_size=chunk_size)
+        for student, (student_id, record) in zip(students, records):
+            if student['id'] != student_id:
+                raise RuntimeError(f"Student {student['id']} paired with the record of {student_id}")
+            yield student, record
+    
+    def generate_cohort_transcripts(self, major: Optional[str] = None,
+                                    admission_year: Optional[int] = None,
+                                    student_ids: Optional[Iterable[int]] = None,
+                                    workers: Optional[int] = None, batch_size: int = 25,
+                                    progress: Optional[Callable[[Dict], None]] = None,
+                                    output_format: str = 'xlsx') -> Dict[str, Any]:
+        """Write a transcript file (xlsx or pdf) for every student in the cohort
+        
+        Students are sent to the pool batch_size at a time; workers=0 renders
+        in this process. progress, if given, is called after each batch with
+        the running counts and files per second.
+        """
+        if output_format not in TRANSCRIPT_FORMATS:
+            return {'success': False, 'error': f"Transcript format must be one of: "
+                                               f"{', '.join(TRANSCRIPT_FORMATS)}"}
+        if major and self.db_service.get_catalog().major_code_for(major) is None:
+            return {'success': False, 'error': f'Unknown major: {major}'}
+        
+        start_time = time.perf_counter()
+        files = []
+        failures = []
+        reports_dir = str(ExcelReportGenerator(reports_dir=self.reports_dir).reports_dir)
+        
+        def elapsed_stats():
+            elapsed = time.perf_counter() - start_time
+            return {
+                'elapsed_seconds': round(elapsed, 3),
+                'files_per_second': round(len(files) / elapsed, 1) if elapsed > 0 else 0
+            }
+        
+        def receive(_, results):
+            for student_id, nim, path, error in results:
+                if error is None:
+                    files.append(path)
+                else:
+                    failures.append({'student_id': student_id, 'nim': nim, 'error': error})
+            if progress is not None:
+                progress({'generated': len(files), 'failed': len(failures), **elapsed_stats()})
+        
+        def batches():
+            cohort = self.iter_cohort(major, admission_year, student_ids)
+            while True:
+                batch = list(islice(cohort, batch_size))
+                if not batch:
+                    return
+                yield None, (reports_dir, batch, output_format)
+        
+        error = None
+        try:
+            run_in_order(render_transcripts, batches(), receive, workers=workers)
+        except Exception as e:
+            error = f'Error: {str(e)}'
+        
+        result = {
+            'success': error is None and not failures,
+            'reports_dir': reports_dir,
+            'generated': len(files),
+            'failed': len(failures),
+            'files': files,
+            'failures': failures,
+            **elapsed_stats()
+        }
+        if error is not None:
+            result['error'] = error
+        return result
+    
+    def generate_cohort_pdf(self, major: Optional[str] = None, admission_year: Optional[int] = None,
+                            student_ids: Optional[Iterable[int]] = None,
+                            filename: Optional[str] = None) -> Dict[str, Any]:
+        """Stream the cohort's transcripts into one multi-page PDF
+        
+        Students are read and written one at a time, so memory stays flat
+        however large the cohort is.
+        """
+        if major and self.db_service.get_catalog().major_code_for(major) is None:
+            return {'success': False, 'error': f'Unknown major: {major}'}
+        
+        start_time = time.perf_counter()
+        generator = PDFReportGenerator(reports_dir=self.reports_dir)
+        
+        try:
+            written = generator.generate_transcripts_pdf(
+                self.iter_cohort(major, admission_year, student_ids), filename=filename
+            )
+        except Exception as e:
+            return {'success': False, 'error': f'Error: {str(e)}'}
+        
+        if not written['files']:
+            return {'success': False, 'error': 'No students matched'}
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'success': True,
+            'file': written['files'][0],
+            'transcripts': written['transcripts'],
+            'pages': written['pages'],
+            'elapsed_seconds': round(elapsed, 3),
+            'pages_per_second': round(written['pages'] / elapsed, 1) if elapsed > 0 else 0
+        }
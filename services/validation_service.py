@@ -4,19 +4,48 @@ Validation service module for Student Management System
 """
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 
+from services.catalog_service import CatalogService
+
+
+# Used when no catalog is available, e.g. before the database exists
+DEFAULT_MAJORS = ['Informatics Engineering', 'Information Systems',
+                  'Informatics Management', 'Computer Engineering']
+
+NIM_PATTERN = re.compile(r'^[A-Za-z0-9]{8,20}$')
+NAME_PATTERN = re.compile(r'^[a-zA-Z\s\.\']+$')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^\+?[0-9]{10,15}$')
+PHONE_SEPARATORS = re.compile(r'[\s\-\(\)]')
+# PHONE_PATTERN with the separators allowed in place, so no cleaned copy is built
+PHONE_WITH_SEPARATORS_PATTERN = re.compile(
+    r'[\s\-\(\)]*\+?(?:[\s\-\(\)]*[0-9]){10,15}[\s\-\(\)]*'
+)
+
+# Columns checked by validate_student_batch, in error table order
+STUDENT_FIELDS = ('nim', 'name', 'major', 'admission_year', 'email', 'phone')
+
+
+def field_text(value: Any) -> str:
+    """A record value as the validators see it: None is '', anything else str()"""
+    return '' if value is None else str(value)
+
 
 class ValidationService:
-    def __init__(self):
+    def __init__(self, catalog: Optional[CatalogService] = None,
+                 majors: Optional[Iterable[str]] = None):
         self.current_year = datetime.now().year
+        self.catalog = catalog
+        # A fixed major list, for validating away from the database (worker processes)
+        self.majors = list(majors) if majors is not None else None
     
     def validate_nim(self, nim: str) -> Dict[str, Any]:
         if not nim.strip():
             return {'valid': False, 'message': 'NIM cannot be empty'}
         
-        if not re.match(r'^[A-Za-z0-9]{8,20}$', nim):
+        if not NIM_PATTERN.match(nim):
             return {'valid': False, 'message': 'Invalid NIM format (8-20 alphanumeric characters)'}
         
         return {'valid': True}
@@ -31,7 +60,7 @@ class ValidationService:
         if len(name.strip()) > 100:
             return {'valid': False, 'message': 'Name too long (max 100 characters)'}
         
-        if not re.match(r'^[a-zA-Z\s\.\']+$', name):
+        if not NAME_PATTERN.match(name):
             return {'valid': False, 'message': 'Name can only contain letters, spaces, dots, and apostrophes'}
         
         return {'valid': True}
@@ -40,9 +69,7 @@ class ValidationService:
         if not major.strip():
             return {'valid': False, 'message': 'Major cannot be empty'}
         
-        valid_majors = ['Informatics Engineering', 'Information Systems', 
-                       'Informatics Management', 'Computer Engineering']
-        
+        valid_majors = self._valid_majors()
         if major not in valid_majors:
             return {'valid': False, 'message': f'Major must be one of: {", ".join(valid_majors)}'}
         
@@ -58,8 +85,7 @@ class ValidationService:
         if not email.strip():
             return {'valid': True}
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(pattern, email):
+        if not EMAIL_PATTERN.match(email):
             return {'valid': False, 'message': 'Invalid email format'}
         
         return {'valid': True}
@@ -68,9 +94,9 @@ class ValidationService:
         if not phone.strip():
             return {'valid': True}
         
-        cleaned_phone = re.sub(r'[\s\-\(\)]', '', phone)
+        cleaned_phone = PHONE_SEPARATORS.sub('', phone)
         
-        if not re.match(r'^\+?[0-9]{10,15}$', cleaned_phone):
+        if not PHONE_PATTERN.match(cleaned_phone):
             return {'valid': False, 'message': 'Invalid phone number format (10-15 digits)'}
         
         return {'valid': True}
@@ -96,4 +122,85 @@ class ValidationService:
             if not validation['valid']:
                 return validation
         
-        return {'valid': True, 'message': 'Data is valid'}
\ No newline at end of file
+        return {'valid': True, 'message': 'Data is valid'}
+    
+    def validate_student_batch(self, records: Iterable[Dict], first_row: int = 1) -> Dict[str, Any]:
+        """Validate records column by column, reporting every failing field of every row"""
+        records = list(records)
+        
+        def column(field):
+            return [field_text(record.get(field)) for record in records]
+        
+        nims, names, majors = column('nim'), column('name'), column('major')
+        emails, phones = column('email'), column('phone')
+        
+        try:
+            years = [int(record.get('admission_year')) for record in records]
+            bad_year_types = []
+        except (TypeError, ValueError):
+            years, bad_year_types = [], []
+            for index, record in enumerate(records):
+                try:
+                    years.append(int(record.get('admission_year')))
+                except (TypeError, ValueError):
+                    years.append(None)
+                    bad_year_types.append(index)
+        
+        nim_match, name_match = NIM_PATTERN.match, NAME_PATTERN.match
+        email_match = EMAIL_PATTERN.match
+        phone_match = PHONE_WITH_SEPARATORS_PATTERN.fullmatch
+        major_set = set(self._valid_majors())
+        current_year = self.current_year
+        
+        failures = {
+            'nim': [i for i, nim in enumerate(nims) if not nim_match(nim)],
+            'name': [i for i, name in enumerate(names)
+                     if not (2 <= len(name.strip()) <= 100 and name_match(name))],
+            'major': [i for i, major in enumerate(majors) if major not in major_set],
+            'admission_year': sorted(bad_year_types + [
+                i for i, year in enumerate(years)
+                if year is not None and not 2000 <= year <= current_year
+            ]),
+            'email': [i for i, email in enumerate(emails) if email.strip() and not email_match(email)],
+            'phone': [i for i, phone in enumerate(phones) if phone.strip() and not phone_match(phone)]
+        }
+        checks = {
+            'nim': (self.validate_nim, nims),
+            'name': (self.validate_name, names),
+            'major': (self.validate_major, majors),
+            'admission_year': (self.validate_admission_year, years),
+            'email': (self.validate_email, emails),
+            'phone': (self.validate_phone, phones)
+        }
+        
+        errors = []
+        for position, field in enumerate(STUDENT_FIELDS):
+            validate, values = checks[field]
+            for index in failures[field]:
+                if values[index] is None:
+                    message = 'Admission year must be a number'
+                else:
+                    message = validate(values[index])['message']
+                errors.append((first_row + index, position, field, message))
+        errors.sort()
+        invalid = {row - first_row for row, _, _, _ in errors}
+        
+        valid_rows = [
+            (first_row + index,) + values
+            for index, values in enumerate(zip(nims, names, majors, years, emails, phones))
+            if index not in invalid
+        ]
+        
+        return {
+            'total_rows': len(records),
+            'valid_rows': valid_rows,
+            'invalid_rows': len(invalid),
+            'errors': [(row, field, message) for row, _, field, message in errors]
+        }
+    
+    def _valid_majors(self) -> List[str]:
+        if self.majors is not None:
+            return self.majors
+        if self.catalog is not None:
+            return list(self.catalog.snapshot().majors_by_name)
+        return DEFAULT_MAJORS
\ No newline at end of file
@@ -0,0 +1,18 @@
+# student-management/tests/helpers.py
+"""
+Shared setup for the Student Management System tests
+"""
+
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+from config.database_config import DatabaseConfig
+
+
+def make_database(tmp_dir, **kwargs):
+    """DatabaseConfig for a fresh test.db in tmp_dir, with the schema created"""
+    db_config = DatabaseConfig(db_name=os.path.join(tmp_dir, "test.db"), **kwargs)
+    with redirect_stdout(StringIO()):
+        db_config.initialize_database()
+    return db_config
@@ -0,0 +1,119 @@
+# student-management/tests/test_catalog.py
+"""
+Unit tests for Student Management System - Catalog Module
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+from services.validation_service import ValidationService
+from tests.helpers import make_database
+
+
+def make_database_service(tmp_dir):
+    db_service = DatabaseService(make_database(tmp_dir))
+    db_service.catalog.check_interval = 0
+    return db_service
+
+
+def test_catalog_snapshot_indexes():
+    print("Testing catalog snapshot...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_service = make_database_service(tmp_dir)
+        catalog = db_service.get_catalog()
+        
+        assert [major['code'] for major in catalog.majors] == ['MI', 'SI', 'TI', 'TK']
+        assert catalog.major_code_for('Information Systems') == 'SI'
+        assert catalog.courses_by_code['TI201']['semester'] == 2
+        assert catalog.courses_by_id[catalog.courses_by_code['SI101']['id']]['code'] == 'SI101'
+        assert [c['code'] for c in catalog.find_courses('TI', 2)] == ['TI201', 'TI202', 'TI203']
+        assert len(catalog.find_courses(semester=1)) == 6
+        
+        # Lookups hand out copies of the read-only snapshot rows
+        course = db_service.get_course_by_code('TI101')
+        course['credits'] = 99
+        assert db_service.get_course_by_code('TI101')['credits'] == 3
+        try:
+            catalog.courses_by_code['TI101']['credits'] = 99
+            assert False, "snapshot rows must be read-only"
+        except TypeError:
+            pass
+        
+        assert db_service.get_catalog() is catalog
+        assert db_service.catalog.reloads == 1
+        db_service.db_config.close()
+    print("Catalog snapshot tests passed")
+
+
+def test_catalog_reloads_on_version_change():
+    print("Testing catalog reload...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_service = make_database_service(tmp_dir)
+        first = db_service.get_catalog()
+        validator = ValidationService(db_service.catalog)
+        assert not validator.validate_major('Data Science')['valid']
+        
+        with db_service.db_config.connection() as conn:
+            conn.execute("INSERT INTO majors (code, name, faculty) VALUES ('DS', 'Data Science', 'Faculty of Information Technology')")
+            conn.execute("INSERT INTO courses (code, name, credits, semester, major_code) VALUES ('DS101', 'Statistics', 3, 1, 'DS')")
+            conn.execute("UPDATE courses SET credits = 4 WHERE code = 'TI101'")
+            conn.commit()
+        
+        second = db_service.get_catalog()
+        assert second.version == first.version + 3
+        assert validator.validate_major('Data Science')['valid']
+        assert db_service.get_course_by_code('TI101')['credits'] == 4
+        assert first.courses_by_code['TI101']['credits'] == 3
+        
+        grade_service = GradeService(db_service)
+        result = grade_service.add_student_grade(1, 999, 1, '2023/2024', 3.0)
+        assert result['error'] == 'Course not found'
+        db_service.db_config.close()
+    print("Catalog reload tests passed")
+
+
+def test_catalog_sees_local_writes_at_once():
+    print("Testing local catalog invalidation...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_service = DatabaseService(make_database(tmp_dir))
+        db_service.catalog.check_interval = 60
+        db_config = db_service.db_config
+        first = db_service.get_catalog()
+        
+        def add_major(code, name):
+            with db_config.connection() as conn:
+                conn.execute("INSERT INTO majors (code, name, faculty) VALUES (?, ?, 'Faculty of Science')",
+                             (code, name))
+                conn.commit()
+        
+        # Both the initializing connection and ones opened later count writes
+        add_major('DS', 'Data Science')
+        worker = threading.Thread(target=add_major, args=('MA', 'Mathematics'))
+        worker.start()
+        worker.join()
+        assert db_service.get_catalog().version == first.version + 2
+        assert db_service.get_catalog().major_code_for('Mathematics') == 'MA'
+        
+        # Another process's edit waits for the check interval
+        other = sqlite3.connect(db_config.db_path)
+        other.execute("INSERT INTO majors (code, name, faculty) VALUES ('PH', 'Physics', 'Faculty of Science')")
+        other.commit()
+        other.close()
+        assert db_service.get_catalog().major_code_for('Physics') is None
+        db_service.catalog.check_interval = 0
+        assert db_service.get_catalog().major_code_for('Physics') == 'PH'
+        db_config.close()
+    print("Local catalog invalidation tests passed")
+
+
+if __name__ == "__main__":
+    test_catalog_snapshot_indexes()
+    test_catalog_reloads_on_version_change()
+    test_catalog_sees_local_writes_at_once()
+    print("\nAll catalog tests completed")
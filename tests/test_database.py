@@ -0,0 +1,355 @@
+# student-management/tests/test_database.py
+"""
+Unit tests for Student Management System - Database Module
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database_config import DatabaseConfig, PROFILE_ENV_VAR
+from services.database_service import DatabaseService
+from models.student_model import Student
+from models.course_model import Grade
+from utils.cache import LRUCache
+from tests.helpers import make_database
+
+
+def test_pool_reuses_connections():
+    print("Testing connection pool reuse...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir, pool_size=2)
+        
+        with db_config.connection() as first:
+            pass
+        with db_config.connection() as second:
+            pass
+        
+        assert first is second
+        assert db_config.pool.stats()['created'] == 1
+        db_config.close()
+    print("Connection pool reuse tests passed")
+
+
+def test_pool_nested_checkout_shares_connection():
+    print("Testing nested checkout...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir)
+        
+        with db_config.connection() as outer:
+            with db_config.connection() as inner:
+                assert inner is outer
+            assert db_config.pool.stats()['idle'] == 0
+        
+        assert db_config.pool.stats()['idle'] == 1
+        db_config.close()
+    print("Nested checkout tests passed")
+
+
+def test_pool_threads_get_separate_connections():
+    print("Testing thread-local checkout...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir, pool_size=4)
+        seen = []
+        barrier = threading.Barrier(3)
+        
+        def worker():
+            with db_config.connection() as conn:
+                barrier.wait()
+                seen.append(id(conn))
+                conn.execute("SELECT COUNT(*) FROM students").fetchone()
+        
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(set(seen)) == 3
+        assert db_config.pool.stats()['idle'] == 3
+        db_config.close()
+    print("Thread-local checkout tests passed")
+
+
+def test_pool_discards_unhealthy_and_uncommitted():
+    print("Testing pool health checks...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir, health_check_interval=0)
+        
+        with db_config.connection() as conn:
+            conn.execute("DELETE FROM courses")
+        with db_config.connection() as conn:
+            # Uncommitted work is rolled back on checkin
+            assert conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0] > 0
+            conn.close()
+        with db_config.connection() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        
+        assert db_config.pool.stats()['discarded'] >= 1
+        db_config.close()
+    print("Pool health check tests passed")
+
+
+def test_performance_profiles():
+    print("Testing performance profiles...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir, profile='bulk-load')
+        
+        with db_config.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        db_config.close()
+        
+        os.environ[PROFILE_ENV_VAR] = 'durable'
+        try:
+            db_config = make_database(tmp_dir)
+            assert db_config.profile == 'durable'
+            with db_config.connection() as conn:
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+            db_config.close()
+        finally:
+            del os.environ[PROFILE_ENV_VAR]
+        
+        try:
+            DatabaseConfig(db_name=os.path.join(tmp_dir, "test.db"), profile='turbo')
+            assert False, "Unknown profile should be rejected"
+        except ValueError:
+            pass
+    print("Performance profile tests passed")
+
+
+def test_iter_queries_stream_in_chunks():
+    print("Testing streaming queries...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir)
+        db_service = DatabaseService(db_config)
+        with db_config.connection() as conn:
+            conn.executemany(
+                "INSERT INTO students (nim, name, major_code, admission_year) VALUES (?, ?, ?, ?)",
+                [(f"NIM{i:05d}", "Student", "SI", 2020) for i in range(25)]
+            )
+            conn.commit()
+        
+        stream = db_service.iter_students(chunk_size=4)
+        first = next(stream)
+        # The iterator keeps its connection checked out until it finishes
+        assert db_config.pool.stats()['idle'] == 0
+        rest = list(stream)
+        assert db_config.pool.stats()['idle'] == 1
+        
+        assert [first] + rest == db_service.get_students()
+        assert list(db_service.iter_courses()) == db_service.get_courses()
+        assert list(db_service.iter_major_statistics()) == db_service.get_major_statistics()
+        
+        stream = db_service.iter_students(chunk_size=4)
+        next(stream)
+        stream.close()
+        assert db_config.pool.stats()['idle'] == 1
+        db_config.close()
+    print("Streaming query tests passed")
+
+
+def test_lru_cache():
+    print("Testing LRU cache...")
+    evicted = []
+    cache = LRUCache(2, on_evict=lambda key, value: evicted.append(key))
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert evicted == ['b']
+    assert cache.get('b') is None
+    assert cache.pop('a') == 1 and len(cache) == 1
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+    
+    cache = LRUCache(4, ttl=0.01)
+    cache.put('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+    
+    disabled = LRUCache(0)
+    disabled.put('a', 1)
+    assert disabled.get('a') is None
+    print("LRU cache tests passed")
+
+
+def test_student_lookup_cache():
+    print("Testing student lookup cache...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir)
+        db_service = DatabaseService(db_config, cache_size=2)
+        for i in range(1, 4):
+            db_service.add_student(Student(nim=f'2023000{i}', name='Student Name',
+                                           major='Information Systems', admission_year=2023))
+        
+        assert db_service.get_student_by_id(1)['nim'] == '20230001'
+        assert db_service.get_student_by_nim('20230001')['id'] == 1
+        stats = db_service.cache_stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        
+        # Returned rows are copies, callers cannot corrupt the cache
+        db_service.get_student_by_id(1)['name'] = 'Changed'
+        assert db_service.get_student_by_id(1)['name'] == 'Student Name'
+        
+        db_service.add_grade(Grade(student_id=1, course_id=1, semester=1,
+                                   academic_year='2023/2024', grade_value=3.5, grade_letter='A-'))
+        assert db_service.get_student_by_nim('20230001')['course_count'] == 1
+        
+        db_service.update_student(1, Student(nim='20239999', name='Renamed Student',
+                                             major='Information Systems', admission_year=2023))
+        assert db_service.get_student_by_nim('20230001') is None
+        assert db_service.get_student_by_id(1)['name'] == 'Renamed Student'
+        
+        db_service.get_student_by_id(2)
+        db_service.get_student_by_id(3)
+        assert db_service.cache_stats()['evictions'] == 1
+        assert '20239999' not in db_service._student_nims
+        
+        db_service.delete_student(3)
+        assert db_service.get_student_by_id(3) is None
+        assert db_service.get_student_by_nim('20230003') is None
+        db_config.close()
+    print("Student lookup cache tests passed")
+
+
+# A students table from before majors were referenced by code, with some grades
+LEGACY_STUDENTS_SQL = '''
+        CREATE TABLE students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nim VARCHAR(20) UNIQUE NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            major VARCHAR(50) NOT NULL,
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            admission_year INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE grades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            semester INTEGER NOT NULL,
+            academic_year VARCHAR(10) NOT NULL,
+            grade_value DECIMAL(3,2) NOT NULL,
+            grade_letter VARCHAR(2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES courses (id) ON DELETE CASCADE,
+            UNIQUE(student_id, course_id, semester, academic_year)
+        );
+        INSERT INTO students (id, nim, name, major, admission_year) VALUES
+            (1, '20230001', 'First Student', 'Information Systems', 2023),
+            (5, '20230005', 'Second Student', 'Data Science', 2023),
+            (7, '20230007', 'Third Student', 'Informatics Engineering', 2022);
+        INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter)
+        VALUES (1, 7, 1, '2023/2024', 3.5, 'A-'), (7, 1, 1, '2023/2024', 2.0, 'C+');
+'''
+
+
+def test_student_major_migration():
+    print("Testing student major migration...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "test.db")
+        legacy = sqlite3.connect(db_path)
+        legacy.executescript(LEGACY_STUDENTS_SQL)
+        legacy.commit()
+        legacy.close()
+        
+        db_config = make_database(tmp_dir)
+        db_service = DatabaseService(db_config)
+        with db_config.connection() as conn:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(students)")}
+            assert 'major_code' in columns and 'major' not in columns
+            assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+            assert conn.execute("SELECT COUNT(*) FROM grades").fetchone()[0] == 2
+        
+        students = {s['nim']: s for s in db_service.get_students()}
+        assert students['20230001']['major_code'] == 'SI'
+        assert students['20230005']['major'] == 'Data Science'
+        assert students['20230005']['major_code'] == db_service.get_catalog().major_code_for('Data Science')
+        assert students['20230007']['course_count'] == 1
+        assert [s['nim'] for s in db_service.search_students('Second')] == ['20230005']
+        assert [s['id'] for s in db_service.get_students({'major': 'Informatics Engineering'})] == [7]
+        
+        new_id = db_service.add_student(Student(nim='20230008', name='Fourth Student',
+                                                major='Data Science', admission_year=2023))
+        assert new_id == 8
+        stats = {row['name']: row for row in db_service.get_major_statistics()}
+        assert stats['Data Science']['student_count'] == 2
+        assert stats['Information Systems']['avg_gpa'] == 3.5
+        
+        # Initializing a migrated database again leaves it alone
+        with redirect_stdout(StringIO()):
+            db_config.initialize_database()
+        assert db_service.get_major_statistics() == list(stats.values())
+        db_config.close()
+    print("Student major migration tests passed")
+
+
+def test_student_major_migration_with_summary_triggers():
+    print("Testing student major migration with summary triggers...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = DatabaseConfig(db_name=os.path.join(tmp_dir, "test.db"))
+        with db_config.connection() as conn:
+            conn.execute('''
+            CREATE TABLE courses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code VARCHAR(20) UNIQUE NOT NULL,
+                name VARCHAR(100) NOT NULL,
+                credits INTEGER NOT NULL,
+                semester INTEGER NOT NULL,
+                major_code VARCHAR(10) NOT NULL
+            )
+            ''')
+            conn.execute("INSERT INTO courses VALUES (1, 'TI101', 'Basic Programming', 3, 1, 'TI'), "
+                         "(7, 'SI101', 'Information Systems Fundamentals', 3, 1, 'SI')")
+            conn.executescript(LEGACY_STUDENTS_SQL)
+            # Databases created before the migration already carry these triggers on students
+            db_config._create_academic_summary(conn)
+            db_config._create_search_index(conn)
+        
+        with redirect_stdout(StringIO()):
+            db_config.initialize_database()
+        db_service = DatabaseService(db_config)
+        students = {s['nim']: s for s in db_service.get_students()}
+        assert students['20230005']['major'] == 'Data Science'
+        assert students['20230001']['avg_grade'] == 3.5
+        assert [s['nim'] for s in db_service.search_students('Third')] == ['20230007']
+        
+        # The recreated triggers keep the summaries current
+        new_id = db_service.add_student(Student(nim='20230008', name='Fourth Student',
+                                                major='Data Science', admission_year=2023))
+        with db_config.connection() as conn:
+            conn.execute("INSERT INTO grades (student_id, course_id, semester, academic_year, "
+                         "grade_value, grade_letter) VALUES (?, 1, 1, '2023/2024', 4.0, 'A')", (new_id,))
+            conn.commit()
+        assert db_service.get_student_by_id(new_id)['avg_grade'] == 4.0
+        stats = {row['name']: row for row in db_service.get_major_statistics()}
+        assert stats['Data Science']['student_count'] == 2
+        db_config.close()
+    print("Student major migration with summary triggers tests passed")
+
+
+if __name__ == "__main__":
+    test_pool_reuses_connections()
+    test_pool_nested_checkout_shares_connection()
+    test_pool_threads_get_separate_connections()
+    test_pool_discards_unhealthy_and_uncommitted()
+    test_performance_profiles()
+    test_iter_queries_stream_in_chunks()
+    test_lru_cache()
+    test_student_lookup_cache()
+    test_student_major_migration()
+    test_student_major_migration_with_summary_triggers()
+    print("\nAll database tests completed")
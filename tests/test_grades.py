@@ -5,8 +5,29 @@ Unit tests for Student Management System - Grades Module
 
 import sys
 import os
+import statistics
+import tempfile
+import numpy as np
+import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+from services.grade_service import GradeService
+from utils.grade_scale import GradeScale
+from tests.helpers import make_database
+
+
+def make_services(tmp_dir, student_count=3):
+    db_service = DatabaseService(make_database(tmp_dir))
+    student_service = StudentService(db_service)
+    student_service.import_students(
+        {'nim': f'2023{i:04d}', 'name': 'Student Name',
+         'major': 'Informatics Engineering', 'admission_year': 2023}
+        for i in range(1, student_count + 1)
+    )
+    return student_service, GradeService(db_service)
+
 
 def test_grade_calculation():
     print("Testing grade calculation...")
@@ -18,7 +39,423 @@ def test_grade_validation():
     print("Grade validation tests passed")
 
 
+def test_import_grades():
+    print("Testing bulk grade import...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        grade_service.add_student_grade(1, 1, 1, '2023/2024', 2.0)
+        
+        records = [
+            {'nim': '20230001', 'course_code': 'TI101', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '3.8'},
+            {'nim': '20230001', 'course_code': 'TI102', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '3.1'},
+            {'nim': '20230002', 'course_code': 'TI101', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '2.4'},
+            {'nim': '20230002', 'course_code': 'TI101', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '1.0'},
+            {'nim': '20239999', 'course_code': 'TI101', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '3.0'},
+            {'nim': '20230003', 'course_code': 'XX999', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '3.0'},
+            {'nim': '20230003', 'course_code': 'TI101', 'semester': '1',
+             'academic_year': '2023/2024', 'grade_value': '4.5'},
+            {'nim': '20230003', 'course_code': 'TI101', 'semester': 'one',
+             'academic_year': '2023/2024', 'grade_value': '3.0'},
+        ]
+        
+        result = grade_service.import_grades(records, batch_size=3)
+        
+        assert result['total_rows'] == 8
+        assert result['inserted'] == 2
+        assert result['updated'] == 0
+        assert [(c['row'], c['action']) for c in result['conflicts']] == [(1, 'skipped'), (4, 'skipped')]
+        assert [error['row'] for error in result['errors']] == [5, 6, 7, 8]
+        
+        grades = {g['course_code']: g for g in student_service.db_service.get_student_grades(1)}
+        assert grades['TI101']['grade_value'] == 2.0
+        assert grades['TI102']['grade_letter'] == 'B+'
+        
+        result = grade_service.import_grades(records[:1], update_existing=True)
+        assert result['updated'] == 1
+        assert result['conflicts'][0]['action'] == 'updated'
+        grades = {g['course_code']: g for g in student_service.db_service.get_student_grades(1)}
+        assert grades['TI101']['grade_value'] == 3.8
+        assert grades['TI101']['grade_letter'] == 'A'
+        student_service.db_service.db_config.close()
+    print("Bulk grade import tests passed")
+
+
+def summary_mismatches(db_config):
+    """Summary rows that differ from aggregates computed on the fly"""
+    with db_config.connection() as conn:
+        return conn.execute('''
+        SELECT s.id, sas.course_count, sas.total_credits, sas.gpa, live.*
+        FROM students s
+        LEFT JOIN student_academic_summary sas ON sas.student_id = s.id
+        LEFT JOIN (
+            SELECT g.student_id,
+                   COUNT(g.id) AS live_count,
+                   SUM(c.credits) AS live_credits,
+                   SUM(g.grade_value * c.credits) * 1.0 / SUM(c.credits) AS live_gpa
+            FROM grades g
+            JOIN courses c ON c.id = g.course_id
+            GROUP BY g.student_id
+        ) live ON live.student_id = s.id
+        WHERE COALESCE(sas.course_count, 0) != COALESCE(live.live_count, 0)
+           OR COALESCE(sas.total_credits, 0) != COALESCE(live.live_credits, 0)
+           OR ABS(COALESCE(sas.gpa, 0) - COALESCE(live.live_gpa, 0)) > 1e-9
+        ''').fetchall()
+
+
+def test_academic_summary_stays_in_sync():
+    print("Testing academic summary table...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        db_config = db_service.db_config
+        
+        grade_service.add_student_grade(1, 1, 1, '2023/2024', 4.0)
+        grade_service.add_student_grade(1, 2, 1, '2023/2024', 3.0)
+        grade_service.add_student_grade(2, 1, 1, '2023/2024', 2.0)
+        assert not summary_mismatches(db_config)
+        
+        student = db_service.get_student_by_id(1)
+        assert student['course_count'] == 2
+        assert student['avg_grade'] == 3.5
+        assert db_service.get_student_gpa(1)['total_courses'] == 2
+        assert db_service.get_student_gpa(3)['gpa'] == 0
+        
+        # Whole grades are stored as integers; the summary gpa must not be integer-divided
+        with db_config.connection() as conn:
+            conn.execute("INSERT INTO grades (student_id, course_id, semester, academic_year, "
+                         "grade_value, grade_letter) VALUES (3, 1, 1, '2023/2024', 3, 'B'), "
+                         "(3, 2, 1, '2023/2024', 0, 'E')")
+            conn.commit()
+            assert conn.execute("SELECT gpa FROM student_academic_summary "
+                                "WHERE student_id = 3").fetchone()[0] == 1.5
+            conn.execute("DELETE FROM grades WHERE student_id = 3")
+            conn.commit()
+        assert not summary_mismatches(db_config)
+        
+        with db_config.connection() as conn:
+            conn.execute("UPDATE grades SET grade_value = 1.0 WHERE student_id = 1 AND course_id = 1")
+            conn.execute("UPDATE grades SET student_id = 3 WHERE student_id = 2")
+            conn.execute("UPDATE courses SET credits = credits + 2 WHERE id = 2")
+            conn.commit()
+        assert not summary_mismatches(db_config)
+        assert db_service.get_student_by_id(3)['course_count'] == 1
+        assert db_service.get_student_by_id(2)['course_count'] == 0
+        
+        with db_config.connection() as conn:
+            conn.execute("DELETE FROM grades WHERE student_id = 1 AND course_id = 2")
+            conn.commit()
+        assert not summary_mismatches(db_config)
+        
+        assert db_service.delete_student(3)
+        assert not summary_mismatches(db_config)
+        
+        with db_config.connection() as conn:
+            conn.execute("UPDATE student_academic_summary SET gpa = 0, course_count = 9")
+            conn.commit()
+        assert summary_mismatches(db_config)
+        db_service.rebuild_academic_summary()
+        assert not summary_mismatches(db_config)
+        db_config.close()
+    print("Academic summary tests passed")
+
+
+def test_academic_records_match_per_student():
+    print("Testing batch academic records...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir, student_count=12)
+        course_ids = [course['id'] for course in student_service.db_service.get_courses()]
+        
+        for student_id in range(1, 11):
+            for n in range(student_id % 6):
+                grade_service.add_student_grade(
+                    student_id, course_ids[(student_id + n) % len(course_ids)],
+                    1 + n % 3, '2022/2023' if n % 2 else '2023/2024',
+                    round((student_id * 37 + n * 11) % 401 / 100, 2)
+                )
+        
+        expected = {
+            student_id: grade_service.get_student_academic_record(student_id)
+            for student_id in range(1, 13)
+        }
+        
+        assert sum(record['completed_courses'] for record in expected.values()) == 25
+        
+        records = dict(grade_service.get_academic_records())
+        assert records == expected
+        
+        subset = list(grade_service.get_academic_records([7, 2, 12], chunk_size=2))
+        assert [student_id for student_id, _ in subset] == [2, 7, 12]
+        assert all(record == expected[student_id] for student_id, record in subset)
+        
+        filtered = dict(grade_service.get_academic_records(filters={'major': 'Information Systems'}))
+        assert filtered == {}
+        filtered = dict(grade_service.get_academic_records(filters={'search_term': '20230011'}))
+        assert filtered == {11: expected[11]}
+        grade_service.db_config.close()
+    print("Batch academic record tests passed")
+
+
+def test_course_statistics():
+    print("Testing course statistics...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir, student_count=11)
+        values = [3.8, 1.2, 2.5, 4.0, 3.1, 0.7, 2.9, 3.3, 2.0, 3.7, 1.8]
+        for student_id, value in enumerate(values, start=1):
+            grade_service.add_student_grade(student_id, 1, 1, '2023/2024', value)
+            grade_service.add_student_grade(student_id, 2, 2 if student_id % 2 else 1, '2023/2024', 3.0)
+        
+        stats = grade_service.get_course_statistics(1)
+        quantiles = statistics.quantiles(values, n=100, method='inclusive')
+        assert stats['total_students'] == 11
+        assert stats['average_grade'] == round(statistics.fmean(values), 2)
+        assert (stats['min_grade'], stats['max_grade']) == (0.7, 4.0)
+        assert stats['std_dev'] == round(statistics.pstdev(values), 2)
+        assert stats['median'] == round(statistics.median(values), 2)
+        assert stats['percentiles'] == {p: round(quantiles[p - 1], 2) for p in (25, 50, 75, 90)}
+        expected_letters = {}
+        for letter in grade_service.calculate_grade_letters(values):
+            expected_letters[letter] = expected_letters.get(letter, 0) + 1
+        assert stats['grade_distribution'] == expected_letters
+        
+        assert grade_service.get_course_statistics(3)['total_students'] == 0
+        
+        # Whole grades are stored as integers and must not be integer-divided
+        with grade_service.db_config.connection() as conn:
+            conn.execute("INSERT INTO grades (student_id, course_id, semester, academic_year, "
+                         "grade_value, grade_letter) VALUES (1, 4, 2, '2023/2024', 3, 'B'), "
+                         "(2, 4, 2, '2023/2024', 2, 'C')")
+            conn.commit()
+        whole = grade_service.get_course_statistics(4)
+        assert (whole['average_grade'], whole['std_dev'], whole['median']) == (2.5, 0.5, 2.5)
+        with grade_service.db_config.connection() as conn:
+            conn.execute("DELETE FROM grades WHERE course_id = 4")
+            conn.commit()
+        assert not grade_service.get_course_statistics(999)['success']
+        
+        dashboard = grade_service.get_all_course_statistics()
+        by_code = {course['course_code']: course for course in dashboard['courses']}
+        assert len(by_code) == 9
+        assert by_code['TI101'] == stats
+        assert by_code['TI102']['grade_distribution'] == {'B+': 11}
+        
+        term = grade_service.get_all_course_statistics(semester=2, academic_year='2023/2024')
+        assert [(c['course_code'], c['total_students']) for c in term['courses']] == [('TI102', 6)]
+        grade_service.db_config.close()
+    print("Course statistics tests passed")
+
+
+def legacy_grade_letter(grade_value):
+    """The if/elif ladder calculate_grade_letter used before GradeScale"""
+    if grade_value >= 3.7:
+        return 'A'
+    elif grade_value >= 3.3:
+        return 'A-'
+    elif grade_value >= 3.0:
+        return 'B+'
+    elif grade_value >= 2.7:
+        return 'B'
+    elif grade_value >= 2.3:
+        return 'B-'
+    elif grade_value >= 2.0:
+        return 'C+'
+    elif grade_value >= 1.7:
+        return 'C'
+    elif grade_value >= 1.3:
+        return 'C-'
+    elif grade_value >= 1.0:
+        return 'D+'
+    else:
+        return 'D'
+
+
+def test_grade_scale_matches_ladder():
+    print("Testing grade scale...")
+    scale = GradeScale()
+    values = [round(i / 100, 2) for i in range(0, 401)] + [-0.5, 4.5]
+    expected = [legacy_grade_letter(value) for value in values]
+    
+    assert [scale.classify(value) for value in values] == expected
+    assert scale.classify_many(values) == expected
+    assert list(scale.classify_many(np.array(values))) == expected
+    
+    series = pd.Series(values, index=range(10, 10 + len(values)), name='grade')
+    letters = scale.classify_many(series)
+    assert list(letters) == expected
+    assert list(letters.index) == list(series.index) and letters.name == 'grade'
+    
+    assert GradeScale.from_rows([]) == scale
+    assert GradeScale([('P', 2.0), ('F', 0.0)]).classify_many([1.99, 2.0]) == ['F', 'P']
+    try:
+        GradeScale([('A', 3.0), ('B', 3.0)])
+        assert False, "duplicate minimums must be rejected"
+    except ValueError:
+        pass
+    print("Grade scale tests passed")
+
+
+def test_grade_scale_table_and_regrade():
+    print("Testing grade scale table and regrading...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _, grade_service = make_services(tmp_dir)
+        grade_service.db_service.catalog.check_interval = 0
+        assert grade_service.grade_scale == GradeScale()
+        
+        for student_id, value in ((1, 3.6), (2, 3.8), (3, 2.5)):
+            grade_service.add_student_grade(student_id, 1, 1, '2023/2024', value)
+        
+        with grade_service.db_config.connection() as conn:
+            conn.execute("UPDATE grade_scale SET min_value = 3.5 WHERE letter = 'A'")
+            conn.commit()
+        
+        assert grade_service.calculate_grade_letter(3.6) == 'A'
+        result = grade_service.regrade_grades(batch_size=2)
+        assert result['success']
+        assert (result['checked'], result['updated']) == (3, 1)
+        
+        record = grade_service.get_student_academic_record(1)
+        assert record['grades_by_semester'][0]['courses'][0]['grade_letter'] == 'A'
+        assert grade_service.regrade_grades()['updated'] == 0
+        grade_service.db_config.close()
+    print("Grade scale table and regrading tests passed")
+
+
+def expected_rankings(grade_service, semester=None, min_credits=1, method='rank',
+                      major_code=None, admission_year=None, top=None, limit=None, offset=0):
+    """Rank students in Python from their raw grades"""
+    totals = {}
+    with grade_service.db_config.connection() as conn:
+        for row in conn.execute('''
+        SELECT s.nim, s.major_code, s.admission_year, g.semester, g.grade_value, c.credits
+        FROM grades g
+        JOIN students s ON s.id = g.student_id
+        JOIN courses c ON c.id = g.course_id
+        '''):
+            if semester is not None and row['semester'] != semester:
+                continue
+            if major_code and row['major_code'] != major_code:
+                continue
+            if admission_year and row['admission_year'] != admission_year:
+                continue
+            weighted, credits = totals.get(row['nim'], (0, 0))
+            totals[row['nim']] = (weighted + row['grade_value'] * row['credits'], credits + row['credits'])
+    
+    students = sorted(
+        (-round(weighted / credits, 2), nim, credits)
+        for nim, (weighted, credits) in totals.items()
+        if credits >= max(min_credits, 1)
+    )
+    ranked = []
+    for position, (negative_gpa, nim, credits) in enumerate(students):
+        if ranked and -negative_gpa == ranked[-1][3]:
+            rank = ranked[-1][0]
+        elif method == 'dense':
+            rank = ranked[-1][0] + 1 if ranked else 1
+        else:
+            rank = position + 1
+        ranked.append((rank, nim, credits, -negative_gpa))
+    
+    ranked = [(rank, nim, credits, gpa) for rank, nim, credits, gpa in ranked
+              if top is None or rank <= top]
+    return ranked[offset:offset + limit] if limit else ranked[offset:]
+
+
+def test_gpa_rankings():
+    print("Testing GPA rankings...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir, student_count=40)
+        for student_id in range(1, 41):
+            if student_id % 2:
+                student_service.update_student(student_id, {'major': 'Information Systems',
+                                                             'admission_year': 2022})
+            # Grades in quarter steps keep every GPA exact, so ties are real ties
+            for course_id, semester in ((1, 1), (2, 1), (3, 1), (4, 2), (5, 2)):
+                if student_id % 7 == 0 and course_id > 2:
+                    continue
+                grade_service.add_student_grade(student_id, course_id, semester, '2023/2024',
+                                                (student_id * (course_id + 1)) % 9 * 0.5)
+        
+        def ranked(result):
+            assert result['success'], result
+            return [(row['rank'], row['nim'], row['total_credits'], row['gpa'])
+                    for row in result['rankings']]
+        
+        cases = [
+            {},
+            {'method': 'dense'},
+            {'min_credits': 7},
+            {'top': 5},
+            {'top': 5, 'method': 'dense'},
+            {'top': 10, 'limit': 4, 'offset': 3},
+            {'limit': 6, 'offset': 30},
+            {'semester': 2, 'top': 8},
+            {'semester': 1, 'method': 'dense', 'limit': 5, 'offset': 2},
+        ]
+        for case in cases:
+            kwargs = {'top': None, **case}
+            assert ranked(grade_service.get_rankings(**kwargs)) == expected_rankings(grade_service, **kwargs), case
+        
+        by_major = grade_service.get_rankings(partition_by='major', top=3)
+        assert {row['major_code'] for row in by_major['rankings']} == {'TI', 'SI'}
+        for code in ('TI', 'SI'):
+            rows = [(r['rank'], r['nim'], r['total_credits'], r['gpa'])
+                    for r in by_major['rankings'] if r['major_code'] == code]
+            assert rows == expected_rankings(grade_service, major_code=code, top=3)
+        
+        by_year = grade_service.get_rankings(partition_by='admission_year', method='dense', top=2)
+        assert [row['admission_year'] for row in by_year['rankings']][0] == 2022
+        assert ranked(grade_service.get_rankings(admission_year=2023, major='Informatics Engineering')) == \
+            expected_rankings(grade_service, major_code='TI', admission_year=2023, top=100)
+        
+        assert not grade_service.get_rankings(method='row_number')['success']
+        assert not grade_service.get_rankings(partition_by='faculty')['success']
+        assert not grade_service.get_rankings(major='Astronomy')['success']
+        grade_service.db_config.close()
+    print("GPA ranking tests passed")
+
+
+def test_gpa_ranking_ties_across_credit_mixes():
+    print("Testing GPA ranking ties...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir, student_count=8)
+        # Grades like 3.7 are inexact floats, so the same grades over different
+        # credits leave GPAs that differ in the last bit
+        course_sets = [(1,), (1, 2, 3), (2, 3), (1, 3), (3,), (1, 2)]
+        for student_id, courses in enumerate(course_sets, start=1):
+            for course_id in courses:
+                grade_service.add_student_grade(student_id, course_id, 1, '2023/2024', 3.7)
+        for course_id in (1, 2, 3):
+            grade_service.add_student_grade(7, course_id, 1, '2023/2024', 3.3)
+        grade_service.add_student_grade(8, 1, 1, '2023/2024', 3.3)
+        
+        rows = grade_service.get_rankings()['rankings']
+        assert [row['rank'] for row in rows] == [1] * 6 + [7] * 2
+        
+        for case in ({'top': 1}, {'top': 2, 'method': 'dense'}, {'top': 6, 'limit': 2},
+                     {'limit': 3, 'offset': 5}, {'method': 'dense', 'limit': 1, 'offset': 6},
+                     {'min_credits': 5, 'top': 1}, {'min_credits': 3, 'top': 2, 'method': 'dense'}):
+            kwargs = {'top': None, **case}
+            result = grade_service.get_rankings(**kwargs)
+            assert [(row['rank'], row['nim'], row['total_credits'], row['gpa'])
+                    for row in result['rankings']] == expected_rankings(grade_service, **kwargs), case
+        grade_service.db_config.close()
+    print("GPA ranking tie tests passed")
+
+
 if __name__ == "__main__":
     test_grade_calculation()
     test_grade_validation()
+    test_import_grades()
+    test_academic_summary_stays_in_sync()
+    test_academic_records_match_per_student()
+    test_course_statistics()
+    test_grade_scale_matches_ladder()
+    test_grade_scale_table_and_regrade()
+    test_gpa_rankings()
+    test_gpa_ranking_ties_across_credit_mixes()
     print("\nAll grade tests completed")
\ No newline at end of file
@@ -0,0 +1,162 @@
+# student-management/tests/test_import.py
+"""
+Unit tests for Student Management System - File Import Module
+"""
+
+import sys
+import os
+import csv
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+
+from services.database_service import DatabaseService
+from services.import_service import ImportService
+from tests.helpers import make_database
+
+
+def make_import_service(tmp_dir):
+    return ImportService(DatabaseService(make_database(tmp_dir)))
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_xlsx(path, header, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+def student_rows(count):
+    majors = ['Informatics Engineering', 'Information Systems', 'Computer Engineering']
+    return [[f'2023{i:04d}', 'Student Name', majors[i % 3], 2023, f's{i}@example.com']
+            for i in range(1, count + 1)]
+
+
+def test_import_students_csv():
+    print("Testing CSV student import...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_import_service(tmp_dir)
+        rows = student_rows(60)
+        rows[9] = ['bad', 'X', 'Astrology', 'soon', '']
+        rows[20][0] = rows[19][0]
+        rows.insert(30, ['', '', '', '', ''])
+        # Rows after the blank one in the same chunk keep their own numbers
+        rows[32] = ['bad2', 'Y', 'Astrology', 2023, '']
+        rows[34][0] = rows[33][0]
+        path = os.path.join(tmp_dir, 'students.csv')
+        write_csv(path, ['NIM', 'Name', 'Major', 'Admission_Year', 'Email'], rows)
+        
+        for workers, use_processes in [(0, False), (2, False), (2, True)]:
+            progress = []
+            result = service.import_students_file(path, chunk_size=7, commit_size=20,
+                                                  workers=workers, use_processes=use_processes,
+                                                  progress=progress.append)
+            assert result['total_rows'] == 61
+            assert result['last_committed_row'] == 61
+            assert progress[-1]['committed_row'] == 61
+            assert [p['committed_row'] for p in progress] == sorted(p['committed_row'] for p in progress)
+            if workers == 0:
+                assert result['inserted'] == 56 and result['failed'] == 4
+                assert [(error['row'], error['nim']) for error in result['errors']] == [
+                    (10, 'bad'), (21, rows[19][0]), (33, 'bad2'), (35, rows[33][0])
+                ]
+                assert result['errors'][0]['error'].count('; ') == 3
+                assert 'duplicated' in result['errors'][1]['error']
+                assert 'duplicated' in result['errors'][3]['error']
+            else:
+                # Everything was inserted by the first run
+                assert result['inserted'] == 0 and result['failed'] == 60
+        
+        assert len(service.db_service.get_students()) == 56
+        service.db_service.db_config.close()
+    print("CSV student import tests passed")
+
+
+def test_import_resumes_after_write_failure():
+    print("Testing import resume...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_import_service(tmp_dir)
+        path = os.path.join(tmp_dir, 'students.xlsx')
+        write_xlsx(path, ['nim', 'name', 'major', 'admission_year'],
+                   [row[:4] for row in student_rows(100)])
+        
+        db_config = service.db_service.db_config
+        with db_config.connection() as conn:
+            conn.execute('''
+            CREATE TRIGGER reject_student BEFORE INSERT ON students
+            WHEN NEW.nim = '20230055'
+            BEGIN SELECT RAISE(ABORT, 'disk full'); END
+            ''')
+            conn.commit()
+        
+        result = service.import_students_file(path, chunk_size=10, commit_size=25, workers=2)
+        assert not result['success'] and 'disk full' in result['error']
+        assert result['last_committed_row'] == 30 and result['resume_row'] == 31
+        assert result['inserted'] == 30 and result['errors'] == []
+        
+        with db_config.connection() as conn:
+            conn.execute("DROP TRIGGER reject_student")
+            conn.commit()
+        
+        result = service.import_students_file(path, start_row=result['resume_row'],
+                                              chunk_size=10, commit_size=25, workers=2)
+        assert result['success'], result
+        assert result['total_rows'] == 70 and result['inserted'] == 70
+        assert len(service.db_service.get_students()) == 100
+        db_config.close()
+    print("Import resume tests passed")
+
+
+def test_import_grades_xlsx():
+    print("Testing XLSX grade import...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_import_service(tmp_dir)
+        service.student_service.import_students(
+            {'nim': nim, 'name': name, 'major': major, 'admission_year': year}
+            for nim, name, major, year, _ in student_rows(3)
+        )
+        
+        header = ['nim', 'course_code', 'semester', 'academic_year', 'grade_value']
+        rows = [
+            ['20230001', 'TI101', 1, '2023/2024', 3.8],
+            ['20230001', 'TI101', 1, '2023/2024', 2.0],
+            ['20230002', 'TI102', 1, '2023/2024', 3.1],
+            ['20239999', 'TI101', 1, '2023/2024', 3.0],
+            ['20230003', 'TI101', 'one', '2023/2024', 3.0],
+            ['20230003', 'TI101', 1, '2023/2024', 4.5],
+        ]
+        path = os.path.join(tmp_dir, 'grades.xlsx')
+        write_xlsx(path, header, rows)
+        
+        result = service.import_grades_file(path, chunk_size=2, workers=0)
+        assert result['inserted'] == 2 and result['updated'] == 0
+        assert [(c['row'], c['action']) for c in result['conflicts']] == [(2, 'skipped')]
+        assert [error['row'] for error in result['errors']] == [4, 5, 6]
+        
+        result = service.import_grades_file(path, start_row=2, update_existing=True)
+        assert result['total_rows'] == 5 and result['updated'] == 2
+        grades = service.db_service.get_student_grades(1)
+        assert [(g['course_code'], g['grade_value'], g['grade_letter']) for g in grades] == \
+            [('TI101', 2.0, 'C+')]
+        
+        result = service.import_grades_file(os.path.join(tmp_dir, 'grades.json'))
+        assert not result['success'] and 'Unsupported file type' in result['error']
+        service.db_service.db_config.close()
+    print("XLSX grade import tests passed")
+
+
+if __name__ == "__main__":
+    test_import_students_csv()
+    test_import_resumes_after_write_failure()
+    test_import_grades_xlsx()
+    print("\nAll import tests completed")
@@ -0,0 +1,186 @@
+# student-management/tests/test_query_plans.py
+"""
+Query plan regression tests for Student Management System
+
+Every query issued by the services is captured through the connection trace
+callback and run through EXPLAIN QUERY PLAN. A full SCAN of a large table fails
+the test unless the operation has to read the whole table by design.
+"""
+
+import sys
+import os
+import re
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.database_service import DatabaseService
+from services.grade_service import GradeService
+from tests.helpers import make_database
+
+
+LARGE_TABLES = {'students', 'grades', 'student_academic_summary'}
+
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|LEFT|JOIN|INNER|GROUP|ORDER|LIMIT)\b)(\w+))?',
+    re.IGNORECASE
+)
+
+
+def seed(db_config, student_count=300, grades_per_student=4):
+    with db_config.connection() as conn:
+        majors = [row['code'] for row in conn.execute("SELECT code FROM majors")]
+        conn.executemany(
+            "INSERT INTO students (nim, name, major_code, admission_year) VALUES (?, ?, ?, ?)",
+            [(f"NIM{i:08d}", f"Student {i}", majors[i % len(majors)], 2015 + i % 8)
+             for i in range(student_count)]
+        )
+        course_ids = [row['id'] for row in conn.execute("SELECT id FROM courses")]
+        conn.executemany(
+            "INSERT INTO grades (student_id, course_id, semester, academic_year, grade_value, grade_letter) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(student_id, course_ids[n], 1, '2023/2024', 3.0, 'B+')
+             for student_id in range(1, student_count + 1)
+             for n in range(grades_per_student)]
+        )
+        conn.commit()
+
+
+def table_aliases(sql):
+    aliases = {}
+    for table, alias in TABLE_REFERENCE.findall(sql):
+        aliases[table.lower()] = table.lower()
+        if alias:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+
+def full_scans(conn, sql):
+    """Return the large tables a statement reads with a full SCAN"""
+    aliases = table_aliases(sql)
+    scanned = set()
+    for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+        match = re.match(r'SCAN (\w+)', row['detail'])
+        if match and 'VIRTUAL TABLE' not in row['detail']:
+            table = aliases.get(match.group(1).lower(), match.group(1).lower())
+            if table in LARGE_TABLES:
+                scanned.add(table)
+    return scanned
+
+
+def capture_queries(db_config, operation):
+    statements = []
+    with db_config.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            operation()
+        finally:
+            conn.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+    ]
+
+
+def query_plan_cases(db_service, grade_service):
+    """(label, operation, large tables it may scan by design)"""
+    return [
+        ('get_students', lambda: db_service.get_students(), {'students'}),
+        ('get_students major', lambda: db_service.get_students({'major': 'Information Systems'}), set()),
+        ('get_students year', lambda: db_service.get_students({'year': 2018}), set()),
+        ('get_students major+year',
+         lambda: db_service.get_students({'major': 'Information Systems', 'year': 2018}), set()),
+        # The first page walks the nim index and stops after LIMIT rows
+        ('get_students first page', lambda: db_service.get_students(limit=21), {'students'}),
+        ('get_students next page',
+         lambda: db_service.get_students(limit=21, after=('NIM00000100', 101)), set()),
+        ('get_students previous page',
+         lambda: db_service.get_students(limit=21, before=('NIM00000100', 101)), set()),
+        ('get_students major page',
+         lambda: db_service.get_students({'major': 'Information Systems'}, limit=21,
+                                         after=('NIM00000100', 101)), set()),
+        ('get_students year page',
+         lambda: db_service.get_students({'year': 2018}, limit=21, after=('NIM00000100', 101)), set()),
+        ('get_students search', lambda: db_service.get_students({'search_term': 'Student 12'}), set()),
+        ('search_students', lambda: db_service.search_students('Student 12', limit=10), set()),
+        ('search_students major',
+         lambda: db_service.search_students('NIM0000', major='Information Systems'), set()),
+        ('get_student_by_nim', lambda: db_service.get_student_by_nim('NIM00000010'), set()),
+        ('get_student_by_id', lambda: db_service.get_student_by_id(10), set()),
+        ('get_student_grades', lambda: db_service.get_student_grades(10), set()),
+        ('get_student_gpa', lambda: db_service.get_student_gpa(10), set()),
+        ('get_academic_records', lambda: list(grade_service.get_academic_records()), {'students'}),
+        ('get_academic_records major',
+         lambda: list(grade_service.get_academic_records(filters={'major': 'Information Systems'})), set()),
+        ('get_academic_records ids',
+         lambda: list(grade_service.get_academic_records([5, 50, 150])), set()),
+        # Course and major lookups are served from the in-memory catalog snapshot
+        ('catalog reload', lambda: db_service.catalog.reload(), set()),
+        # Student counts and grade totals come from the per-major summary table
+        ('get_major_statistics', lambda: db_service.get_major_statistics(), set()),
+        ('get_academic_totals', lambda: db_service.get_academic_totals(), set()),
+        ('get_course_statistics', lambda: grade_service.get_course_statistics(1), set()),
+        # Dashboard mode aggregates every grade by design
+        ('get_all_course_statistics', lambda: grade_service.get_all_course_statistics(), {'grades'}),
+        ('get_all_course_statistics term',
+         lambda: grade_service.get_all_course_statistics(1, '2023/2024'), set()),
+        # Cumulative rankings find their GPA cutoff with an ordered walk down the
+        # summary GPA index, which stops after top/limit rows
+        ('get_rankings', lambda: grade_service.get_rankings(), {'student_academic_summary'}),
+        ('get_rankings page', lambda: grade_service.get_rankings(top=None, limit=20, offset=40),
+         {'student_academic_summary'}),
+        ('get_rankings by major', lambda: grade_service.get_rankings(partition_by='major', top=10),
+         {'student_academic_summary'}),
+        ('get_rankings by year',
+         lambda: grade_service.get_rankings(partition_by='admission_year', method='dense', top=10),
+         {'student_academic_summary'}),
+        ('get_rankings term',
+         lambda: grade_service.get_rankings(semester=1, academic_year='2023/2024', top=10), set()),
+    ]
+
+
+def test_queries_avoid_full_scans():
+    print("Testing query plans...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir)
+        seed(db_config)
+        
+        db_service = DatabaseService(db_config)
+        grade_service = GradeService(db_service)
+        
+        failures = []
+        for label, operation, allowed in query_plan_cases(db_service, grade_service):
+            queries = capture_queries(db_config, operation)
+            assert queries, f"{label} issued no queries"
+            
+            with db_config.connection() as conn:
+                for sql in queries:
+                    unexpected = full_scans(conn, sql) - allowed
+                    if unexpected:
+                        failures.append(f"{label}: SCAN {', '.join(sorted(unexpected))}")
+        
+        db_config.close()
+        assert not failures, "Full table scans found:\n" + "\n".join(failures)
+    print("Query plan tests passed")
+
+
+def test_transcript_query_uses_covering_index():
+    print("Testing transcript covering index...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_config = make_database(tmp_dir)
+        seed(db_config, student_count=20)
+        db_service = DatabaseService(db_config)
+        
+        queries = capture_queries(db_config, lambda: db_service.get_student_grades(5))
+        with db_config.connection() as conn:
+            plan = [row['detail'] for row in conn.execute("EXPLAIN QUERY PLAN " + queries[0])]
+        db_config.close()
+        
+        assert any('COVERING INDEX idx_grades_student_transcript' in detail for detail in plan), plan
+        assert not any('TEMP B-TREE' in detail for detail in plan), plan
+    print("Transcript covering index tests passed")
+
+
+if __name__ == "__main__":
+    test_queries_avoid_full_scans()
+    test_transcript_query_uses_covering_index()
+    print("\nAll query plan tests completed")
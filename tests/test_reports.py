@@ -5,8 +5,40 @@ Unit tests for Student Management System - Reports Module
 
 import sys
 import os
+import re
+import tempfile
+import zlib
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from openpyxl import load_workbook
+
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+from services.grade_service import GradeService
+from reports.excel_generator import ExcelReportGenerator
+from reports.pdf_generator import PDFReportGenerator, fit_text, text_width
+from services.transcript_service import TranscriptService, render_transcripts
+from tests.helpers import make_database
+
+
+def make_services(tmp_dir, student_count=30):
+    db_service = DatabaseService(make_database(tmp_dir))
+    student_service = StudentService(db_service)
+    grade_service = GradeService(db_service)
+    student_service.import_students(
+        {'nim': f'2023{i:04d}', 'name': 'Student Name',
+         'major': 'Informatics Engineering' if i % 3 else 'Information Systems',
+         'admission_year': 2020 + i % 4}
+        for i in range(1, student_count + 1)
+    )
+    grade_service.import_grades(
+        {'nim': f'2023{i:04d}', 'course_code': code, 'semester': semester,
+         'academic_year': '2023/2024', 'grade_value': (i % 5) * 0.8}
+        for i in range(1, student_count + 1, 2)
+        for code, semester in (('TI101', 1), ('TI102', 1), ('TI201', 2))
+    )
+    return student_service, grade_service
+
 
 def test_excel_generation():
     print("Testing Excel report generation...")
@@ -18,7 +50,295 @@ def test_report_content():
     print("Report content tests passed")
 
 
+def test_students_report_from_stream():
+    print("Testing streamed students report...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, _ = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = ExcelReportGenerator(reports_dir=os.path.join(tmp_dir, "exports"))
+        
+        filepath = generator.generate_students_report(db_service.iter_students(chunk_size=7))
+        workbook = load_workbook(filepath)
+        
+        data = list(workbook['Data Mahasiswa'].values)
+        assert data[0] == ('Student ID', 'Name', 'Major', 'Admission Year',
+                           'Course Count', 'Average Grade', 'Email', 'Phone')
+        assert len(data) == 31
+        assert data[1][0] == '20230001'
+        
+        summary = dict(workbook['Summary'].values)
+        expected = student_service.get_academic_summary()
+        assert summary['Total Students'] == expected['total_students']
+        assert summary['Students with Grades'] == expected['students_with_grades']
+        assert summary['Average GPA'] == expected['overall_gpa']
+        db_service.db_config.close()
+    print("Streamed students report tests passed")
+
+
+def test_students_report_average_letter():
+    print("Testing students report letters...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = ExcelReportGenerator(reports_dir=os.path.join(tmp_dir, "exports"),
+                                         grade_scale=grade_service.grade_scale)
+        
+        filepath = generator.generate_students_report(db_service.iter_students())
+        rows = list(load_workbook(filepath)['Data Mahasiswa'].values)
+        header = rows[0]
+        assert header[5:7] == ('Average Grade', 'Average Letter')
+        
+        for row in rows[1:]:
+            average, letter = row[5], row[6]
+            if average:
+                assert letter == grade_service.calculate_grade_letter(average)
+            else:
+                assert letter is None
+        db_service.db_config.close()
+    print("Students report letter tests passed")
+
+
+def test_streaming_students_report():
+    print("Testing write-only students report...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = ExcelReportGenerator(reports_dir=os.path.join(tmp_dir, "exports"),
+                                         grade_scale=grade_service.grade_scale)
+        
+        frame_path = generator.generate_students_report(db_service.get_students())
+        os.rename(frame_path, os.path.join(tmp_dir, "frame.xlsx"))
+        stream_path = generator.generate_students_report(db_service.iter_students(chunk_size=7),
+                                                         streaming=True, width_sample=5)
+        expected = load_workbook(os.path.join(tmp_dir, "frame.xlsx"))
+        streamed = load_workbook(stream_path)
+        
+        assert streamed.sheetnames == ['Data Mahasiswa', 'Summary']
+        for sheet_name in streamed.sheetnames:
+            assert list(streamed[sheet_name].values) == list(expected[sheet_name].values)
+        
+        # Widths come from the header and the first five students only
+        widths = streamed['Data Mahasiswa'].column_dimensions
+        assert widths['A'].width == len('Student ID') + 2
+        assert widths['B'].width == len('Student Name') + 2
+        assert widths['C'].width == len('Informatics Engineering') + 2
+        
+        empty_path = generator.generate_students_report(iter(()), streaming=True)
+        assert list(load_workbook(empty_path)['Summary'].values)[1] == ('Total Students', 0)
+        db_service.db_config.close()
+    print("Write-only students report tests passed")
+
+
+def column_widths(worksheet):
+    return {letter: dimension.width for letter, dimension in worksheet.column_dimensions.items()}
+
+
+def test_report_column_widths():
+    print("Testing report column widths...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = ExcelReportGenerator(reports_dir=os.path.join(tmp_dir, "exports"))
+        
+        filepath = generator.generate_students_report(db_service.get_students())
+        workbook = load_workbook(filepath)
+        widths = column_widths(workbook['Data Mahasiswa'])
+        # Student ID, Name, Major, Admission Year, Course Count, Average Grade, Email, Phone
+        assert widths == {'A': 12, 'B': 14, 'C': 25, 'D': 16, 'E': 14, 'F': 15, 'G': 7, 'H': 7}
+        assert column_widths(workbook['Summary'])['A'] == len('Average GPA for Informatics Engineering') + 2
+        
+        streamed = generator.generate_students_report(db_service.get_students(), streaming=True)
+        assert column_widths(load_workbook(streamed)['Data Mahasiswa']) == widths
+        
+        student = db_service.get_student_by_id(1)
+        record = grade_service.get_student_academic_record(1)
+        workbook = load_workbook(generator.generate_academic_transcript(student, record))
+        assert column_widths(workbook['Student Information']) == {'A': 16, 'B': 25}
+        courses = record['grades_by_semester'][0]['courses']
+        widths = column_widths(workbook['Semester 1'])
+        assert widths['B'] == max(len(course['course_name']) for course in courses) + 2
+        # The semester summary below the grades is measured too
+        assert widths['C'] == len('Semester GPA') + 2
+        db_service.db_config.close()
+    print("Report column width tests passed")
+
+
+def test_split_students_report():
+    print("Testing split students report...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, _ = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = ExcelReportGenerator(reports_dir=os.path.join(tmp_dir, "exports"))
+        expected = list(load_workbook(generator.generate_students_report(
+            db_service.get_students()))['Data Mahasiswa'].values)
+        header, expected_rows = expected[0], expected[1:]
+        
+        workbook = load_workbook(generator.generate_students_report(
+            db_service.iter_students(chunk_size=7), streaming=True, rows_per_sheet=8))
+        data_sheets = ['Data Mahasiswa', 'Data Mahasiswa (2)', 'Data Mahasiswa (3)', 'Data Mahasiswa (4)']
+        assert workbook.sheetnames == data_sheets + ['Index', 'Summary']
+        rows = []
+        for sheet_name in data_sheets:
+            values = list(workbook[sheet_name].values)
+            assert values[0] == header
+            rows.extend(values[1:])
+        assert rows == expected_rows
+        index = list(workbook['Index'].values)
+        assert index[0] == ('Sheet', 'File', 'Partition', 'Rows')
+        assert [(entry[0], entry[3]) for entry in index[1:]] == list(zip(data_sheets, [8, 8, 8, 6]))
+        
+        # Informatics Engineering has 20 students, Information Systems 10
+        workbook = load_workbook(generator.generate_students_report(
+            db_service.iter_students(), streaming=True, rows_per_sheet=15, partition_by='major'))
+        index = [entry[:1] + entry[2:] for entry in list(workbook['Index'].values)[1:]]
+        assert index == [('Informatics Engineering', 'Informatics Engineering', 15),
+                         ('Information Systems', 'Information Systems', 10),
+                         ('Informatics Engineering (2)', 'Informatics Engineering', 5)]
+        for sheet_name, major, count in index:
+            values = list(workbook[sheet_name].values)[1:]
+            assert len(values) == count and {row[2] for row in values} == {major}
+        
+        filepath = generator.generate_students_report(
+            db_service.get_students(), partition_by='admission_year', split_workbooks=True)
+        workbook = load_workbook(filepath)
+        assert workbook.sheetnames == ['Index', 'Summary']
+        rows = []
+        for sheet_name, file_name, year, count in list(workbook['Index'].values)[1:]:
+            part = load_workbook(os.path.join(os.path.dirname(filepath), file_name))
+            assert part.sheetnames == [sheet_name] == [str(year)]
+            values = list(part[sheet_name].values)[1:]
+            assert len(values) == count and {row[3] for row in values} == {year}
+            rows.extend(values)
+        assert sorted(rows) == sorted(expected_rows)
+        
+        try:
+            generator.generate_students_report([], partition_by='faculty')
+            assert False, "Unknown partition should be rejected"
+        except ValueError:
+            pass
+        db_service.db_config.close()
+    print("Split students report tests passed")
+
+
+def test_batch_transcripts():
+    print("Testing batch transcripts...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        exports = os.path.join(tmp_dir, "exports")
+        service = TranscriptService(db_service, reports_dir=exports)
+        
+        cohort = list(service.iter_cohort(student_ids=[3, 1, 2, 99]))
+        assert [student['id'] for student, _ in cohort] == [1, 2, 3]
+        for student, record in cohort:
+            assert record == grade_service.get_student_academic_record(student['id'])
+        
+        progress = []
+        result = service.generate_cohort_transcripts(major='Information Systems', workers=0,
+                                                     batch_size=4, progress=progress.append)
+        assert result['success'] and result['generated'] == 10 and result['failed'] == 0
+        assert [p['generated'] for p in progress] == [4, 8, 10]
+        assert result['files_per_second'] > 0
+        
+        workbook = load_workbook(result['files'][0])
+        info = dict(list(workbook['Student Information'].values)[1:])
+        assert info['Student ID'] == '20230003' and info['Major'] == 'Information Systems'
+        
+        result = service.generate_cohort_transcripts(admission_year=2021, workers=2, batch_size=3)
+        expected = [s['nim'] for s in db_service.get_students({'year': 2021})]
+        assert result['generated'] == len(expected) == 8
+        assert [os.path.basename(path).split('_')[1] for path in result['files']] == expected
+        
+        # A student that fails to render is reported, the rest of the batch still renders
+        student = db_service.get_student_by_id(1)
+        results = render_transcripts(exports, [(student, {}), cohort[1]])
+        assert results[0][:3] == (1, '20230001', None) and results[0][3].startswith('Error: ')
+        assert results[1][3] is None and os.path.exists(results[1][2])
+        db_service.db_config.close()
+    print("Batch transcript tests passed")
+
+
+def read_pdf(path):
+    """Check every cross-reference offset and return (page count, page texts)"""
+    with open(path, 'rb') as pdf_file:
+        data = pdf_file.read()
+    assert data.startswith(b'%PDF-1.4') and data.endswith(b'%%EOF\n')
+    xref = int(re.search(rb'startxref\n(\d+)', data).group(1))
+    header = re.match(rb'xref\n0 (\d+)\n', data[xref:])
+    table = xref + header.end()
+    for object_id in range(1, int(header.group(1))):
+        offset = int(data[table + 20 * object_id:table + 20 * object_id + 10])
+        assert data[offset:].startswith(b'%d 0 obj' % object_id)
+    
+    pages = int(re.search(rb'/Type /Pages .* /Count (\d+)', data).group(1))
+    texts = [
+        zlib.decompress(data[m.end():m.end() + int(m.group(1))]).decode('cp1252')
+        for m in re.finditer(rb'/Length (\d+) /Filter /FlateDecode >>\nstream\n', data)
+    ]
+    return pages, texts
+
+
+def test_pdf_transcripts():
+    print("Testing PDF transcripts...")
+    assert text_width('Hello', 'F1', 10) == 22.78
+    assert fit_text('Short', 100) == 'Short'
+    cut = fit_text('Introduction to Programming (Advanced)', 100, 'F1', 10)
+    assert cut.endswith('...') and text_width(cut) <= 100
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        student_service, grade_service = make_services(tmp_dir)
+        db_service = student_service.db_service
+        generator = PDFReportGenerator(reports_dir=os.path.join(tmp_dir, "pdf"))
+        
+        student = db_service.get_student_by_id(1)
+        record = grade_service.get_student_academic_record(1)
+        pages, texts = read_pdf(generator.generate_transcript_pdf(student, record))
+        assert pages == 1 and len(texts) == 1
+        assert '(20230001)' in texts[0] and '(Semester 2 - 2023/2024)' in texts[0]
+        assert '/Tpl Do' in texts[0]
+        
+        # Long transcripts flow onto more pages and repeat the table header
+        semester = record['grades_by_semester'][0]
+        long_record = dict(record, grades_by_semester=[dict(semester, courses=semester['courses'] * 60)])
+        result = generator.generate_transcripts_pdf([(student, long_record), (student, record)])
+        pages, texts = read_pdf(result['files'][0])
+        assert result['transcripts'] == 2 and result['pages'] == pages == 4
+        assert 'continued' in texts[1] and '(Course Name)' in texts[1]
+        assert '(Page 1)' in texts[3]
+        
+        result = generator.generate_transcripts_pdf([(student, record)], combined=False)
+        assert result['pages'] == 1 and result['files'][0].endswith('.pdf')
+        
+        service = TranscriptService(db_service, reports_dir=os.path.join(tmp_dir, "cohort"))
+        result = service.generate_cohort_pdf(major='Information Systems', filename='cohort.pdf')
+        assert result['success'] and result['transcripts'] == 10 and result['pages'] == 10
+        assert read_pdf(result['file'])[0] == 10
+        
+        # An empty cohort is an error, not a zero-page file
+        assert service.generate_cohort_pdf(admission_year=1999, filename='empty.pdf') == \
+            {'success': False, 'error': 'No students matched'}
+        assert not os.path.exists(os.path.join(tmp_dir, "cohort", "empty.pdf"))
+        assert generator.generate_transcripts_pdf(iter([])) == {'files': [], 'transcripts': 0, 'pages': 0}
+        
+        result = service.generate_cohort_transcripts(admission_year=2021, workers=0, output_format='pdf')
+        assert result['generated'] == 8 and all(path.endswith('.pdf') for path in result['files'])
+        assert not service.generate_cohort_transcripts(output_format='docx')['success']
+        assert service.generate_cohort_transcripts(major='Information System') == \
+            {'success': False, 'error': 'Unknown major: Information System'}
+        assert service.generate_cohort_pdf(major='Information System') == \
+            {'success': False, 'error': 'Unknown major: Information System'}
+        db_service.db_config.close()
+    print("PDF transcript tests passed")
+
+
 if __name__ == "__main__":
     test_excel_generation()
     test_report_content()
+    test_students_report_from_stream()
+    test_students_report_average_letter()
+    test_streaming_students_report()
+    test_report_column_widths()
+    test_split_students_report()
+    test_batch_transcripts()
+    test_pdf_transcripts()
     print("\nAll report tests completed")
\ No newline at end of file
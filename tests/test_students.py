@@ -5,8 +5,19 @@ Unit tests for Student Management System - Student Module
 
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services.database_service import DatabaseService
+from services.student_service import StudentService
+from services.grade_service import GradeService
+from services.validation_service import ValidationService, field_text
+from tests.helpers import make_database
+
+
+def make_student_service(tmp_dir):
+    return StudentService(DatabaseService(make_database(tmp_dir)))
+
 
 def test_student_creation():
     print("Testing student creation...")
@@ -18,7 +29,338 @@ def test_student_validation():
     print("Validation tests passed")
 
 
+def test_duplicate_nim_rejected():
+    print("Testing duplicate NIM...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        
+        first = service.create_student('20230001', 'Budi Santoso', 'Information Systems', 2023)
+        second = service.create_student('20230001', 'Siti Aminah', 'Information Systems', 2023)
+        
+        assert first['success']
+        assert not second['success']
+        assert 'already registered' in second['error']
+        
+        # Only the nim constraint means a duplicate NIM
+        with service.db_service.db_config.connection() as conn:
+            conn.execute('''CREATE TRIGGER enrolment_closed BEFORE INSERT ON students
+            BEGIN SELECT RAISE(ABORT, 'enrolment is closed'); END''')
+            conn.commit()
+        third = service.create_student('20230002', 'Siti Aminah', 'Information Systems', 2023)
+        assert third == {'success': False, 'error': 'Error: enrolment is closed'}
+        service.db_service.db_config.close()
+    print("Duplicate NIM tests passed")
+
+
+def test_import_students():
+    print("Testing bulk student import...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        service.create_student('20230001', 'Budi Santoso', 'Information Systems', 2023)
+        
+        records = [
+            {'nim': f'2023{i:04d}', 'name': 'Student Name', 'major': 'Informatics Engineering',
+             'admission_year': '2023', 'email': f's{i}@example.com'}
+            for i in range(2, 12)
+        ]
+        records.append({'nim': '20230001', 'name': 'Already There',
+                        'major': 'Information Systems', 'admission_year': 2023})
+        records.append({'nim': '20230002', 'name': 'Duplicate Row',
+                        'major': 'Information Systems', 'admission_year': 2023})
+        records.append({'nim': 'bad', 'name': 'Bad Nim',
+                        'major': 'Information Systems', 'admission_year': 2023})
+        records.append({'nim': '20230099', 'name': 'No Year',
+                        'major': 'Information Systems', 'admission_year': 'soon'})
+        
+        result = service.import_students(iter(records), chunk_size=4)
+        
+        assert result['total_rows'] == 14
+        assert result['inserted'] == 10
+        assert result['failed'] == 4
+        assert [error['row'] for error in result['errors']] == [11, 12, 13, 14]
+        assert 'already registered' in result['errors'][0]['error']
+        assert 'duplicated' in result['errors'][1]['error']
+        assert result['rows_per_second'] > 0
+        assert len(service.get_students()) == 11
+        service.db_service.db_config.close()
+    print("Bulk student import tests passed")
+
+
+def test_student_batch_validation():
+    print("Testing batch student validation...")
+    validator = ValidationService()
+    records = [
+        {'nim': '20230001', 'name': 'Budi Santoso', 'major': 'Information Systems',
+         'admission_year': '2023', 'email': 'budi@example.com', 'phone': '0812-3456-7890'},
+        {'nim': 'bad', 'name': 'X', 'major': 'Astrology', 'admission_year': 1999,
+         'email': 'not-an-email', 'phone': '12'},
+        {'nim': '20230003', 'name': 'Siti 99', 'major': '', 'admission_year': 'soon'},
+        {'nim': None, 'name': 'Andi Wijaya', 'major': 'Computer Engineering', 'admission_year': 2023},
+    ]
+    
+    result = validator.validate_student_batch(records, first_row=10)
+    assert result['total_rows'] == 4 and result['invalid_rows'] == 3
+    assert [(row, field) for row, field, _ in result['errors']] == [
+        (11, 'nim'), (11, 'name'), (11, 'major'), (11, 'admission_year'), (11, 'email'), (11, 'phone'),
+        (12, 'name'), (12, 'major'), (12, 'admission_year'),
+        (13, 'nim'),
+    ]
+    assert result['valid_rows'] == [(10, '20230001', 'Budi Santoso', 'Information Systems',
+                                     2023, 'budi@example.com', '0812-3456-7890')]
+    
+    # The first error of each row is what the per-record validator reports
+    for row, record in enumerate(records[1:], start=11):
+        first = next(message for error_row, _, message in result['errors'] if error_row == row)
+        try:
+            year = int(record['admission_year'])
+        except ValueError:
+            continue
+        single = validator.validate_student_data(
+            field_text(record['nim']), record['name'], record['major'], year,
+            field_text(record.get('email')), field_text(record.get('phone'))
+        )
+        assert single['message'] == first, (single, first)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        result = service.import_students(records)
+        assert result['inserted'] == 1
+        assert result['errors'][1] == {
+            'row': 3, 'nim': '20230003',
+            'error': 'Name can only contain letters, spaces, dots, and apostrophes; '
+                     'Major cannot be empty; Admission year must be a number'
+        }
+        service.db_service.db_config.close()
+    print("Batch student validation tests passed")
+
+
+def test_student_validators_agree():
+    print("Testing batch and per-record validator agreement...")
+    validator = ValidationService()
+    base = {'nim': '20230001', 'name': 'Budi Santoso', 'major': 'Information Systems',
+            'admission_year': 2023, 'email': 'budi@example.com', 'phone': '081234567890'}
+    variants = [
+        {}, {'nim': ' 20230001 '}, {'nim': '20230001\n'}, {'nim': 0}, {'nim': 20230001},
+        {'nim': None}, {'nim': ''}, {'nim': '   '},
+        {'name': ' Budi '}, {'name': ' B '}, {'name': '   '}, {'name': None}, {'name': 0},
+        {'major': ' Information Systems'}, {'major': None},
+        {'email': ' budi@example.com '}, {'email': ' '}, {'email': None}, {'email': 0},
+        {'phone': ' 081234567890 '}, {'phone': '(+62) 812-3456-7890'}, {'phone': ' '},
+        {'phone': None}, {'phone': 81234567890}, {'phone': '+'},
+    ]
+    records = [dict(base, **variant) for variant in variants]
+    
+    result = validator.validate_student_batch(records)
+    first_errors = {}
+    for row, _, message in result['errors']:
+        first_errors.setdefault(row, message)
+    
+    for row, record in enumerate(records, start=1):
+        single = validator.validate_student_data(
+            *(field_text(record[field]) for field in ('nim', 'name', 'major')),
+            record['admission_year'],
+            field_text(record['email']), field_text(record['phone'])
+        )
+        assert single.get('message') == first_errors.get(row, 'Data is valid'), (record, single)
+    assert result['invalid_rows'] == len(first_errors) > 0
+    print("Validator agreement tests passed")
+
+
+def test_search_students():
+    print("Testing student search...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        service.import_students([
+            {'nim': '20230001', 'name': 'Budi Santoso', 'major': 'Information Systems', 'admission_year': 2023},
+            {'nim': '20230002', 'name': 'Santi Budiman', 'major': 'Informatics Engineering', 'admission_year': 2022},
+            {'nim': '20220003', 'name': 'Andi Wijaya', 'major': 'Information Systems', 'admission_year': 2022},
+        ])
+        db_service = service.db_service
+        assert db_service.has_fulltext_search()
+        
+        assert [s['nim'] for s in service.search_students('budi')] == ['20230001', '20230002']
+        assert [s['nim'] for s in service.search_students('budi', major='Information Systems')] == ['20230001']
+        assert [s['nim'] for s in service.search_students('20220003')] == ['20220003']
+        # Shorter than a trigram, served by the LIKE fallback
+        assert [s['nim'] for s in service.search_students('Wi')] == ['20220003']
+        
+        student = db_service.get_student_by_nim('20220003')
+        service.update_student(student['id'], {'name': 'Andi Pratama'})
+        assert service.search_students('wijaya') == []
+        assert [s['nim'] for s in service.search_students('pratama')] == ['20220003']
+        
+        db_service.delete_student(student['id'])
+        assert service.search_students('pratama') == []
+        
+        db_service._fulltext_enabled = False
+        assert [s['nim'] for s in service.search_students('budi')] == ['20230001', '20230002']
+        db_service.db_config.close()
+    print("Student search tests passed")
+
+
+def test_student_pages():
+    print("Testing keyset pagination...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        service.import_students(
+            {'nim': f'2023{i:04d}', 'name': 'Student Name',
+             'major': 'Information Systems' if i % 2 else 'Computer Engineering',
+             'admission_year': 2023}
+            for i in range(1, 26)
+        )
+        
+        first = service.get_student_page(page_size=10)
+        assert [s['nim'] for s in first['students']][:2] == ['20230001', '20230002']
+        assert not first['has_previous'] and first['has_next']
+        
+        second = service.get_student_page(page_size=10, after=first['next_cursor'])
+        third = service.get_student_page(page_size=10, after=second['next_cursor'])
+        assert second['students'][0]['nim'] == '20230011'
+        assert [s['nim'] for s in third['students']] == [f'2023{i:04d}' for i in range(21, 26)]
+        assert third['has_previous'] and not third['has_next']
+        
+        back = service.get_student_page(page_size=10, before=third['previous_cursor'])
+        assert back['students'] == second['students']
+        back = service.get_student_page(page_size=10, before=back['previous_cursor'])
+        assert back['students'] == first['students']
+        assert not back['has_previous'] and back['has_next']
+        
+        filtered = service.get_student_page(page_size=5, major='Computer Engineering')
+        filtered = service.get_student_page(page_size=5, major='Computer Engineering',
+                                            after=filtered['next_cursor'])
+        assert [s['nim'] for s in filtered['students']] == ['20230012', '20230014', '20230016',
+                                                            '20230018', '20230020']
+        
+        # A misspelled major is an error, not an empty result
+        typo = service.get_student_page(page_size=5, major='Computer Enginering')
+        assert typo['students'] == [] and typo['error'] == 'Unknown major: Computer Enginering'
+        for search_term in ('', '2023'):
+            try:
+                service.search_students(search_term, major='Computer Enginering')
+                assert False, "unknown major accepted"
+            except ValueError as e:
+                assert str(e) == 'Unknown major: Computer Enginering'
+        service.db_service.db_config.close()
+    print("Keyset pagination tests passed")
+
+
+def test_update_detail_delete():
+    print("Testing single-student operations...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        service.import_students(
+            {'nim': f'2023{i:04d}', 'name': 'Student Name',
+             'major': 'Information Systems', 'admission_year': 2023}
+            for i in range(1, 6)
+        )
+        
+        result = service.update_student(3, {'name': 'Renamed Student', 'phone': '081234567890'})
+        assert result['success'], result
+        detail = service.get_student_detail(3)
+        assert detail['name'] == 'Renamed Student' and detail['nim'] == '20230003'
+        assert detail['grades'] == [] and detail['gpa'] == 0
+        
+        result = service.update_student(3, {'nim': '20230004'})
+        assert not result['success'] and 'already used' in result['error']
+        assert not service.update_student(99, {'name': 'Nobody Here'})['success']
+        assert service.get_student_detail(99) == {}
+        
+        assert service.delete_student(3)['message'] == 'Student Renamed Student deleted successfully'
+        assert service.get_student_detail(3) == {}
+        assert service.delete_student(3)['error'] == 'Student not found'
+        service.db_service.db_config.close()
+    print("Single-student operation tests passed")
+
+
+def scanned_academic_summary(service):
+    """The summary computed from a full scan of students and grades"""
+    students = list(service.db_service.iter_students())
+    graded = [student['avg_grade'] for student in students if student['avg_grade'] > 0]
+    
+    # Credit-weighted GPA of every student with graded credits, per major
+    student_gpas = {}
+    with service.db_service.db_config.connection() as conn:
+        for row in conn.execute('''
+        SELECT s.major_code, SUM(g.grade_value * c.credits) / SUM(c.credits) as gpa
+        FROM students s
+        JOIN grades g ON g.student_id = s.id
+        JOIN courses c ON c.id = g.course_id
+        GROUP BY s.id
+        '''):
+            student_gpas.setdefault(row['major_code'], []).append(row['gpa'])
+    
+    majors = []
+    for major in service.db_service.get_majors():
+        gpas = student_gpas.get(major['code'], [])
+        majors.append({
+            'code': major['code'],
+            'name': major['name'],
+            'faculty': major['faculty'],
+            'student_count': sum(1 for s in students if s['major_code'] == major['code']),
+            'avg_gpa': sum(gpas) / len(gpas) if gpas else 0
+        })
+    
+    return {
+        'total_students': len(students),
+        'students_with_grades': len(graded),
+        'overall_gpa': round(sum(graded) / len(graded), 2) if graded else 0,
+        'majors_statistics': majors
+    }
+
+
+def assert_summary_matches(service):
+    summary = service.get_academic_summary()
+    expected = scanned_academic_summary(service)
+    for stats in summary['majors_statistics'] + expected['majors_statistics']:
+        stats['avg_gpa'] = round(stats['avg_gpa'], 6)
+    assert summary == expected, (summary, expected)
+
+
+def test_academic_summary():
+    print("Testing academic summary...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = make_student_service(tmp_dir)
+        grade_service = GradeService(service.db_service)
+        assert service.get_academic_summary()['total_students'] == 0
+        
+        majors = ['Informatics Engineering', 'Information Systems', 'Computer Engineering']
+        service.import_students(
+            {'nim': f'2023{i:04d}', 'name': 'Student Name',
+             'major': majors[i % 3], 'admission_year': 2023}
+            for i in range(1, 13)
+        )
+        for student_id in range(1, 10):
+            for course_id in (1, 2, 3):
+                grade_service.add_student_grade(student_id, course_id, 1, '2023/2024',
+                                                (student_id * course_id) % 5 * 0.9)
+        assert_summary_matches(service)
+        
+        # Grade edits, major moves and deletes are applied as deltas by triggers
+        with service.db_service.db_config.connection() as conn:
+            conn.execute("UPDATE grades SET grade_value = 4.0 WHERE student_id = 5")
+            conn.execute("DELETE FROM grades WHERE student_id = 6 AND course_id = 1")
+            conn.commit()
+        service.update_student(2, {'major': 'Information Systems'})
+        service.update_student(11, {'major': 'Informatics Engineering'})
+        service.delete_student(4)
+        service.delete_student(12)
+        assert_summary_matches(service)
+        
+        service.db_service.rebuild_academic_summary()
+        assert_summary_matches(service)
+        service.db_service.db_config.close()
+    print("Academic summary tests passed")
+
+
 if __name__ == "__main__":
     test_student_creation()
     test_student_validation()
+    test_duplicate_nim_rejected()
+    test_import_students()
+    test_student_batch_validation()
+    test_student_validators_agree()
+    test_search_students()
+    test_student_pages()
+    test_update_detail_delete()
+    test_academic_summary()
     print("\nAll student tests completed")
\ No newline at end of file
@@ -3,5 +3,7 @@
 
 from .calculators import GradeCalculator
 from .formatters import DataFormatter
+from .cache import LRUCache
+from .grade_scale import GradeScale
 
-__all__ = ['GradeCalculator', 'DataFormatter']
\ No newline at end of file
+__all__ = ['GradeCalculator', 'DataFormatter', 'LRUCache', 'GradeScale']
\ No newline at end of file
@@ -0,0 +1,94 @@
+# utils/cache.py
+"""
+In-memory caching utilities for Student Management System
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with an optional time-to-live
+    
+    Entries beyond max_size are evicted oldest-use first, and entries older
+    than ttl seconds are treated as misses. on_evict(key, value) is called
+    whenever an entry is dropped for either reason.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        if max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+        
+        self.max_size = max_size
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats['misses'] += 1
+                self._stats['expirations'] += 1
+                dropped = value
+            else:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return value
+        
+        self._notify(key, dropped)
+        return default
+    
+    def put(self, key: Hashable, value: Any):
+        if self.max_size == 0:
+            return
+        
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False))
+                self._stats['evictions'] += 1
+        
+        for old_key, (old_value, _) in evicted:
+            self._notify(old_key, old_value)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry without counting it as an eviction"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[0] if entry is not None else default
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hit_rate': round(self._stats['hits'] / lookups, 4) if lookups else 0.0
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _notify(self, key, value):
+        if self._on_evict:
+            self._on_evict(key, value)
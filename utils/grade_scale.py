@@ -0,0 +1,87 @@
+# utils/grade_scale.py
+"""
+Grade scale used to turn numeric grades into letter grades
+"""
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with pandas
+    np = None
+
+
+# (letter, minimum grade value) bands of the standard 4.00 scale
+DEFAULT_GRADE_SCALE = (
+    ('A', 3.7), ('A-', 3.3), ('B+', 3.0), ('B', 2.7), ('B-', 2.3),
+    ('C+', 2.0), ('C', 1.7), ('C-', 1.3), ('D+', 1.0), ('D', 0.0)
+)
+
+
+class GradeScale:
+    """Letter bands defined by their minimum grade value
+    
+    A grade gets the letter of the highest band whose minimum it reaches;
+    grades below every minimum get the lowest band.
+    """
+    
+    def __init__(self, bands: Iterable[Tuple[str, float]] = DEFAULT_GRADE_SCALE):
+        ordered = sorted(((letter, float(min_value)) for letter, min_value in bands),
+                         key=lambda band: band[1])
+        if not ordered:
+            raise ValueError("A grade scale needs at least one band")
+        
+        self.letters = tuple(letter for letter, _ in ordered)
+        self.thresholds = tuple(min_value for _, min_value in ordered)
+        if len(set(self.thresholds)) != len(self.thresholds):
+            raise ValueError("Grade scale bands must have distinct minimum values")
+        
+        if np is not None:
+            self._threshold_array = np.array(self.thresholds)
+            self._letter_array = np.array(self.letters, dtype=object)
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> 'GradeScale':
+        """Build a scale from grade_scale table rows, or the default when empty"""
+        bands = [(row['letter'], row['min_value']) for row in rows]
+        return cls(bands) if bands else cls()
+    
+    def bands(self) -> List[Tuple[str, float]]:
+        """(letter, minimum value) pairs from the highest band down"""
+        return list(zip(reversed(self.letters), reversed(self.thresholds)))
+    
+    def classify(self, grade_value: float) -> str:
+        index = bisect_right(self.thresholds, grade_value) - 1
+        return self.letters[index if index > 0 else 0]
+    
+    def classify_many(self, grade_values: Any) -> Any:
+        """Classify many grades in one call
+        
+        NumPy arrays and pandas Series are classified with a single
+        searchsorted over the thresholds and come back as an object array or
+        a Series with the same index. Any other iterable returns a list.
+        """
+        if np is not None and (isinstance(grade_values, np.ndarray) or hasattr(grade_values, 'to_numpy')):
+            values = np.asarray(grade_values, dtype=float)
+            indexes = np.searchsorted(self._threshold_array, values, side='right') - 1
+            np.maximum(indexes, 0, out=indexes)
+            letters = self._letter_array[indexes]
+            
+            if hasattr(grade_values, 'index') and hasattr(grade_values, 'to_numpy'):
+                return type(grade_values)(letters, index=grade_values.index, name=grade_values.name)
+            return letters
+        
+        thresholds, letters = self.thresholds, self.letters
+        classified = []
+        for grade_value in grade_values:
+            index = bisect_right(thresholds, grade_value) - 1
+            classified.append(letters[index if index > 0 else 0])
+        return classified
+    
+    def __eq__(self, other):
+        return (isinstance(other, GradeScale)
+                and self.letters == other.letters and self.thresholds == other.thresholds)
+    
+    def __repr__(self):
+        return f"GradeScale({self.bands()!r})"
@@ -0,0 +1,42 @@
+# utils/pipeline.py
+"""
+Bounded worker-pool pipeline for Student Management System
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+
+def run_in_order(func: Callable, tasks: Iterable[Tuple[Hashable, Tuple]],
+                 receive: Callable[[Hashable, Any], None], workers: Optional[int] = None,
+                 use_processes: bool = True) -> None:
+    """Run func(*args) for each (key, args) task in a worker pool, or inline when
+    workers is 0, and hand every (key, result) to receive in task order"""
+    if workers == 0:
+        for key, args in tasks:
+            receive(key, func(*args))
+        return
+    
+    pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    executor = pool(max_workers=workers)
+    # Tasks queued or finished but not yet received, bounded to keep memory flat
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    
+    try:
+        for key, args in tasks:
+            pending.append((key, executor.submit(func, *args)))
+            if len(pending) >= max_pending:
+                key, future = pending.popleft()
+                receive(key, future.result())
+        
+        while pending:
+            key, future = pending.popleft()
+            receive(key, future.result())
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)